@@ -0,0 +1,151 @@
+"""
+Import-time budget of sparql_query_viz and onto_create
+
+Every module is imported in a fresh interpreter with `python -X importtime`. The modules that took the most cumulative
+time are reported in the format of `-X importtime` and the cumulative time of the module is compared with its budget.
+A name 'package:attribute' imports the attribute of the package, e.g. SQV, which the package resolves on first access.
+The script exits with status 1, if a module exceeds its budget or imports a module that should only be imported by the
+code paths that use it.
+
+    python check_import_time.py [--top 10] [--repeat 3]
+"""
+# imports
+import argparse
+import os
+import subprocess
+import sys
+
+# CONSTANTS
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# budgets of the cumulative import time in milliseconds, the modules of onto_create are imported from their folder
+PACKAGE_BUDGETS = {'sparql_query_viz': 50,
+                   'sparql_query_viz.session': 150,
+                   'sparql_query_viz.graph_patch': 50,
+                   'sparql_query_viz.exploration': 50,
+                   'sparql_query_viz:SQV': 4000}
+ONTO_CREATE_BUDGETS = {'bulk_load': 500,
+                       'importPLC': 500,
+                       'importTR': 500,
+                       'info_query': 500,
+                       'manifest': 600,
+                       'scenarios': 600,
+                       'serialization': 500,
+                       'onto_main': 600}
+ONTO_CREATE_DIR = os.path.join(ROOT_DIR, 'onto_create')
+# modules of optional features, that must not be imported with the module, but only when the feature is used
+DEFERRED_IMPORTS = {'sparql_query_viz:SQV': ['sparql_query_viz.snapshot', 'sparql_query_viz.hot_reload',
+                                             'sparql_query_viz.datasets.fulltext_index',
+                                             'sparql_query_viz.datasets.quadstore',
+                                             'sparql_query_viz.datasets.ontology_file']}
+
+
+def get_import_statement(module: str):
+    """ returns the statement that imports a module or, for 'package:attribute', the attribute of a package
+
+    :param module: name of the module or 'package:attribute'
+     :type module: str
+     :return: the import statement
+     :rtype: str
+    """
+    package, _, attribute = module.partition(':')
+    return 'from ' + package + ' import ' + attribute if attribute else 'import ' + module
+
+
+def get_depth(row: tuple):
+    """ returns how deep an import is nested in the output of -X importtime
+
+    :param row: row (self time in us, cumulative time in us, name)
+     :type row: tuple[int, int, str]
+     :rtype: int
+    """
+    return len(row[2]) - len(row[2].lstrip())
+
+
+def measure_import_time(module: str, cwd: str = ROOT_DIR, repeat: int = 3):
+    """ imports a module in fresh interpreters with -X importtime and returns the rows of the fastest import
+
+    :param module: name of the module or 'package:attribute'
+     :type module: str
+     :param cwd: directory the module is imported from
+     :type cwd: str
+     :param repeat: number of imports, the fastest is returned to reduce the noise
+     :type repeat: int
+     :return: rows (self time in us, cumulative time in us, name) of the module and its imports, the module is last
+     :rtype: list[tuple[int, int, str]]
+    """
+    package, _, attribute = module.partition(':')
+    fastest = None
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', get_import_statement(module)], cwd=cwd,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if process.returncode != 0:
+            raise RuntimeError("module " + module + " could not be imported:\n" + process.stderr)
+        rows = []
+        for line in process.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_time, cumulative_time, name = line[len('import time:'):].split('|', 2)
+            rows.append((int(self_time), int(cumulative_time), name.rstrip()))
+        # an attribute resolved by the package is imported with importlib, which -X importtime does not nest below a
+        # row of its own: the rows after the package are added up in a row of the attribute
+        last = len(rows) - 1
+        if attribute:
+            last = max(index for index, row in enumerate(rows) if row[2].strip() == package)
+        # the imports of the module are the rows before its own row that are nested deeper, the other rows belong
+        # to the startup of the interpreter
+        first = last
+        while first > 0 and get_depth(rows[first - 1]) > get_depth(rows[last]):
+            first = first - 1
+        if attribute:
+            cumulative_time = sum(row[1] for row in rows[last:] if get_depth(row) <= get_depth(rows[last]))
+            rows = rows[first:] + [(0, cumulative_time, ' ' * get_depth(rows[last]) + module)]
+        else:
+            rows = rows[first:]
+        if fastest is None or rows[-1][1] < fastest[-1][1]:
+            fastest = rows
+    return fastest
+
+
+def report_import_time(module: str, budget: float, cwd: str = ROOT_DIR, top: int = 10, repeat: int = 3):
+    """ prints the slowest imports of a module and checks its cumulative import time against the budget and that it
+    does not import its deferred imports
+
+    :param module: name of the module or 'package:attribute'
+     :type module: str
+     :param budget: budget of the cumulative import time in milliseconds
+     :type budget: float
+     :param cwd: directory the module is imported from
+     :type cwd: str
+     :param top: number of reported imports
+     :type top: int
+     :param repeat: number of imports, the fastest is reported
+     :type repeat: int
+     :return: True, if the module is within its budget and does not import its deferred imports
+     :rtype: bool
+    """
+    rows = measure_import_time(module, cwd, repeat)
+    cumulative_time = rows[-1][1] / 1000
+    within_budget = cumulative_time <= budget
+    print(f"{module}: {cumulative_time:.1f} ms of {budget} ms {'ok' if within_budget else 'OVER BUDGET'}")
+    imported = {name.strip() for _, _, name in rows}
+    for deferred_module in DEFERRED_IMPORTS.get(module, []):
+        if deferred_module in imported:
+            print(f"{module} imports {deferred_module}, which should only be imported when it is used")
+            within_budget = False
+    print("import time: self [us] | cumulative | imported package")
+    for self_time, row_cumulative_time, name in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"import time: {self_time:>9} | {row_cumulative_time:>10} | {name}")
+    print()
+    return within_budget
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="checks the import time of sparql_query_viz and onto_create")
+    parser.add_argument('--top', type=int, default=10, help="number of reported imports per module")
+    parser.add_argument('--repeat', type=int, default=3, help="number of imports per module, the fastest counts")
+    args = parser.parse_args()
+    results = [report_import_time(module, budget, ROOT_DIR, args.top, args.repeat)
+               for module, budget in PACKAGE_BUDGETS.items()]
+    results += [report_import_time(module, budget, ONTO_CREATE_DIR, args.top, args.repeat)
+                for module, budget in ONTO_CREATE_BUDGETS.items()]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,96 @@
+"""bulk loading of facts into the owlready2 quadstore
+
+Creating an individual or appending to one of its properties through the Python objects of owlready2 costs several
+quadstore queries per fact. Instead, the facts of the parsers are collected as (subject, predicate, object) triples
+of names, every IRI is interned once and the triples are inserted with one executemany per batch.
+
+The triples are written directly into the quadstore, so they must only describe entities whose Python objects are not
+used before the triples are flushed.
+"""
+
+import owlready2 as o2
+
+# number of triples inserted per statement
+BATCH_SIZE = 50000
+# number of names looked up in the quadstore per query
+INTERN_CHUNK_SIZE = 500
+
+
+class TripleLoader:
+    """ collects object triples for an ontology and inserts them into its quadstore in batches
+    """
+
+    def __init__(self, onto):
+        """
+        :param onto: the ontology the triples are added to, names are IRIs in its namespace
+        """
+        self.onto = onto
+        self.db = onto.world.graph.db
+        # name -> storid of the names interned so far
+        self.storids = {}
+        self.triples = []
+
+    def intern(self, names):
+        """ look up the storids of names in the quadstore once, names that are not yet in the quadstore get new
+        storids (the same way owlready2 abbreviates IRIs when it parses a file)
+
+        :param names: names in the namespace of the ontology
+        """
+        # the names keep their order, so that the storids and the saved file do not depend on the hash seed
+        missing = [name for name in dict.fromkeys(names) if name not in self.storids]
+        for i in range(0, len(missing), INTERN_CHUNK_SIZE):
+            chunk = missing[i:i + INTERN_CHUNK_SIZE]
+            iris = [self.onto.base_iri + name for name in chunk]
+            found = dict(self.db.execute("SELECT iri, storid FROM resources WHERE iri IN (%s)" %
+                                         ",".join("?" * len(iris)), iris).fetchall())
+            new_resources = []
+            current_resource = self.db.execute("SELECT current_resource FROM store").fetchone()[0]
+            for name, iri in zip(chunk, iris):
+                storid = found.get(iri)
+                if storid is None:
+                    current_resource = current_resource + 1
+                    storid = current_resource
+                    new_resources.append((storid, iri))
+                self.storids[name] = storid
+            if new_resources:
+                self.db.executemany("INSERT INTO resources VALUES (?,?)", new_resources)
+                self.db.execute("UPDATE store SET current_resource=?", (current_resource,))
+
+    def add_triples(self, triples):
+        """ add object triples, the entities are names in the namespace of the ontology or storids (e.g. o2.rdf_type)
+
+        :param triples: iterable of (subject, predicate, object)
+        """
+        for triple in triples:
+            self.triples.append(triple)
+            if len(self.triples) >= BATCH_SIZE:
+                self.flush()
+
+    def flush(self):
+        """ insert the collected triples into the quadstore, duplicates are ignored by its unique index
+        """
+        if not self.triples:
+            return
+        self.intern(entity for triple in self.triples for entity in triple if isinstance(entity, str))
+        storids = self.storids
+        rows = [(storids.get(s, s), storids.get(p, p), storids.get(o, o)) for s, p, o in self.triples]
+        self.db.executemany("INSERT OR IGNORE INTO objs VALUES (%s,?,?,?)" % self.onto.graph.c, rows)
+        self.triples = []
+
+
+def individual(name, cls) -> list:
+    """ triples that declare a named individual of a class
+
+    :param name: name of the individual
+    :param cls: name of the class
+    """
+    return [(name, o2.rdf_type, o2.owl_named_individual), (name, o2.rdf_type, cls)]
+
+
+def subclass(name, base) -> list:
+    """ triples that declare a class as subclass of another class
+
+    :param name: name of the class
+    :param base: name of the super class
+    """
+    return [(name, o2.rdf_type, o2.owl_class), (name, o2.rdfs_subclassof, base)]
@@ -1,6 +1,8 @@
 import xml.etree.ElementTree as ET
 import owlready2 as o2
 import os.path
+import bulk_load
+import serialization
 
 def readXML(filepath):
     mytree = ET.parse(filepath)
@@ -60,39 +62,140 @@ def readRelation(prefix, modelClass):
 
     return dic_rel
 
-def readClass(filepath):
-    FB_dic={}
-
-    modelComment= ET.Element("")
-    modelClass = ET.Element("")
-    modelDic = {}
-    root_data = readXML(filepath)
-    prefix = root_data.tag.split("}")[0]+"}"
-
-    str_type = prefix+"type"
-    str_id = prefix + "id"
-    str_uuid = prefix + "uuid"
-
-    plc_data=ET.parse(filepath)
-    #print (root_data.tag,"*",root_data.attrib)
+def local_name(tag):
+    # tag without the namespace of the PLCopen XML, e.g. "{http://www.plcopen.org/xml/tc6_0200}pou" -> "pou"
+    return tag.rpartition("}")[2]
+
+
+def readPOUs(filepath):
+    """ streams the PLCopen XML file once and extracts the POUs with their actions and interface variables
+
+    Only the POUs in the top-level addData of the project are read (TwinCAT exports its POUs there). Every element is
+    removed from its parent as soon as it is parsed, so the memory does not grow with the size of the file.
+
+    :param filepath: path to the PLCOpenXML.xml file
+    :return: dict POU name -> {"type": pouType, "actions": [action names], "interface": {section: [variables]}},
+        where a section is e.g. "inputVars" and a variable a dict with "name" and "type"
+    """
+    pous = {}
+    # elements from the root to the current element, the POUs that are open and the interface section and
+    # variable that are currently read
+    elements = []
+    open_pous = []
+    section = None
+    variable = None
+    # depth of the top-level addData element, None outside of it
+    add_data_depth = None
+    for event, elem in ET.iterparse(filepath, events=("start", "end")):
+        if event == "start":
+            name = local_name(elem.tag)
+            if add_data_depth is None and len(elements) == 1 and name == "addData":
+                add_data_depth = 1
+            elif add_data_depth is not None:
+                if name == "pou" and "pouType" in elem.attrib:
+                    pou = pous.setdefault(elem.attrib["name"], {"type": elem.attrib["pouType"], "actions": [],
+                                                                "interface": {}})
+                    open_pous.append(pou)
+                elif name == "action" and "name" in elem.attrib:
+                    # nested POUs are part of the enclosing POUs, like in the XML tree
+                    for pou in open_pous:
+                        pou["actions"].append(elem.attrib["name"])
+                elif open_pous and elements and local_name(elements[-1].tag) == "interface":
+                    section = open_pous[-1]["interface"].setdefault(name, [])
+                elif section is not None and name == "variable" and variable is None:
+                    variable = {"name": elem.attrib.get("name"), "type": None}
+                    section.append(variable)
+                elif variable is not None and variable["type"] is None and local_name(elements[-1].tag) == "type":
+                    variable["type"] = elem.attrib.get("name", name) if name == "derived" else name
+            elements.append(elem)
+            continue
+        elements.pop()
+        name = local_name(elem.tag)
+        if add_data_depth is not None:
+            if name == "pou" and "pouType" in elem.attrib:
+                open_pous.pop()
+            elif name == "variable" and variable is not None:
+                variable = None
+            elif section is not None and local_name(elements[-1].tag) == "interface":
+                section = None
+            if len(elements) == add_data_depth:
+                add_data_depth = None
+        # the parsed element is the last child of its parent and no longer needed
+        elem.clear()
+        if elements:
+            del elements[-1][-1]
+    return pous
 
-    for x in root_data:
-        print(x.tag, x.attrib)
-        if  "addData" in x.tag:
-            for data in x:
-                for ele in data.iter():
-                    if "pou" in ele.tag and "pouType" in ele.attrib:
-                        if ele.attrib["pouType"]=="functionBlock":
-                            if not ele.attrib["name"] in FB_dic.keys():
-                                FB_dic[ele.attrib["name"]]=[]
-                            for var in ele.iter():
-                                if "action" in var.tag and "name" in var.attrib:
-                                    print(var.attrib["name"])
-                                    FB_dic[ele.attrib["name"]].append(var.attrib["name"])
-    return FB_dic
-
-def generateOnto(iri, ontofile,folder_path,sc_number):
 
+def readClass(filepath):
+    """ reads the function blocks and their actions from the PLCopen XML file
+
+    :param filepath: path to the PLCOpenXML.xml file
+    :return: dict function block name -> list of action names
+    """
+    return {name: pou["actions"] for name, pou in readPOUs(filepath).items() if pou["type"] == "functionBlock"}
+
+def readScenario(folder_path, sc):
+    """ reads the function blocks of a scenario
+
+    :param folder_path: folder of the scenarios, e.g. "./inputs/Sc"
+    :param sc: number of the scenario, e.g. "03"
+    :return: dict function block name -> list of action names or None, if the scenario has no PLCopen XML
+    """
+    filepath = folder_path + sc + "/PLCOpenXML.xml"
+    if not os.path.isfile(filepath):
+        return None
+    return readClass(filepath)
+
+
+def functionBlockTriples(sc, function_blocks):
+    """ facts of the PLCopen XML of a scenario as (subject, predicate, object) triples of names
+
+    :param sc: number of the scenario
+    :param function_blocks: dict function block name -> list of action names
+    """
+    plant_sc = "xPPU_Sc" + sc
+    plc_file = "xPPU_Sc" + sc + "_PLCOpenXML"
+    triples = bulk_load.individual(plant_sc, "Scenario") + bulk_load.individual(plc_file, "plc")
+    triples.append((plant_sc, "has_info_source", plc_file))
+    for key, actions in function_blocks.items():
+        fb = "Sc" + sc + "_FB_" + key
+        triples.extend(bulk_load.individual(fb, "function_block"))
+        triples.append((plc_file, "has_FB", fb))
+        for act in actions:
+            triples.extend(bulk_load.individual(act, "action"))
+            # action_for is the inverse of has_action and not stored
+            triples.append((fb, "has_action", act))
+    return triples
+
+
+def scenarioTriples(sc, function_blocks):
+    """ all facts a scenario adds to the ontology from its PLCopen XML as triples of names: the function blocks, their
+    actions and the plant processes of the actions
+
+    :param sc: number of the scenario
+    :param function_blocks: result of readScenario, None if the scenario has no PLCopen XML
+    """
+    if function_blocks is None:
+        return []
+    triples = functionBlockTriples(sc, function_blocks)
+    for actions in function_blocks.values():
+        for act in actions:
+            # every action is a plant process as well, named by the part of its name before the first "."
+            triples.extend(bulk_load.individual(act.split(".")[0], "plant_process"))
+    return triples
+
+
+def generateOnto(iri, ontofile,folder_path,sc_number, function_blocks=None, save=True):
+    """ writes the function blocks and actions of the scenarios into the ontology
+
+    :param function_blocks: dict scenario number -> result of readScenario, e.g. parsed in parallel by
+        scenarios.parse_scenarios, the PLCopen XML files are read here if None
+    :param save: save the ontology to ontofile, otherwise it is only kept in the default world for the next stage
+    :return: the ontology
+    """
+    if function_blocks is None:
+        function_blocks = {sc: readScenario(folder_path, sc) for sc in sc_number}
 
     onto = o2.get_ontology(iri)
     with onto:
@@ -120,35 +223,18 @@ def generateOnto(iri, ontofile,folder_path,sc_number):
         model.is_a.append(has_FB.some(function_block, ))
         function_block.is_a.append(has_action.some(action, ))
 
-        FB_dic={}
+        # the individuals and their properties are inserted into the quadstore as triples in batches
+        loader = bulk_load.TripleLoader(onto)
         for sc in sc_number:
-            filepath = folder_path + sc + "/PLCOpenXML.xml"
-            if os.path.isfile(filepath):
-                FB_dic=readClass(filepath)
-                plant_sc = onto.Scenario("xPPU_Sc" + sc)
-                plc_file = plc("xPPU_Sc"+sc+ "_PLCOpenXML")
-                plant_sc.has_info_source.append(plc_file)
-
-                for key in FB_dic.keys():
-                    fb = function_block("Sc"+sc+"_FB_"+key)
-                    plc_file.has_FB.append(fb)
-                    if FB_dic[key]:
-                        for act in FB_dic[key]:
-                            fb_act=action(act)
-                            fb.has_action.append(fb_act)
-                            fb_act.action_for.append(fb)
-
-        process_info=onto.action.instances()
-        #resource_info = onto.Resource.instances()
-
-        for pro in process_info:
-            if "." in str(pro):
-                process_name= str(pro).split(".")[1]
-                new_process = onto["plant_process"](process_name)
+            loader.add_triples(scenarioTriples(sc, function_blocks[sc]))
+        loader.flush()
 
 
 
-    onto.save(file=ontofile)
+    if save:
+        # the format is given by the extension of ontofile, see serialization.save
+        serialization.save(onto, ontofile)
+    return onto
     # for x in root_data:
     #     if "addData" in x.tag:
     #         modelComment = x.find('pou')
@@ -174,4 +260,5 @@ def generateOnto(iri, ontofile,folder_path,sc_number):
 
 if __name__ == "__main__":
     filepath= "inputs/Sc02/PLCOpenXML.xml"
-    readClass(filepath)
\ No newline at end of file
+    for name, pou in readPOUs(filepath).items():
+        print(pou["type"], name, pou["actions"])
\ No newline at end of file
@@ -1,29 +1,24 @@
-import pandas as pd
-import re
 import csv
 #from owlready2 import *
 import owlready2 as o2
 import os.path
+import bulk_load
+import serialization
+
+# translation of the special characters in names of the component list, "fuer" is replaced afterwards
+SPEC_CHAR_TABLE = str.maketrans({' ': '', '(': '_', ')': '', 'ä': 'ae', 'Ä': 'Ae', 'ö': 'oe', 'Ö': 'Oe',
+                                 'ü': 'ue', 'Ü': 'Ue', 'ß': 'ss'})
 
 def readCSV(filepath):
+    # pandas is only imported, if an excel file is read
+    import pandas as pd
     df = pd.read_excel(filepath,header = None)
     data_list = df.values.tolist()
     print(data_list)
 
 def replace_spec_char(list):
-    for i in range(len(list)-1):
-        list[i] = list[i].replace(' ', '')
-        list[i] = list[i].replace('(', '_')
-        list[i] = list[i].replace(')', '')
-        list[i] = list[i].replace('ä', 'ae')
-        list[i] = list[i].replace('Ä', 'Ae')
-        list[i] = list[i].replace('ö', 'oe')
-        list[i] = list[i].replace('Ö', 'Oe')
-        list[i] = list[i].replace('ü', 'ue')
-        list[i] = list[i].replace('Ü', 'Ue')
-        list[i] = list[i].replace('ß', 'ss')
-        list[i] = list[i].replace('fuer', '_')
-
+    # the last cell of a row is kept as it is
+    list[:-1] = [cell.translate(SPEC_CHAR_TABLE).replace('fuer', '_') for cell in list[:-1]]
     return list
 
 def is_empty( list):
@@ -55,8 +50,97 @@ def convert_to_digital(string):
         return float(string)
 
 
+def readComponentList(path):
+    """ parses the component list of a scenario into its headers and its cleaned, non-empty rows
+
+    :param path: path to the component_list.csv
+    :return: headers and rows or None, if the scenario has no component list
+    """
+    if not os.path.isfile(path):
+        return None
+    with open(path,encoding="UTF-8") as csv_file:
+        csv_reader = csv.reader(csv_file, delimiter=';')
+        headers = next(csv_reader)
+        rows = []
+        for row in csv_reader:
+            row = replace_spec_char(row)
+            if not is_empty(row):
+                rows.append(row)
+    return headers, rows
+
+
+def componentListTriples(sc, headers, rows):
+    """ facts of the component list of a scenario as (subject, predicate, object) triples of names
+
+    :param sc: number of the scenario
+    :param headers: headers of the component list, the classes of the cells, the second column are the resources
+    :param rows: cleaned, non-empty rows of the component list
+    """
+    report = "xPPU_Sc" + sc + "_technical_report"
+    report_version = "TUM-AIS-TR-01-14-02"
+    triples = bulk_load.individual(report, "document") + bulk_load.individual(report_version, "version")
+    triples.append((report, "has_version", report_version))
+    triples.append(("xPPU_Sc" + sc, "has_info_source", report))
+    row_length= len(headers)
+    for row in rows:
+        triples.extend(bulk_load.individual(row[1], headers[1]))
+        triples.append((report, "has_info", row[1]))
+        for j in range(0, row_length):
+            if j != 1 and row[j] != "":
+                triples.extend(bulk_load.individual(row[j], headers[j]))
+                # info_for is the inverse of has_info and not stored
+                triples.append((row[1], "has_info", row[j]))
+    return triples
+
+
+def descriptionClassTriples(headers, rows):
+    """ sensor and actuator classes named after the descriptions of the components, e.g. "Stack_MicroSwitch_1" declares
+    the sensor class "MicroSwitch"
+
+    :param headers: headers of the component list
+    :param rows: cleaned, non-empty rows of the component list
+    """
+    triples = []
+    columns = [j for j, header in enumerate(headers) if header == "Description"]
+    for row in rows:
+        for j in columns:
+            if "_" in row[j]:
+                re_name = row[j].split("_")[1]
+                if "Switch" in re_name:
+                    triples.extend(bulk_load.subclass(re_name, "sensor"))
+                elif "Valve" in re_name or "Motor" in re_name:
+                    triples.extend(bulk_load.subclass(re_name, "actuator"))
+    return triples
+
+
+def scenarioTriples(sc, component_list):
+    """ all facts a scenario adds to the ontology from its component list as triples of names: the scenario, the
+    classes of the headers, the individuals of the component list and the classes derived from their descriptions
+
+    :param sc: number of the scenario
+    :param component_list: result of readComponentList, None if the scenario has no component list
+    """
+    triples = bulk_load.individual("xPPU_Sc"+sc, "Scenario")
+    if component_list is not None:
+        headers, rows = component_list
+        for header in headers:
+            triples.extend(bulk_load.subclass(header, "plant_info"))
+        triples.extend(componentListTriples(sc, headers, rows))
+        triples.extend(descriptionClassTriples(headers, rows))
+    return triples
+
+
 # function to check if  a string is NaN
-def readFile(iri, ontofile, folder_path, sc_number):
+def readFile(iri, ontofile, folder_path, sc_number, component_lists=None, save=True):
+    """ writes the scenarios and their component lists into the ontology
+
+    :param component_lists: dict scenario number -> result of readComponentList, e.g. parsed in parallel by
+        scenarios.parse_scenarios, the component lists are read here if None
+    :param save: save the ontology to ontofile, otherwise it is only kept in the default world for the next stage
+    :return: the ontology
+    """
+    if component_lists is None:
+        component_lists = {sc: readComponentList(folder_path + sc + "/component_list.csv") for sc in sc_number}
     onto = o2.get_ontology(iri)
 
     with onto:
@@ -174,59 +258,20 @@ def readFile(iri, ontofile, folder_path, sc_number):
 
 
 
+        # the facts of the scenarios (including the classes of the headers and the sensor and actuator classes) are
+        # inserted into the quadstore as triples in batches
+        loader = bulk_load.TripleLoader(onto)
+        # the scenarios are written in the order of sc_number, so the ontology does not depend on how they were parsed
         for sc in sc_number:
-
-            path = folder_path + sc + "/component_list.csv"
-
-            plant_sc=Scenario("xPPU_Sc"+sc)
-
-
-            if os.path.isfile(path):
-                report = document("xPPU_Sc" + sc + "_technical_report")
-                report_version = version("TUM-AIS-TR-01-14-02")
-                report.has_version.append(report_version)
-
-                plant_sc.has_info_source.append(report)
-                with open(path,encoding="UTF-8") as csv_file:
-                    csv_reader = csv.reader(csv_file, delimiter=';')
-
-                    headers = next(csv_reader)
-                    row_length= len(headers)
-
-
-                    for i in range(0, len(headers)):
-                        info = o2.types.new_class(headers[i], (plant_info,))
-
-                    for row in csv_reader:
-                        row = replace_spec_char(row)
-                        if is_empty(row):
-                            continue
-                        else:
-                            for j in range(0, row_length):
-                                info = o2.types.new_class(headers[j], (plant_info,))
-                                reso = onto.Resource(row[1])
-                                report.has_info.append(reso)
-                                if j != 1:
-                                    if row[j]!="":
-                                        instance = info(row[j])
-                                        reso.has_info.append(instance)
-                                        instance.info_for.append(reso)
-
-        description_info=onto.Description.instances()
-        #resource_info = onto.Resource.instances()
-
-        for re in description_info:
-            if "_" in str(re):
-                re_name=str(re).split("_")[1]
-                if "Switch" in re_name:
-                    pl_re = o2.types.new_class(re_name, (sensor,))
-                elif "Valve" in re_name or "Motor" in re_name:
-                    pl_re = o2.types.new_class(re_name, (actuator,))
-                #pl_re(re.info_for[0])
+            loader.add_triples(scenarioTriples(sc, component_lists[sc]))
+        loader.flush()
 
 
 
-    onto.save(file=ontofile)
+    if save:
+        # the format is given by the extension of ontofile, see serialization.save
+        serialization.save(onto, ontofile)
+    return onto
 
 
 if __name__ == "__main__":
@@ -3,25 +3,264 @@
 
 from owlready2 import *
 import json
-import rdflib
+import os
+import re
+import sqlite3
+import tempfile
 import timeit
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from quadstore import open_quadstore, file_hash
+import serialization
 
+# local name of the class of the scenarios, checks that return a scenario can be run for single scenarios
+SCENARIO_CLASS = "Scenario"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
 
+# the worker processes of the parallel checks each copy the shared quadstore once, its graph is kept here
+worker_graph = None
+
+
+@lru_cache(maxsize=None)
 def load_query(query) -> str:
-    f = open(query, "r")
-    return f.read()
+    # every query file is read once
+    with open(query, "r") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def prepare_query(query):
+    """ parse a query file once, the parsed query is reused for every graph
+
+    :param query: path to the query file
+    """
+    from rdflib.plugins.sparql import prepareQuery
+    return prepareQuery(load_query(query))
+
+
+def query_terms(query):
+    """ IRIs of the classes and properties a check touches, a change of other triples does not change its results
+
+    :param query: path to the query file
+    :return: frozenset of IRIs, None if the check may touch any triple (e.g. a variable property)
+    """
+    return _query_terms(prepare_query(query).algebra)
+
+
+def _query_terms(algebra):
+    # the terms are collected from the algebra of the parsed query, rdf:type only counts together with its class
+    from rdflib.term import URIRef, Variable
+    terms = set()
+    nodes = [algebra]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, URIRef):
+            terms.add(str(node))
+        elif isinstance(node, dict):
+            if "triples" in node:
+                for s, p, o in node["triples"]:
+                    if isinstance(p, Variable) or (str(p) == RDF_TYPE and isinstance(o, Variable)):
+                        return None
+            nodes.extend(value for key, value in node.items() if key != "_vars")
+        elif isinstance(node, (list, tuple, set)):
+            nodes.extend(node)
+        elif hasattr(node, "__dict__") and not isinstance(node, Variable):
+            # property paths
+            nodes.extend(vars(node).values())
+    terms.discard(RDF_TYPE)
+    return frozenset(terms)
+
+
+def scenario_variable(query):
+    """ variable of a check, that returns the scenario of every result, so that the check can be run for single
+    scenarios
+
+    :param query: path to the query file
+    :return: the variable or None
+    """
+    from rdflib.term import URIRef
+    algebra = prepare_query(query).algebra
+    projected = set(algebra["PV"] if "PV" in algebra else [])
+    nodes = [algebra]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, dict):
+            for s, p, o in node["triples"] if "triples" in node else []:
+                if (s in projected and str(p) == RDF_TYPE and isinstance(o, URIRef)
+                        and re.split("[#/]", str(o))[-1] == SCENARIO_CLASS):
+                    return s
+            nodes.extend(value for key, value in node.items() if key != "_vars")
+        elif isinstance(node, (list, tuple)):
+            nodes.extend(node)
+    return None
+
+
+def load_graph(onto):
+    """ parse the onto file with rdflib
+
+    :param onto: path to onto file
+    """
+    # rdflib is only imported, if the ontology is queried with rdflib
+    import gzip
+    import rdflib
+    format, compressed = serialization.detect_format(onto)
+    g = rdflib.Graph()
+    with (gzip.open if compressed else open)(onto, "rb") as f:
+        g.parse(f, format={"rdfxml": "xml", "ntriples": "nt", "turtle": "turtle"}[format])
+    return g
+
+
+def copy_quadstore(source, directory=None) -> str:
+    """ copy a SQLite quadstore into a temporary file
+
+    :param source: path to the quadstore or an open sqlite3 connection to it
+    :param directory: directory of the temporary file, None for the default temporary directory
+    :return: path to the copy, it is removed by the caller
+    """
+    fd, copy_path = tempfile.mkstemp(suffix=".sqlite3", dir=directory)
+    os.close(fd)
+    connection = sqlite3.connect("file:" + source + "?mode=ro", uri=True) if isinstance(source, str) else source
+    target = sqlite3.connect(copy_path)
+    try:
+        connection.backup(target)
+    finally:
+        target.close()
+        if isinstance(source, str):
+            connection.close()
+    return copy_path
+
+
+def writable_world(world, directory=None) -> tuple:
+    """ a world that can be queried with rdflib, owlready2 adds the IRIs of a query that are not in the quadstore (e.g.
+    a property the ontology does not use), so a read-only quadstore is queried through a writable copy
+
+    :param world: the world
+    :param directory: directory of the copy, None for the default temporary directory
+    :return: the world or its copy and the path to the copy, None if the world is not read-only
+    """
+    if not world.graph.read_only:
+        return world, None
+    copy_path = copy_quadstore(world.graph.db, directory)
+    return World(filename=copy_path), copy_path
 
 
 def query_onto(onto, query) -> list:
-    with onto:
-        graph = default_world.as_rdflib_graph()
-        return list(graph.query(query))
+    """ run a query on the world of an ontology, see run_check for the query files of the checks
+
+    :param onto: the ontology
+    :param query: SPARQL query
+    """
+    world, copy_path = writable_world(onto.world)
+    try:
+        return list(world.as_rdflib_graph().query(query))
+    finally:
+        if copy_path is not None:
+            world.close()
+            os.remove(copy_path)
 
 
 def query_w_rdflib(onto, query) -> list:
-    g = rdflib.Graph()
-    g.parse(onto)
-    return list(g.query(query))
+    """ run a query on an onto file parsed with rdflib, see run_check for the query files of the checks
+
+    :param onto: path to onto file
+    :param query: SPARQL query
+    """
+    return list(load_graph(onto).query(query))
+
+
+def run_check(graph, query, bindings=None) -> tuple:
+    """ run the query of a check on a graph
+
+    :param graph: rdflib graph, e.g. of an owlready2 world
+    :param query: path to the query file
+    :param bindings: dict variable -> term the query is restricted to, e.g. a single scenario
+    :return: the results as tuples (so that they can be passed between processes) and the seconds the query took
+    """
+    start = timeit.default_timer()
+    results = [tuple(row) for row in graph.query(prepare_query(query), initBindings=bindings)]
+    return results, timeit.default_timer() - start
+
+
+def init_worker(store_path, directory):
+    # every worker process queries its own copy of the shared quadstore
+    global worker_graph
+    worker_graph = World(filename=copy_quadstore(store_path, directory)).as_rdflib_graph()
+
+
+def run_worker_check(task) -> tuple:
+    return run_check(worker_graph, *task)
+
+
+def run_checks(graph, tasks, jobs=1, store_path=None) -> list:
+    """ run the queries of the checks, with up to jobs worker processes
+
+    :param graph: rdflib graph the queries are run on in this process
+    :param tasks: (path to the query file, bindings or None) of every check, see run_check
+    :param jobs: number of worker processes, 1 runs the queries one after another in this process
+    :param store_path: path to a SQLite quadstore of the graph, that is copied by the worker processes
+    :return: results and seconds of every check, in the order of tasks
+    """
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1 or store_path is None:
+        return [run_check(graph, *task) for task in tasks]
+    # the copies of the workers are removed with the directory, once the workers exited
+    with tempfile.TemporaryDirectory() as directory:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(store_path, directory)) as pool:
+            return list(pool.map(run_worker_check, tasks))
+
+
+def load_report(report_path):
+    """ read the report of the last checks
+
+    :param report_path: path to the report
+    :return: the report, None if there is none
+    """
+    try:
+        with open(report_path, "r", encoding="UTF-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    from rdflib.util import from_n3
+    for check in report["checks"].values():
+        check["results"] = [tuple(None if term is None else from_n3(term) for term in row)
+                            for row in check["results"]]
+    return report
+
+
+def save_report(report_path, report):
+    """ write the report of the checks, the results are stored as N3 terms
+
+    :param report_path: path to the report
+    :param report: dict with the hash of the checked onto file ("output_hash") and the hash of the query
+        ("query_hash") and the results ("results") of every check ("checks")
+    """
+    checks = {query: {"query_hash": check["query_hash"],
+                      "results": [[None if term is None else term.n3() for term in row] for row in check["results"]]}
+              for query, check in report["checks"].items()}
+    tmp_path = report_path + "." + str(os.getpid())
+    with open(tmp_path, "w", encoding="UTF-8") as f:
+        json.dump({"output_hash": report["output_hash"], "checks": checks}, f)
+    os.replace(tmp_path, report_path)
+
+
+def plan_check(query, check, changes):
+    """ decide how a check is run again after the ontology changed
+
+    :param query: path to the query file
+    :param check: the check in the report of the last checks, None if it was not run yet
+    :param changes: changes of the ontology since the last checks (see manifest.get_changes), None if unknown
+    :return: "cached" if the results of the report are still valid, "scenarios" if the check is run for the changed
+        scenarios only, else "full"
+    """
+    if check is None or changes is None or check["query_hash"] != file_hash(query):
+        return "full"
+    terms = query_terms(query)
+    if terms is not None and not terms & set(changes["terms"]):
+        return "cached"
+    if scenario_variable(query) is not None:
+        return "scenarios"
+    return "full"
+
 
 def resultsToDict(queryresult) -> dict:
     dic={}
@@ -41,15 +280,25 @@ def resultsToDict(queryresult) -> dict:
         k+=1
     return dic
 
-def query(path, filename=None,engine="owlready", showall: bool=True) -> None:
+def query(path, filename=None,engine="owlready", showall: bool=True, quadstore_path=None, onto=None,
+          jobs=1, report_path=None, changes=None) -> None:
     """ run several queries to check for consistencies
 
     :param path: path to onto file
     :param filename: onto filename - for loading onto with rdflib
     :param showall: show info that query was run, even if no results are returned, i.e., no inconsistency was found
+    :param quadstore_path: path to a persistent quadstore of the onto file (owlready engine only), which is only
+        rebuilt if the onto file changed; None to parse the onto file
+    :param onto: ontology that is already in memory, e.g. the one just generated, it is queried instead of the onto
+        file (owlready engine only)
+    :param jobs: number of worker processes running the checks at the same time (owlready engine only), they share a
+        read-only SQLite quadstore of the ontology, which is copied to a temporary file if there is none
+    :param report_path: path to the report of the checks, the results of the last checks are taken from it if the
+        ontology did not change since or the changes do not touch the classes and properties of a check; None to run
+        all checks
+    :param changes: changes of the onto file since the last checks (see manifest.get_changes), None if they are unknown
     """
     engines = ["owlready", "rdflib"]
-    qlog = []
     assert engine in engines, f"invalid engine, must be in {engines}"
 
 #    model_iri_list = list(model_data.keys())
@@ -58,17 +307,85 @@ def query(path, filename=None,engine="owlready", showall: bool=True) -> None:
         (1,"query/scenario_query.sparql", "+++++++++++++"),
         (2, "query/scenario_info_query.sparql", "+++++++++++++++++++")
     ]
-    if engine == "owlready":
-        onto = get_ontology(path).load()
-        with onto:
-            for query in queries:
-                query_results = query_onto(onto, load_query(query[1]))          #load the 2 element in the query_list, and do the quary in onto
-                print_if_available(query[2], query_results, showall)            #print the 3 element in the query_list, if theres result or showall
+    start = timeit.default_timer()
+    report = load_report(report_path) if report_path else None
+    if report is None or changes is None or report["output_hash"] != changes["output_hash"]:
+        # the report belongs to another onto file than the one the changes start from
+        report = {"checks": {}}
+        changes = None
+    modes = {}
+    tasks = []
+    for query in queries:
+        modes[query[1]] = plan_check(query[1], report["checks"].get(query[1]), changes)
+        if modes[query[1]] == "full":
+            tasks.append((query[1], None))
+        elif modes[query[1]] == "scenarios":
+            from rdflib import URIRef
+            tasks.extend((query[1], {scenario_variable(query[1]): URIRef(sc)}) for sc in changes["scenarios"])
 
-    elif engine == "rdflib":
-        for query in queries:
-            query_results = query_w_rdflib(filename, load_query(query[1]))
-            print_if_available(query[2], query_results, showall)
+    results = []
+    if tasks:
+        store_path = None
+        tmp_path = None
+        copy_path = None
+        if engine == "owlready":
+            if onto is None and quadstore_path:
+                _, onto = open_quadstore(path, quadstore_path)
+            elif onto is None:
+                # a new world, so that only the content of the file is queried, a SQLite quadstore is its own world
+                sqlite = serialization.detect_format(path)[0] == "sqlite"
+                onto = serialization.load(path, None if sqlite else World())
+            # the graph is built once for all checks
+            world, copy_path = writable_world(onto.world)
+            graph = world.as_rdflib_graph()
+            if jobs > 1 and len(tasks) > 1:
+                # the workers copy a read-only quadstore, that they can open while this process has it open as well
+                store_path = onto.world.filename
+                if copy_path is None:
+                    fd, tmp_path = tempfile.mkstemp(suffix=".sqlite3")
+                    os.close(fd)
+                    serialization.save(onto, tmp_path, "sqlite")
+                    store_path = tmp_path
+        elif engine == "rdflib":
+            # the onto file is parsed once for all checks
+            graph = load_graph(filename)
+        try:
+            results = run_checks(graph, tasks, jobs, store_path)
+        finally:
+            if tmp_path is not None:
+                os.remove(tmp_path)
+            if copy_path is not None:
+                world.close()
+                os.remove(copy_path)
+
+    checks = {}
+    for query in queries:
+        seconds = sum(task_seconds for task, (_, task_seconds) in zip(tasks, results) if task[0] == query[1])
+        new_results = [row for task, (task_results, _) in zip(tasks, results) if task[0] == query[1]
+                       for row in task_results]
+        if modes[query[1]] == "cached":
+            query_results = report["checks"][query[1]]["results"]
+        elif modes[query[1]] == "scenarios":
+            # a scenario only changes the results of its own, the results of the other scenarios are kept
+            prepared = prepare_query(query[1])
+            column = list(prepared.algebra["PV"]).index(scenario_variable(query[1]))
+            changed = set(changes["scenarios"])
+            query_results = [row for row in report["checks"][query[1]]["results"]
+                             if row[column] is None or str(row[column]) not in changed] + new_results
+        else:
+            query_results = new_results
+        checks[query[1]] = {"query_hash": file_hash(query[1]), "results": query_results}
+        print_if_available(query[2], query_results, showall)            #print the 3 element in the query_list, if theres result or showall
+        if modes[query[1]] == "cached":
+            print("check %i (%s) is unchanged" % (query[0], query[1]))
+        elif modes[query[1]] == "scenarios":
+            print("check %i (%s) took %.3f s for %i changed scenarios" % (query[0], query[1], seconds,
+                                                                          len(changes["scenarios"])))
+        else:
+            print("check %i (%s) took %.3f s" % (query[0], query[1], seconds))
+    if report_path:
+        save_report(report_path, {"output_hash": file_hash(path), "checks": checks})
+    print("%i checks took %.3f s" % (len(queries), timeit.default_timer() - start))
 
 
 
@@ -86,6 +403,6 @@ if __name__ == "__main__":
     iri = "http://example.org/min-onto-example.owl"
     onto_path = "outputs/onto.owl"
     onto_filename = "outputs/onto.owl"
-    query(onto_path, onto_filename, "owlready")
+    query(onto_path, onto_filename, "owlready", quadstore_path="outputs/onto.sqlite3")
 
 
@@ -0,0 +1,174 @@
+"""build manifest of the generated ontology
+
+The manifest is stored next to the ontology file and records the hash of every input file of a scenario together with
+the facts parsed from it (see scenarios.parse_scenario). A rebuild only parses the scenarios whose inputs changed and
+takes the facts of the other scenarios from the manifest. The facts of a changed scenario replace its old facts and the
+ontology is written from the facts of all scenarios, so it is the same as after a full build.
+
+The manifest is discarded if the code of the parsers changed, since the recorded facts may then be outdated.
+
+The triples that changed since the last build are derived from the recorded and the new facts of the changed
+scenarios, so that only the consistency checks that touch them are run again (see info_query.query).
+"""
+
+import json
+import os
+import owlready2 as o2
+import bulk_load
+import importTR as iTR
+import importPLC as iPLC
+import scenarios
+import serialization
+from quadstore import file_hash
+
+# input files of a scenario
+INPUT_FILES = ("component_list.csv", "PLCOpenXML.xml")
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path(onto_filepath) -> str:
+    """ path of the manifest of an ontology file
+
+    :param onto_filepath: path to onto file
+    """
+    return onto_filepath + MANIFEST_SUFFIX
+
+
+def parser_version() -> str:
+    """ hash of the code of the parsers and of the modules writing their facts, the recorded facts and the ontology are
+    only valid for the same code
+    """
+    return "".join(file_hash(module.__file__) for module in (iTR, iPLC, scenarios, bulk_load, serialization))
+
+
+def input_hashes(folder_path, sc_number) -> dict:
+    """ hashes of the input files of the scenarios
+
+    :param folder_path: folder of the scenarios, e.g. "./inputs/Sc"
+    :param sc_number: numbers of the scenarios
+    :return: dict scenario number -> {file name: hash or None, if the file does not exist}
+    """
+    hashes = {}
+    for sc in sc_number:
+        hashes[sc] = {}
+        for name in INPUT_FILES:
+            path = folder_path + sc + "/" + name
+            hashes[sc][name] = file_hash(path) if os.path.isfile(path) else None
+    return hashes
+
+
+def read_manifest(onto_filepath):
+    """ read the manifest of an ontology file
+
+    :param onto_filepath: path to onto file
+    :return: the manifest or None, if there is none or it was written by other parsers
+    """
+    try:
+        with open(manifest_path(onto_filepath), "r", encoding="UTF-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("parser_version") != parser_version():
+        return None
+    return manifest
+
+
+def write_manifest(onto_filepath, iri, inputs, facts):
+    """ write the manifest of a generated ontology file
+
+    :param onto_filepath: path to the generated onto file
+    :param iri: iri of the ontology
+    :param inputs: result of input_hashes
+    :param facts: dict scenario number -> facts of the scenario (see scenarios.parse_scenario)
+    """
+    manifest = {"parser_version": parser_version(),
+                "iri": iri,
+                "output_hash": file_hash(onto_filepath),
+                "scenarios": {sc: {"inputs": inputs[sc], "facts": facts[sc]} for sc in inputs}}
+    # write a temporary file first, so that an interrupted build never leaves a partial manifest
+    tmp_path = manifest_path(onto_filepath) + "." + str(os.getpid())
+    with open(tmp_path, "w", encoding="UTF-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path(onto_filepath))
+
+
+def changed_scenarios(manifest, iri, inputs) -> list:
+    """ scenarios whose inputs differ from the manifest
+
+    :param manifest: result of read_manifest
+    :param iri: iri of the ontology
+    :param inputs: result of input_hashes
+    :return: numbers of the changed scenarios, all scenarios if there is no manifest for the iri
+    """
+    if manifest is None or manifest["iri"] != iri:
+        return list(inputs)
+    recorded = manifest["scenarios"]
+    return [sc for sc in inputs if sc not in recorded or recorded[sc]["inputs"] != inputs[sc]]
+
+
+def is_up_to_date(manifest, iri, inputs, onto_filepath) -> bool:
+    """ check if the ontology file was generated from exactly these inputs and was not changed since
+
+    :param manifest: result of read_manifest
+    :param iri: iri of the ontology
+    :param inputs: result of input_hashes
+    :param onto_filepath: path to onto file
+    """
+    return (manifest is not None and os.path.isfile(onto_filepath)
+            and not changed_scenarios(manifest, iri, inputs)
+            and set(manifest["scenarios"]) == set(inputs)
+            and manifest["output_hash"] == file_hash(onto_filepath))
+
+
+def load_facts(manifest, iri, inputs, folder_path, jobs=None) -> dict:
+    """ facts of all scenarios, only the changed scenarios are parsed
+
+    :param manifest: result of read_manifest
+    :param iri: iri of the ontology
+    :param inputs: result of input_hashes, its order is the order of the scenarios
+    :param folder_path: folder of the scenarios, e.g. "./inputs/Sc"
+    :param jobs: number of processes parsing the changed scenarios, see scenarios.parse_scenarios
+    :return: dict scenario number -> facts of the scenario, in the order of inputs
+    """
+    changed = changed_scenarios(manifest, iri, inputs)
+    parsed = scenarios.parse_scenarios(folder_path, changed, jobs) if changed else {}
+    print("parsed " + str(len(changed)) + " of " + str(len(inputs)) + " scenarios", changed)
+    return {sc: parsed[sc] if sc in parsed else manifest["scenarios"][sc]["facts"] for sc in inputs}
+
+
+def scenario_triples(sc, facts) -> set:
+    """ the triples a scenario adds to the ontology
+
+    :param sc: number of the scenario
+    :param facts: facts of the scenario (see scenarios.parse_scenario)
+    """
+    return set(iTR.scenarioTriples(sc, facts["component_list"]) + iPLC.scenarioTriples(sc, facts["function_blocks"]))
+
+
+def get_changes(manifest, iri, inputs, facts):
+    """ changes of the ontology since the build recorded by the manifest
+
+    :param manifest: result of read_manifest
+    :param iri: iri of the ontology
+    :param inputs: result of input_hashes
+    :param facts: dict scenario number -> facts of the scenario, only the changed scenarios are needed
+    :return: dict with the hash of the previous onto file ("output_hash"), the IRIs of the changed and removed
+        scenarios ("scenarios") and the IRIs of the properties and classes of the changed triples ("terms", a class
+        stands for the rdf:type triples of its individuals), None if the changes are unknown
+    """
+    if manifest is None or manifest["iri"] != iri:
+        return None
+    recorded = manifest["scenarios"]
+    changed = changed_scenarios(manifest, iri, inputs) + [sc for sc in recorded if sc not in inputs]
+    triples = set()
+    for sc in changed:
+        old = scenario_triples(sc, recorded[sc]["facts"]) if sc in recorded else set()
+        new = scenario_triples(sc, facts[sc]) if sc in inputs else set()
+        triples |= old ^ new
+    terms = {o if p == o2.rdf_type else p for s, p, o in triples}
+    # names are in the namespace of the ontology, the other terms are storids of owlready2 (e.g. o2.owl_class)
+    base_iri = iri if iri.endswith(("#", "/")) else iri + "#"
+    return {"output_hash": manifest["output_hash"],
+            "scenarios": [base_iri + "xPPU_Sc" + sc for sc in changed],
+            "terms": {base_iri + term if isinstance(term, str) else o2.default_world._unabbreviate(term)
+                      for term in terms}}
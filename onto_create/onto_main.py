@@ -1,49 +1,152 @@
-# This is a sample Python script.
+"""generate the xPPU ontology from the scenario inputs and check its consistency
 
-# Press Umschalt+F10 to execute it or replace it with your code.
-# Press Double Shift to search everywhere for classes, files, tool windows, actions, and settings.
+    python onto_main.py [--scenarios 00 1*] [--jobs 4] [--format ntriples] [--quiet]
 
+The scenarios are the folders Sc<number> of the input folder. The run ends with a report of the time and the peak
+memory of every stage.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import timeit
 import importTR as iTR
 import importPLC as iPLC
 import info_query as iQR
+import manifest
+import scenarios
+import serialization
 
 
-# Press the green button in the gutter to run the script.
-if __name__ == '__main__':
-    sc_number=["00","01","02","03","04","05","06","07","08","09","10","11","12","13","14"]
-    folder_path ="./inputs/Sc"
-    resource_path= "inputs/Model/paper-RDFmodelle2/"
-    onto_filepath= "outputs/xPPU_onto.owl"
-    onto_filename = "xPPU_onto.owl"
-    iri = "http://example.org/onto-example.owl"
-
-    print("================== generate ontology =====================")
-    resource_data=iTR.readFile(iri, onto_filepath, folder_path,sc_number)
-    iPLC.generateOnto(iri, onto_filepath,folder_path,sc_number)
-
-
-    print("=============== running consistency checks ===============")
-    iQR.query(onto_filepath,onto_filename,engine="owlready", showall=True)
-
-
-    # model_graph = readRDF.load_Model(cad_path, simulation_path, componentlist_path,bpmn_path, plc_path, req_path,simReport_path,)
-    # model_info= readRDF.read_data(model_graph)
-    #
-    # iri = "http://example.org/onto-example.owl"
-    # metamodel_filepath = "inputs/Metamodel/Metamodel_MA.xmi"
-    # onto_filepath = "./outputs/onto.owl"
-    # onto_filename = "onto.owl"
-    # taxonomy_file = "inputs/Taxonomy/Foerdermittel.csv"
-    # # create_modelonto(iri, onto_file)
-    #
-    #
-    # dic_data= im.readClass(metamodel_filepath)
-    # print("===================== importing taxonomy =====================")
-    # it.readTaxonomy(iri, onto_filepath, taxonomy_file)
-    # print("====================== importing models ======================")
-    # importModel.create_modelonto(iri, onto_filepath,model_info)
-    # print("=============== running consistency checks ===============")
-    # checkConsistency.check(onto_filepath,onto_filename,model_info, engine="owlready", showall=True)
+def peak_memory() -> tuple:
+    """ peak resident memory in MB of this process and of the largest finished worker process, None if it is unknown
+    (e.g. on Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    # ru_maxrss is given in bytes on macOS and in kilobytes elsewhere
+    scale = 1 << (20 if sys.platform == "darwin" else 10)
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale)
+
+
+@contextlib.contextmanager
+def stage(name, report, quiet=False):
+    """ run a stage of the pipeline and add its seconds and the peak memory after it to the report
+
+    :param name: name of the stage
+    :param report: list of (name, seconds, peak memory of this process, peak memory of the worker processes)
+    :param quiet: discard the output of the stage
+    """
+    start = timeit.default_timer()
+    with open(os.devnull, "w") if quiet else contextlib.nullcontext() as devnull:
+        with contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+            yield
+    report.append((name, timeit.default_timer() - start) + peak_memory())
+
+
+def print_report(report) -> None:
+    print("================== stages =====================")
+    print("%-28s %10s %14s %14s" % ("stage", "time [s]", "peak RSS [MB]", "workers [MB]"))
+    for name, seconds, memory, workers in report:
+        print("%-28s %10.3f %14s %14s" % (name, seconds, "-" if memory is None else "%.1f" % memory,
+                                          "-" if workers is None else "%.1f" % workers))
+    print("%-28s %10.3f" % ("total", sum(row[1] for row in report)))
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="generates the xPPU ontology from the scenario inputs and checks its "
+                                                 "consistency")
+    parser.add_argument("--inputs", default="./inputs",
+                        help="folder with a folder Sc<number> for every scenario (default: %(default)s)")
+    parser.add_argument("-s", "--scenarios", nargs="+", metavar="PATTERN",
+                        help="numbers of the scenarios or shell-style patterns, e.g. 00 '1*' (default: all scenarios "
+                             "of the input folder)")
+    parser.add_argument("-o", "--output", default="outputs/xPPU_onto.owl",
+                        help="ontology file, the format is given by the extension, e.g. .nt, .ttl or .sqlite3, and .gz "
+                             "compresses it (default: %(default)s)")
+    parser.add_argument("-f", "--format", choices=serialization.FORMATS,
+                        help="format of the ontology file, replaces the extension of the output file")
+    parser.add_argument("--iri", default="http://example.org/onto-example.owl",
+                        help="IRI of the ontology (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of processes parsing the scenarios (default: one per CPU)")
+    parser.add_argument("--check-jobs", type=int, default=1,
+                        help="number of processes running the consistency checks, more than one only pays off for "
+                             "many or slow checks (default: %(default)s)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="parse all scenarios and run all checks, instead of only the changed ones")
+    parser.add_argument("--debug-round-trip", action="store_true",
+                        help="save the ontology after every stage and run the consistency checks on the saved file, "
+                             "otherwise the stages share the ontology in memory")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the report of the stages")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1 or args.check_jobs < 1:
+        parser.error("the number of jobs must be at least 1")
+    if args.format:
+        args.output = serialization.path_with_format(args.output, args.format)
+    args.folder_path = os.path.join(args.inputs, "Sc")
+    if not os.path.isdir(args.inputs):
+        parser.error("input folder " + args.inputs + " does not exist")
+    args.sc_number = scenarios.discover_scenarios(args.folder_path, args.scenarios)
+    if not args.sc_number:
+        parser.error("no scenarios found in " + args.inputs + (" for " + " ".join(args.scenarios)
+                                                               if args.scenarios else ""))
+    return args
 
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sc_number = args.sc_number
+    folder_path = args.folder_path
+    onto_filepath = args.output
+    onto_filename = os.path.basename(onto_filepath)
+    iri = args.iri
+    # results of the last consistency checks, only the checks touched by changed facts are run again
+    check_report = onto_filepath + ".checks.json"
+    os.makedirs(os.path.dirname(onto_filepath) or ".", exist_ok=True)
+    report = []
+
+    if not args.quiet:
+        print("================== generate ontology =====================")
+        print("scenarios", sc_number)
+    # only the scenarios whose inputs changed since the last build are parsed (in parallel), the facts of the other
+    # scenarios are taken from the build manifest, the ontology is written by this process in the order of sc_number
+    with stage("read manifest", report, args.quiet):
+        inputs = manifest.input_hashes(folder_path, sc_number)
+        previous = None if args.rebuild else manifest.read_manifest(onto_filepath)
+    onto = None
+    if manifest.is_up_to_date(previous, iri, inputs, onto_filepath):
+        if not args.quiet:
+            print("ontology is up to date")
+        changes = manifest.get_changes(previous, iri, inputs, {})
+    else:
+        with stage("parse scenarios", report, args.quiet):
+            facts = manifest.load_facts(previous, iri, inputs, folder_path, args.jobs)
+            changes = manifest.get_changes(previous, iri, inputs, facts)
+        with stage("import component lists", report, args.quiet):
+            iTR.readFile(iri, onto_filepath, folder_path,sc_number,
+                         {sc: facts[sc]["component_list"] for sc in sc_number}, save=args.debug_round_trip)
+        with stage("import PLCopen XML", report, args.quiet):
+            onto = iPLC.generateOnto(iri, onto_filepath,folder_path,sc_number,
+                                     {sc: facts[sc]["function_blocks"] for sc in sc_number})
+        with stage("write manifest", report, args.quiet):
+            manifest.write_manifest(onto_filepath, iri, inputs, facts)
+
+    if not args.quiet:
+        print("=============== running consistency checks ===============")
+    # without a generated ontology in memory (it was up to date or for debugging) the saved file is checked
+    with stage("consistency checks", report, args.quiet):
+        iQR.query(onto_filepath,onto_filename,engine="owlready", showall=True,
+                  onto=None if args.debug_round_trip else onto, jobs=args.check_jobs, report_path=check_report,
+                  changes=changes)
+    print_report(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""persistent owlready2 quadstore of the generated ontology
+
+The ontology file is parsed once into an SQLite quadstore, later runs reopen the quadstore read-only as long as the
+hash of the ontology file stored next to the quadstore matches.
+"""
+
+import hashlib
+import json
+import os
+import owlready2 as o2
+import serialization
+
+
+def file_hash(path) -> str:
+    """ sha256 hash of a file
+
+    :param path: path to the file
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_quadstore(onto_filepath, quadstore_path, source_hash) -> str:
+    """ parse the ontology file into a new quadstore and return the IRI of the ontology
+
+    :param onto_filepath: path to onto file
+    :param quadstore_path: path to the SQLite file of the quadstore
+    :param source_hash: hash of the onto file
+    """
+    # build in a temporary file, so that other processes never open a partial quadstore
+    tmp_path = quadstore_path + "." + str(os.getpid())
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    world = o2.World(filename=tmp_path)
+    try:
+        base_iri = serialization.load(onto_filepath, world).base_iri
+        world.save()
+    finally:
+        world.close()
+    os.replace(tmp_path, quadstore_path)
+    with open(quadstore_path + ".json", "w") as f:
+        json.dump({"source_hash": source_hash, "base_iri": base_iri}, f)
+    return base_iri
+
+
+def open_quadstore(onto_filepath, quadstore_path):
+    """ open the quadstore of the onto file read-only, (re)build it if the onto file changed
+
+    :param onto_filepath: path to onto file
+    :param quadstore_path: path to the SQLite file of the quadstore
+    :return: world of the quadstore and the ontology
+    """
+    # an onto file that is a SQLite quadstore already is opened in place
+    if serialization.detect_format(onto_filepath)[0] == "sqlite":
+        onto = serialization.load(onto_filepath)
+        return onto.world, onto
+    source_hash = file_hash(onto_filepath)
+    try:
+        with open(quadstore_path + ".json", "r") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        info = None
+    if info is None or info["source_hash"] != source_hash or not os.path.exists(quadstore_path):
+        base_iri = build_quadstore(onto_filepath, quadstore_path, source_hash)
+    else:
+        base_iri = info["base_iri"]
+    world = o2.World(filename=quadstore_path, exclusive=False, read_only=True)
+    return world, world.get_ontology(base_iri)
@@ -0,0 +1,60 @@
+"""parallel parsing of the scenario inputs
+
+The component list and the PLCopen XML of every scenario are independent, so the scenarios are parsed in a process
+pool into plain per-scenario facts (no owlready2 objects). The facts are returned in the order of the scenario
+numbers and written into the ontology by a single process (importTR.readFile and importPLC.generateOnto), so the
+ontology is the same as in a sequential run.
+"""
+
+import fnmatch
+import os
+from concurrent.futures import ProcessPoolExecutor
+import importTR as iTR
+import importPLC as iPLC
+
+
+def discover_scenarios(folder_path, patterns=None) -> list:
+    """ numbers of the scenarios that have a folder, e.g. "./inputs/Sc03" for the folder path "./inputs/Sc"
+
+    :param folder_path: folder of the scenarios, e.g. "./inputs/Sc"
+    :param patterns: shell-style patterns the numbers are filtered with, e.g. ["00", "1*"], None for all scenarios
+    :return: the numbers in ascending order
+    """
+    directory, prefix = os.path.split(folder_path)
+    sc_number = []
+    for name in os.listdir(directory or "."):
+        sc = name[len(prefix):]
+        if name.startswith(prefix) and sc.isdigit() and os.path.isdir(os.path.join(directory, name)):
+            if patterns is None or any(fnmatch.fnmatchcase(sc, pattern) for pattern in patterns):
+                sc_number.append(sc)
+    return sorted(sc_number, key=lambda sc: (int(sc), sc))
+
+
+def parse_scenario(folder_path, sc) -> dict:
+    """ parse the inputs of one scenario
+
+    :param folder_path: folder of the scenarios, e.g. "./inputs/Sc"
+    :param sc: number of the scenario, e.g. "03"
+    :return: dict with the parsed component list and the function blocks, None for missing inputs
+    """
+    return {"component_list": iTR.readComponentList(folder_path + sc + "/component_list.csv"),
+            "function_blocks": iPLC.readScenario(folder_path, sc)}
+
+
+def parse_scenarios(folder_path, sc_number, jobs=None) -> dict:
+    """ parse the inputs of all scenarios, with up to jobs worker processes
+
+    :param folder_path: folder of the scenarios, e.g. "./inputs/Sc"
+    :param sc_number: numbers of the scenarios
+    :param jobs: number of worker processes, defaults to the number of CPUs, 1 parses in this process
+    :return: dict scenario number -> facts of the scenario (see parse_scenario), in the order of sc_number
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(sc_number))
+    if jobs <= 1:
+        return {sc: parse_scenario(folder_path, sc) for sc in sc_number}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # map returns the results in the order of the scenarios, however the workers finish
+        facts = pool.map(parse_scenario, [folder_path] * len(sc_number), sc_number)
+        return dict(zip(sc_number, facts))
@@ -0,0 +1,249 @@
+"""reading and writing the ontology file in several formats
+
+Supported formats are RDF/XML ("rdfxml", the default of owlready2), N-Triples ("ntriples"), Turtle ("turtle") and the
+native SQLite quadstore of owlready2 ("sqlite"). The text formats are written in a stream to a temporary file, that
+replaces the ontology file once it is complete, and are compressed with gzip if the file name ends with ".gz". When a
+file is loaded its format and compression are detected from its content.
+
+N-Triples and the SQLite quadstore are much faster to write and to load than RDF/XML. Turtle is the most compact text
+format, but owlready2 can not parse it, so it is parsed by rdflib and every triple is passed on to owlready2 as
+N-Triples through a temporary file, without keeping the triples in memory.
+"""
+
+import gzip
+import io
+import os
+import re
+import sqlite3
+import tempfile
+import owlready2 as o2
+
+FORMATS = ("rdfxml", "ntriples", "turtle", "sqlite")
+# formats by file extension, used when saving and if the content of a file is ambiguous
+EXTENSIONS = {".owl": "rdfxml", ".rdf": "rdfxml", ".xml": "rdfxml", ".nt": "ntriples", ".ttl": "turtle",
+              ".sqlite": "sqlite", ".sqlite3": "sqlite", ".db": "sqlite"}
+GZIP_MAGIC = b"\x1f\x8b"
+SQLITE_MAGIC = b"SQLite format 3\x00"
+# prefixes of the Turtle files besides the prefix of the ontology
+TURTLE_PREFIXES = {"rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+                   "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+                   "owl": "http://www.w3.org/2002/07/owl#",
+                   "xsd": "http://www.w3.org/2001/XMLSchema#"}
+# local names that can be written as prefixed names in Turtle, others are written as full IRIs
+TURTLE_LOCAL_NAME = re.compile(r"^[A-Za-z0-9_]([A-Za-z0-9_.-]*[A-Za-z0-9_-])?$")
+# extension of the files written in a format
+FORMAT_EXTENSIONS = {"rdfxml": ".owl", "ntriples": ".nt", "turtle": ".ttl", "sqlite": ".sqlite3"}
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def format_from_path(path) -> tuple:
+    """ format and compression given by the file name, e.g. "onto.nt.gz" -> ("ntriples", True)
+
+    :param path: path to onto file
+    :return: format or None, if the extension is unknown, and whether the file is compressed with gzip
+    """
+    compressed = path.endswith(".gz")
+    if compressed:
+        path = path[:-len(".gz")]
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower()), compressed
+
+
+def path_with_format(path, format) -> str:
+    """ path to onto file with the extension of a format, e.g. ("onto.owl.gz", "ntriples") -> "onto.nt.gz"
+
+    :param path: path to onto file
+    :param format: one of FORMATS
+    """
+    if format not in FORMATS:
+        raise ValueError("unknown ontology format " + format + ", must be in " + str(FORMATS))
+    compressed = path.endswith(".gz")
+    if compressed:
+        path = path[:-len(".gz")]
+    root, extension = os.path.splitext(path)
+    if extension.lower() not in EXTENSIONS:
+        root = path
+    # a SQLite quadstore is opened in place, so it is never compressed
+    return root + FORMAT_EXTENSIONS[format] + (".gz" if compressed and format != "sqlite" else "")
+
+
+def detect_format(path) -> tuple:
+    """ format and compression of an existing onto file, detected from its content
+
+    :param path: path to onto file
+    :return: format and whether the file is compressed with gzip
+    """
+    with open(path, "rb") as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    with (gzip.open if compressed else open)(path, "rb") as f:
+        head = f.read(4096)
+    if head.startswith(SQLITE_MAGIC):
+        return "sqlite", compressed
+    # the first line, that is not empty or a comment
+    text = head.lstrip(b"\xef\xbb\xbf")
+    first = next((line.strip() for line in text.splitlines() if line.strip() and not line.startswith(b"#")), b"")
+    if first.startswith((b"@prefix", b"@base")) or first.upper().startswith((b"PREFIX", b"BASE")):
+        return "turtle", compressed
+    if first.startswith(b"<?xml") or first.startswith(b"<rdf:RDF") or first.startswith(b"<!DOCTYPE"):
+        return "rdfxml", compressed
+    if first.startswith((b"<", b"_:")) and first.endswith(b"."):
+        # N-Triples are Turtle as well, the extension decides
+        return ("turtle" if format_from_path(path)[0] == "turtle" else "ntriples"), compressed
+    return format_from_path(path)[0] or "rdfxml", compressed
+
+
+def escape_string(value) -> str:
+    """ escape a string for a literal of N-Triples or Turtle
+
+    :param value: the string
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_turtle(onto, f):
+    """ write the triples of an ontology as Turtle, the triples of a subject are grouped
+
+    :param onto: the ontology
+    :param f: binary file object
+    """
+    graph = onto.graph
+    prefixes = dict(TURTLE_PREFIXES, **{"": onto.base_iri})
+    names = {}
+
+    def term(storid):
+        # blank nodes have negative storids
+        if storid < 0:
+            return "_:b%s" % -storid
+        name = names.get(storid)
+        if name is None:
+            iri = graph._unabbreviate(storid)
+            name = "<%s>" % iri
+            for prefix, namespace in prefixes.items():
+                if iri.startswith(namespace) and TURTLE_LOCAL_NAME.match(iri[len(namespace):]):
+                    name = prefix + ":" + iri[len(namespace):]
+                    break
+            names[storid] = name
+        return name
+
+    def literal(o, d):
+        if isinstance(o, str):
+            o = escape_string(o)
+        if isinstance(d, str) and d.startswith("@"):
+            return '"%s"%s' % (o, d)
+        if d == 0:
+            return '"%s"' % o
+        return '"%s"^^%s' % (o, term(d))
+
+    for prefix, namespace in prefixes.items():
+        f.write(("@prefix %s: <%s> .\n" % (prefix, namespace)).encode("utf8"))
+    subject = None
+    for s, p, o, d in graph._iter_triples(sort_by_s=True):
+        predicate = "a" if p == o2.rdf_type else term(p)
+        obj = term(o) if d is None else literal(o, d)
+        if s == subject:
+            f.write((" ;\n    %s %s" % (predicate, obj)).encode("utf8"))
+        else:
+            f.write((("" if subject is None else " .") + "\n%s %s %s" % (term(s), predicate, obj)).encode("utf8"))
+            subject = s
+    if subject is not None:
+        f.write(b" .\n")
+
+
+def write_ntriples_from_turtle(turtle_file, f):
+    """ parse a Turtle file with rdflib and write its triples as N-Triples, every triple is written as soon as it is
+    parsed instead of being added to a graph
+
+    :param turtle_file: binary file object of the Turtle file
+    :param f: binary file object the N-Triples are written to
+    """
+    # rdflib is only imported, if a Turtle file is loaded
+    import rdflib
+
+    def term(node):
+        if isinstance(node, rdflib.Literal):
+            literal = '"%s"' % escape_string(str(node))
+            if node.language:
+                return literal + "@" + node.language
+            return literal + ("^^<%s>" % node.datatype if node.datatype else "")
+        return node.n3()
+
+    class NTriplesSink(rdflib.Graph):
+        # the parser adds the triples to this graph, which writes them instead of storing them
+        def add(self, triple):
+            f.write(("%s %s %s .\n" % tuple(term(node) for node in triple)).encode("utf8"))
+            return self
+
+    NTriplesSink().parse(turtle_file, format="turtle")
+
+
+def save(onto, path, format=None):
+    """ write an ontology to a file, the file is only replaced once it is complete
+
+    :param onto: the ontology
+    :param path: path to onto file, ending with ".gz" to compress it
+    :param format: one of FORMATS, by default given by the extension of path (RDF/XML for unknown extensions)
+    """
+    path_format, compressed = format_from_path(path)
+    format = format or path_format or "rdfxml"
+    if format not in FORMATS:
+        raise ValueError("unknown ontology format " + format + ", must be in " + str(FORMATS))
+    tmp_path = path + "." + str(os.getpid())
+    if format == "sqlite":
+        if compressed:
+            raise ValueError("a SQLite quadstore can not be compressed, since it is opened in place")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        # the quadstore of the world is copied as it is, it contains all ontologies of the world
+        onto.world.save()
+        target = sqlite3.connect(tmp_path)
+        try:
+            onto.world.graph.db.backup(target)
+        finally:
+            target.close()
+    else:
+        with open(tmp_path, "wb") as raw:
+            f = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) if compressed else raw
+            try:
+                buffered = io.BufferedWriter(f, WRITE_BUFFER_SIZE)
+                if format == "turtle":
+                    write_turtle(onto, buffered)
+                else:
+                    onto.save(file=buffered, format=format)
+                buffered.flush()
+            finally:
+                if compressed:
+                    f.close()
+    os.replace(tmp_path, path)
+
+
+def load(path, world=None):
+    """ load an ontology file in any of the FORMATS, possibly compressed with gzip
+
+    :param path: path to onto file
+    :param world: world the ontology is loaded into, by default the default world; it must be None for a SQLite
+        quadstore, which is always opened read-only as its own world
+    :return: the loaded ontology
+    """
+    format, compressed = detect_format(path)
+    if format == "sqlite":
+        if compressed:
+            raise ValueError("a SQLite quadstore can not be loaded from a compressed file")
+        if world is not None:
+            raise ValueError("a SQLite quadstore is opened as its own world, it can not be loaded into another world")
+        quadstore = o2.World(filename=path, exclusive=False, read_only=True)
+        # the ontology with the most triples, besides the anonymous ontology owlready2 creates in every world
+        ontologies = [onto for onto in quadstore.ontologies.values() if onto.base_iri != "http://anonymous/"]
+        return max(ontologies, key=lambda onto: len(onto.graph))
+    world = world or o2.default_world
+    onto = world.get_ontology("file://" + os.path.abspath(path))
+    with gzip.open(path, "rb") if compressed else open(path, "rb") as fileobj:
+        if format != "turtle":
+            return onto.load(fileobj=fileobj)
+        with tempfile.TemporaryFile() as ntriples:
+            write_ntriples_from_turtle(fileobj, ntriples)
+            ntriples.seek(0)
+            return onto.load(fileobj=ntriples)
+
+
+if __name__ == "__main__":
+    # convert the generated ontology, e.g. into N-Triples
+    save(load("outputs/xPPU_onto.owl"), "outputs/xPPU_onto.nt")
@@ -0,0 +1,44 @@
+"""fixtures shared by the tests of onto_create
+
+    python -m pytest onto_create/tests
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+
+ONTO_CREATE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the modules of onto_create are scripts, that import each other from their folder
+if ONTO_CREATE_DIR not in sys.path:
+    sys.path.insert(0, ONTO_CREATE_DIR)
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """ copy of the scenario inputs, that a test may change """
+    path = str(tmp_path / "inputs")
+    shutil.copytree(os.path.join(ONTO_CREATE_DIR, "inputs"), path)
+    return path
+
+
+@pytest.fixture
+def run_onto_main():
+    """ runs onto_main.py in a new process like from the command line, the ontology is generated in the default
+    world of owlready2, which is not reset within a process
+    """
+    def run(*args):
+        return subprocess.run([sys.executable, "onto_main.py", *args], cwd=ONTO_CREATE_DIR, capture_output=True,
+                              text=True, check=True)
+    return run
+
+
+@pytest.fixture
+def add_component(inputs):
+    """ appends a component to the component list of a scenario of the copied inputs """
+    def add(sc, row="300;300B1;X3.1;Workpiece detected (Inductive Switch);Stack;DI"):
+        with open(os.path.join(inputs, "Sc" + sc, "component_list.csv"), "a", encoding="UTF-8") as f:
+            f.write(row + "\n")
+    return add
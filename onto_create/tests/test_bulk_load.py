@@ -0,0 +1,88 @@
+"""tests of the bulk loading of triples into the quadstore"""
+
+import types
+import owlready2 as o2
+import pytest
+import bulk_load
+
+IRI = "http://example.org/onto-example.owl#"
+
+
+@pytest.fixture
+def world():
+    world = o2.World()
+    yield world
+    world.close()
+
+
+def declare(onto):
+    """ the classes and properties the facts are about """
+    with onto:
+        class Scenario(o2.Thing): pass
+        class plc(o2.Thing): pass
+        class has_info_source(o2.ObjectProperty): pass
+    return Scenario, plc, has_info_source
+
+
+def get_triples(world):
+    return set(world.as_rdflib_graph())
+
+
+def test_triples_equal_owlready(world):
+    onto = world.get_ontology(IRI)
+    declare(onto)
+    loader = bulk_load.TripleLoader(onto)
+    loader.add_triples(bulk_load.individual("xPPU_Sc01", "Scenario") + bulk_load.individual("Sc01_plc", "plc")
+                       + bulk_load.subclass("function_block", "plc"))
+    loader.add_triples([("xPPU_Sc01", "has_info_source", "Sc01_plc"),
+                        # duplicates are ignored
+                        ("xPPU_Sc01", "has_info_source", "Sc01_plc")])
+    loader.flush()
+
+    reference_world = o2.World()
+    reference = reference_world.get_ontology(IRI)
+    Scenario, plc, has_info_source = declare(reference)
+    with reference:
+        types.new_class("function_block", (plc,))
+        scenario = Scenario("xPPU_Sc01")
+        scenario.has_info_source.append(plc("Sc01_plc"))
+    try:
+        assert get_triples(world) == get_triples(reference_world)
+    finally:
+        reference_world.close()
+    assert onto.xPPU_Sc01.has_info_source == [onto.Sc01_plc]
+    assert issubclass(onto.function_block, onto.plc)
+
+
+def test_flush_in_batches(world, monkeypatch):
+    monkeypatch.setattr(bulk_load, "BATCH_SIZE", 3)
+    monkeypatch.setattr(bulk_load, "INTERN_CHUNK_SIZE", 2)
+    onto = world.get_ontology(IRI)
+    declare(onto)
+    loader = bulk_load.TripleLoader(onto)
+    names = ["Sc%02i" % i for i in range(7)]
+    loader.add_triples(triple for name in names for triple in bulk_load.individual(name, "Scenario"))
+    # the batches are flushed when they are full, the rest is kept until flush
+    assert len(loader.triples) == 2
+    loader.flush()
+    assert loader.triples == []
+    assert sorted(ins.name for ins in onto.Scenario.instances()) == names
+
+
+def test_intern(world):
+    onto = world.get_ontology(IRI)
+    Scenario = declare(onto)[0]
+    loader = bulk_load.TripleLoader(onto)
+    loader.intern(["Scenario", "Sc01", "Sc02", "Sc01"])
+    # names in the quadstore keep their storid, new names get the next storids in the order of the names
+    assert loader.storids["Scenario"] == Scenario.storid
+    assert loader.storids["Sc02"] == loader.storids["Sc01"] + 1
+    storids = dict(loader.storids)
+    loader.intern(["Sc02", "Sc01"])
+    assert loader.storids == storids
+    # a new loader finds the interned names in the quadstore
+    other = bulk_load.TripleLoader(onto)
+    other.intern(["Sc01", "Sc03"])
+    assert other.storids["Sc01"] == storids["Sc01"]
+    assert other.storids["Sc03"] == storids["Sc02"] + 1
+    assert world._abbreviate(IRI + "Sc03", False) == other.storids["Sc03"]
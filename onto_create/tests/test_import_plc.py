@@ -0,0 +1,101 @@
+"""tests of the streaming PLCopen XML importer"""
+
+import os
+import xml.etree.ElementTree as ET
+import owlready2 as o2
+import importPLC as iPLC
+
+ONTO_CREATE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLCOPEN_XML = """<?xml version="1.0" encoding="utf-8"?>
+<project xmlns="http://www.plcopen.org/xml/tc6_0200">
+  <types>
+    <pous>
+      <pou name="FB_Ignored" pouType="functionBlock">
+        <actions><action name="FB_Ignored.Run" /></actions>
+      </pou>
+    </pous>
+  </types>
+  <addData>
+    <data name="http://www.3s-software.com/plcopenxml/pou" handleUnknown="implementation">
+      <pou name="FB_Crane" pouType="functionBlock">
+        <interface>
+          <inputVars>
+            <variable name="bStart"><type><BOOL /></type></variable>
+            <variable name="stConfig"><type><derived name="ST_Config" /></type></variable>
+          </inputVars>
+          <outputVars>
+            <variable name="nState"><type><INT /></type></variable>
+          </outputVars>
+        </interface>
+        <actions>
+          <action name="FB_Crane.Pick" />
+          <action name="FB_Crane.Place" />
+        </actions>
+        <addData>
+          <data name="http://www.3s-software.com/plcopenxml/pou" handleUnknown="implementation">
+            <pou name="FB_Gripper" pouType="functionBlock">
+              <actions><action name="FB_Gripper.Close" /></actions>
+            </pou>
+          </data>
+        </addData>
+      </pou>
+    </data>
+    <data name="http://www.3s-software.com/plcopenxml/pou" handleUnknown="implementation">
+      <pou name="MAIN" pouType="program">
+        <actions><action name="MAIN.Init" /></actions>
+      </pou>
+    </data>
+  </addData>
+</project>
+"""
+
+
+def tree_read_class(filepath):
+    """ reads the function blocks like the importer did with the whole XML tree in memory, before it streamed the file
+    """
+    function_blocks = {}
+    for x in ET.parse(filepath).getroot():
+        if "addData" in x.tag:
+            for data in x:
+                for ele in data.iter():
+                    if "pou" in ele.tag and ele.attrib.get("pouType") == "functionBlock":
+                        actions = function_blocks.setdefault(ele.attrib["name"], [])
+                        for var in ele.iter():
+                            if "action" in var.tag and "name" in var.attrib:
+                                actions.append(var.attrib["name"])
+    return function_blocks
+
+
+def test_read_pous(tmp_path):
+    path = tmp_path / "PLCOpenXML.xml"
+    path.write_text(PLCOPEN_XML)
+    pous = iPLC.readPOUs(str(path))
+    # POUs outside of the top-level addData are ignored
+    assert set(pous) == {"FB_Crane", "FB_Gripper", "MAIN"}
+    assert pous["MAIN"] == {"type": "program", "actions": ["MAIN.Init"], "interface": {}}
+    # the actions of a nested POU belong to the enclosing POU as well
+    assert pous["FB_Crane"]["actions"] == ["FB_Crane.Pick", "FB_Crane.Place", "FB_Gripper.Close"]
+    assert pous["FB_Gripper"]["actions"] == ["FB_Gripper.Close"]
+    assert pous["FB_Crane"]["interface"] == {
+        "inputVars": [{"name": "bStart", "type": "BOOL"}, {"name": "stConfig", "type": "ST_Config"}],
+        "outputVars": [{"name": "nState", "type": "INT"}]}
+    assert iPLC.readClass(str(path)) == tree_read_class(str(path))
+
+
+def test_read_class_equals_tree():
+    filepath = os.path.join(ONTO_CREATE_DIR, "inputs", "Sc01", "PLCOpenXML.xml")
+    function_blocks = iPLC.readClass(filepath)
+    assert function_blocks
+    assert function_blocks == tree_read_class(filepath)
+
+
+def test_scenario_triples():
+    assert iPLC.readScenario(os.path.join(ONTO_CREATE_DIR, "inputs", "Sc"), "00") is None
+    assert iPLC.scenarioTriples("00", None) == []
+    triples = iPLC.scenarioTriples("01", {"FB_Crane": ["FB_Crane.Pick"], "FB_Stack": []})
+    assert ("xPPU_Sc01", "has_info_source", "xPPU_Sc01_PLCOpenXML") in triples
+    assert ("xPPU_Sc01_PLCOpenXML", "has_FB", "Sc01_FB_FB_Stack") in triples
+    assert ("Sc01_FB_FB_Crane", "has_action", "FB_Crane.Pick") in triples
+    # an action is a plant process named by the part of its name before the first "."
+    assert ("FB_Crane", o2.rdf_type, "plant_process") in triples
@@ -0,0 +1,63 @@
+"""tests of the component-list importer"""
+
+import owlready2 as o2
+import importTR as iTR
+
+COMPONENT_LIST = """Position;Resource;Clamp;Description;Component
+1;100;X1;Stack;
+;;;;
+100;100A1;X1.1;Extend seperator (Valve);Stack
+100;100B9;X1.2;Seperator is extended (Reed Switch);Stack
+200;200M1;X2.1;Drehen für Kran (Motor);Größe Kran
+"""
+
+
+def replace_spec_char_chained(row):
+    """ the replacements of the special characters one after the other, like the importer did before """
+    for i in range(len(row) - 1):
+        for old, new in ((' ', ''), ('(', '_'), (')', ''), ('ä', 'ae'), ('Ä', 'Ae'), ('ö', 'oe'), ('Ö', 'Oe'),
+                         ('ü', 'ue'), ('Ü', 'Ue'), ('ß', 'ss'), ('fuer', '_')):
+            row[i] = row[i].replace(old, new)
+    return row
+
+
+def test_replace_spec_char():
+    row = ["Drehen für Kran (Motor)", "Größe Äpfel Öl Übung", "(fuer) ä", "last cell (kept) ü"]
+    assert iTR.replace_spec_char(list(row)) == replace_spec_char_chained(list(row))
+    assert iTR.replace_spec_char(list(row)) == ["Drehen_Kran_Motor", "GroesseAepfelOelUebung", "__ae",
+                                                "last cell (kept) ü"]
+
+
+def test_read_component_list(tmp_path):
+    assert iTR.readComponentList(str(tmp_path / "component_list.csv")) is None
+    path = tmp_path / "component_list.csv"
+    path.write_text(COMPONENT_LIST, encoding="UTF-8")
+    headers, rows = iTR.readComponentList(str(path))
+    assert headers == ["Position", "Resource", "Clamp", "Description", "Component"]
+    # the empty row is dropped
+    assert rows == [["1", "100", "X1", "Stack", ""],
+                    ["100", "100A1", "X1.1", "Extendseperator_Valve", "Stack"],
+                    ["100", "100B9", "X1.2", "Seperatorisextended_ReedSwitch", "Stack"],
+                    ["200", "200M1", "X2.1", "Drehen_Kran_Motor", "Größe Kran"]]
+
+
+def test_scenario_triples(tmp_path):
+    assert iTR.scenarioTriples("00", None) == iTR.bulk_load.individual("xPPU_Sc00", "Scenario")
+    path = tmp_path / "component_list.csv"
+    path.write_text(COMPONENT_LIST, encoding="UTF-8")
+    headers, rows = iTR.readComponentList(str(path))
+    triples = iTR.scenarioTriples("01", (headers, rows))
+    # every header class is declared once
+    for header in headers:
+        assert triples.count((header, o2.rdfs_subclassof, "plant_info")) == 1
+    assert ("xPPU_Sc01", "has_info_source", "xPPU_Sc01_technical_report") in triples
+    assert ("xPPU_Sc01_technical_report", "has_info", "100A1") in triples
+    assert ("100A1", o2.rdf_type, "Resource") in triples
+    assert ("100A1", "has_info", "Extendseperator_Valve") in triples
+    assert ("Extendseperator_Valve", o2.rdf_type, "Description") in triples
+    # the empty cell of the first row is no individual
+    assert ("100", "has_info", "") not in triples
+    # the classes of the descriptions
+    assert ("Valve", o2.rdfs_subclassof, "actuator") in triples
+    assert ("ReedSwitch", o2.rdfs_subclassof, "sensor") in triples
+    assert ("Kran", o2.rdfs_subclassof, "actuator") not in triples
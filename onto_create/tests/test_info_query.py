@@ -0,0 +1,111 @@
+"""tests of the consistency checks"""
+
+import json
+import os
+import shutil
+import pytest
+import info_query as iQR
+
+ONTO_CREATE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES = ["query/scenario_query.sparql", "query/scenario_info_query.sparql"]
+
+
+@pytest.fixture
+def built(inputs, tmp_path, run_onto_main, monkeypatch):
+    """ builds the ontology as N-Triples and as SQLite quadstore, the checks are run in the folder of onto_main """
+    paths = {}
+    for format in ("ntriples", "sqlite"):
+        output = str(tmp_path / "outputs" / "xPPU_onto.owl")
+        run_onto_main("--inputs", inputs, "-o", output, "-j", "1", "-f", format, "-q")
+        paths[format] = output.replace(".owl", ".nt" if format == "ntriples" else ".sqlite3")
+    monkeypatch.chdir(ONTO_CREATE_DIR)
+    return paths
+
+
+def read_checks(report_path):
+    """ the results of every check in the report, in a stable order """
+    with open(report_path, encoding="UTF-8") as f:
+        checks = json.load(f)["checks"]
+    return {query: sorted(check["results"], key=str) for query, check in checks.items()}
+
+
+def test_parallel_checks(built, tmp_path):
+    path = built["ntriples"]
+    iQR.query(path, jobs=1, report_path=str(tmp_path / "sequential.json"))
+    checks = read_checks(str(tmp_path / "sequential.json"))
+    assert set(checks) == set(QUERIES)
+    assert all(checks.values())
+    iQR.query(path, jobs=2, report_path=str(tmp_path / "parallel.json"))
+    assert read_checks(str(tmp_path / "parallel.json")) == checks
+    # a read-only SQLite quadstore is copied by the workers
+    iQR.query(built["sqlite"], jobs=2, report_path=str(tmp_path / "sqlite.json"))
+    assert read_checks(str(tmp_path / "sqlite.json")) == checks
+    iQR.query(path, jobs=2, quadstore_path=str(tmp_path / "quadstore.sqlite3"),
+              report_path=str(tmp_path / "quadstore.json"))
+    assert read_checks(str(tmp_path / "quadstore.json")) == checks
+    iQR.query(path, path, engine="rdflib", report_path=str(tmp_path / "rdflib.json"))
+    assert read_checks(str(tmp_path / "rdflib.json")) == checks
+
+
+def test_run_checks(built):
+    onto = iQR.serialization.load(built["sqlite"])
+    try:
+        world, copy_path = iQR.writable_world(onto.world)
+        assert copy_path is not None
+        tasks = [(query, None) for query in QUERIES]
+        try:
+            sequential = iQR.run_checks(world.as_rdflib_graph(), tasks)
+            parallel = iQR.run_checks(world.as_rdflib_graph(), tasks, jobs=2, store_path=built["sqlite"])
+        finally:
+            world.close()
+            os.remove(copy_path)
+    finally:
+        onto.world.close()
+    assert [sorted(results) for results, _ in sequential] == [sorted(results) for results, _ in parallel]
+    assert all(results for results, _ in sequential)
+
+
+def test_prepare_query_once(monkeypatch):
+    monkeypatch.chdir(ONTO_CREATE_DIR)
+    assert iQR.prepare_query(QUERIES[0]) is iQR.prepare_query(QUERIES[0])
+
+
+def test_query_terms(monkeypatch):
+    monkeypatch.chdir(ONTO_CREATE_DIR)
+    assert iQR.query_terms(QUERIES[0]) == frozenset({"http://example.org/onto-example.owl#Scenario"})
+    assert iQR.query_terms(QUERIES[1]) == frozenset("http://example.org/onto-example.owl#" + term for term in (
+        "Scenario", "has_info_source", "has_info", "has_FB"))
+    assert [str(iQR.scenario_variable(query)) for query in QUERIES] == ["sc", "sc"]
+
+
+def test_plan_check(monkeypatch):
+    monkeypatch.chdir(ONTO_CREATE_DIR)
+    check = {"query_hash": iQR.file_hash(QUERIES[1]), "results": []}
+    changes = {"output_hash": "", "scenarios": ["http://example.org/onto-example.owl#xPPU_Sc02"],
+               "terms": {"http://example.org/onto-example.owl#has_info"}}
+    assert iQR.plan_check(QUERIES[1], None, changes) == "full"
+    assert iQR.plan_check(QUERIES[1], check, None) == "full"
+    assert iQR.plan_check(QUERIES[1], dict(check, query_hash="changed query"), changes) == "full"
+    assert iQR.plan_check(QUERIES[1], check, changes) == "scenarios"
+    assert iQR.plan_check(QUERIES[0], dict(check, query_hash=iQR.file_hash(QUERIES[0])), changes) == "cached"
+
+
+@pytest.mark.parametrize("change", ["add component", "remove scenario"])
+def test_incremental_checks_equal_full_checks(inputs, tmp_path, run_onto_main, add_component, change):
+    output = str(tmp_path / "incremental" / "xPPU_onto.nt")
+    run_onto_main("--inputs", inputs, "-o", output, "-j", "1")
+    checks = read_checks(output + ".checks.json")
+    if change == "add component":
+        add_component("02", "300;300B1;X3.1;Workpiece detected (Inductive Switch);Crane;DI")
+    else:
+        shutil.rmtree(os.path.join(inputs, "Sc03"))
+    stdout = run_onto_main("--inputs", inputs, "-o", output, "-j", "1").stdout
+    # only the scenario check is rerun, if the scenarios stay the same
+    assert ("check 1 (query/scenario_query.sparql) is unchanged" in stdout) == (change == "add component")
+    assert "check 2 (query/scenario_info_query.sparql) took" in stdout
+    assert "for 1 changed scenarios" in stdout
+    rebuilt = str(tmp_path / "rebuild" / "xPPU_onto.nt")
+    run_onto_main("--inputs", inputs, "-o", rebuilt, "-j", "1", "--rebuild")
+    incremental_checks = read_checks(output + ".checks.json")
+    assert incremental_checks != checks
+    assert incremental_checks == read_checks(rebuilt + ".checks.json")
@@ -0,0 +1,102 @@
+"""tests of the incremental build driven by the manifest"""
+
+import json
+import os
+import manifest
+import scenarios
+
+IRI = "http://example.org/onto-example.owl"
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_input_hashes(inputs, add_component):
+    folder_path = os.path.join(inputs, "Sc")
+    hashes = manifest.input_hashes(folder_path, ["00", "01"])
+    assert hashes["00"]["PLCOpenXML.xml"] is None
+    assert all(hashes["01"].values())
+    add_component("01")
+    changed = manifest.input_hashes(folder_path, ["00", "01"])
+    assert changed["00"] == hashes["00"]
+    assert changed["01"]["component_list.csv"] != hashes["01"]["component_list.csv"]
+    assert changed["01"]["PLCOpenXML.xml"] == hashes["01"]["PLCOpenXML.xml"]
+
+
+def test_manifest(inputs, tmp_path, add_component):
+    folder_path = os.path.join(inputs, "Sc")
+    sc_number = ["00", "01", "02"]
+    onto_filepath = str(tmp_path / "xPPU_onto.owl")
+    with open(onto_filepath, "w") as f:
+        f.write("ontology")
+    inputs_hashes = manifest.input_hashes(folder_path, sc_number)
+    facts = scenarios.parse_scenarios(folder_path, sc_number, jobs=1)
+    assert manifest.read_manifest(onto_filepath) is None
+    manifest.write_manifest(onto_filepath, IRI, inputs_hashes, facts)
+    recorded = manifest.read_manifest(onto_filepath)
+    # the facts give the same triples after the round trip through JSON
+    loaded = manifest.load_facts(recorded, IRI, inputs_hashes, folder_path)
+    assert list(loaded) == sc_number
+    for sc in sc_number:
+        assert manifest.scenario_triples(sc, loaded[sc]) == manifest.scenario_triples(sc, facts[sc])
+    assert manifest.is_up_to_date(recorded, IRI, inputs_hashes, onto_filepath)
+    assert manifest.changed_scenarios(recorded, IRI, inputs_hashes) == []
+    assert manifest.get_changes(recorded, IRI, inputs_hashes, {}) == {
+        "output_hash": recorded["output_hash"], "scenarios": [], "terms": set()}
+    # another iri, more scenarios or a changed ontology file need a build
+    assert manifest.changed_scenarios(recorded, IRI + "/other", inputs_hashes) == sc_number
+    assert manifest.get_changes(recorded, IRI + "/other", inputs_hashes, {}) is None
+    assert not manifest.is_up_to_date(recorded, IRI, manifest.input_hashes(folder_path, sc_number + ["03"]),
+                                      onto_filepath)
+    with open(onto_filepath, "a") as f:
+        f.write(" changed")
+    assert not manifest.is_up_to_date(recorded, IRI, inputs_hashes, onto_filepath)
+
+    add_component("02")
+    changed_hashes = manifest.input_hashes(folder_path, sc_number)
+    assert manifest.changed_scenarios(recorded, IRI, changed_hashes) == ["02"]
+    changed_facts = manifest.load_facts(recorded, IRI, changed_hashes, folder_path, jobs=1)
+    assert changed_facts["02"] == scenarios.parse_scenario(folder_path, "02")
+    changes = manifest.get_changes(recorded, IRI, changed_hashes, changed_facts)
+    assert changes["scenarios"] == [IRI + "#xPPU_Sc02"]
+    # the new cells are individuals of the first header classes (the component and the type exist already) and the
+    # description declares a sensor class
+    headers = changed_facts["02"]["component_list"][0]
+    assert changes["terms"] == {IRI + "#" + term for term in headers[:4] + ["has_info"]} | {
+        "http://www.w3.org/2002/07/owl#NamedIndividual", "http://www.w3.org/2002/07/owl#Class",
+        "http://www.w3.org/2000/01/rdf-schema#subClassOf"}
+
+
+def test_outdated_parsers(tmp_path, monkeypatch):
+    onto_filepath = str(tmp_path / "xPPU_onto.owl")
+    with open(onto_filepath, "w") as f:
+        f.write("ontology")
+    manifest.write_manifest(onto_filepath, IRI, {}, {})
+    assert manifest.read_manifest(onto_filepath) is not None
+    monkeypatch.setattr(manifest, "parser_version", lambda: "other parsers")
+    assert manifest.read_manifest(onto_filepath) is None
+    with open(manifest.manifest_path(onto_filepath), "w") as f:
+        f.write("{")
+    assert manifest.read_manifest(onto_filepath) is None
+
+
+def test_incremental_build_equals_rebuild(inputs, tmp_path, run_onto_main, add_component):
+    output = str(tmp_path / "incremental" / "xPPU_onto.owl")
+    run_onto_main("--inputs", inputs, "-o", output, "-j", "1")
+    built = read(output)
+    assert "ontology is up to date" in run_onto_main("--inputs", inputs, "-o", output, "-j", "1").stdout
+    assert read(output) == built
+
+    add_component("02")
+    result = run_onto_main("--inputs", inputs, "-o", output, "-j", "1")
+    assert "parsed 1 of 4 scenarios ['02']" in result.stdout
+    rebuilt = str(tmp_path / "rebuild" / "xPPU_onto.owl")
+    run_onto_main("--inputs", inputs, "-o", rebuilt, "-j", "1", "--rebuild")
+    assert read(output) != built
+    assert read(output) == read(rebuilt)
+    with open(manifest.manifest_path(output), encoding="UTF-8") as f:
+        incremental_manifest = json.load(f)
+    with open(manifest.manifest_path(rebuilt), encoding="UTF-8") as f:
+        assert incremental_manifest == json.load(f)
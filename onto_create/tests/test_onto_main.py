@@ -0,0 +1,57 @@
+"""tests of the command line interface of onto_main"""
+
+import json
+import os
+import pytest
+import onto_main
+
+
+def read_checks(report_path):
+    """ the results of every check in the report, in a stable order """
+    with open(report_path, encoding="UTF-8") as f:
+        checks = json.load(f)["checks"]
+    return {query: sorted(check["results"], key=str) for query, check in checks.items()}
+
+
+def test_in_memory_equals_round_trip(inputs, tmp_path, run_onto_main):
+    in_memory = str(tmp_path / "in_memory" / "xPPU_onto.owl")
+    round_trip = str(tmp_path / "round_trip" / "xPPU_onto.owl")
+    run_onto_main("--inputs", inputs, "-o", in_memory, "-j", "1")
+    run_onto_main("--inputs", inputs, "-o", round_trip, "-j", "1", "--debug-round-trip")
+    with open(in_memory, "rb") as f, open(round_trip, "rb") as g:
+        assert f.read() == g.read()
+    checks = read_checks(in_memory + ".checks.json")
+    assert set(checks) == {"query/scenario_query.sparql", "query/scenario_info_query.sparql"}
+    assert all(checks.values())
+    assert checks == read_checks(round_trip + ".checks.json")
+
+
+def test_parse_args(inputs, capsys):
+    args = onto_main.parse_args(["--inputs", inputs, "-s", "0*", "-o", "out/onto.owl.gz", "-f", "ntriples"])
+    assert args.sc_number == ["00", "01", "02", "03"]
+    assert args.folder_path == os.path.join(inputs, "Sc")
+    assert args.output == "out/onto.nt.gz"
+    assert args.jobs is None and args.check_jobs == 1
+    assert onto_main.parse_args(["--inputs", inputs, "-s", "01", "?3", "-j", "2"]).sc_number == ["01", "03"]
+    for argv, message in ((["--inputs", os.path.join(inputs, "missing")], "does not exist"),
+                          (["--inputs", inputs, "-s", "9*"], "no scenarios found in " + inputs + " for 9*"),
+                          (["--inputs", inputs, "-j", "0"], "at least 1"),
+                          (["--inputs", inputs, "--check-jobs", "0"], "at least 1"),
+                          (["--inputs", inputs, "-f", "json"], "invalid choice")):
+        with pytest.raises(SystemExit):
+            onto_main.parse_args(argv)
+        assert message in capsys.readouterr().err
+
+
+def test_report(inputs, tmp_path, run_onto_main):
+    output = str(tmp_path / "xPPU_onto.owl")
+    stdout = run_onto_main("--inputs", inputs, "-o", output, "-s", "00", "01", "-q").stdout
+    lines = stdout.splitlines()
+    # only the report of the stages is printed
+    assert lines[0] == "================== stages ====================="
+    assert [line.split()[0] for line in lines[2:]] == ["read", "parse", "import", "import", "write", "consistency",
+                                                       "total"]
+    stdout = run_onto_main("--inputs", inputs, "-o", output, "-s", "00", "01").stdout
+    assert "scenarios ['00', '01']" in stdout
+    assert "ontology is up to date" in stdout
+    assert stdout.splitlines()[-1].startswith("total")
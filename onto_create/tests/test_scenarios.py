@@ -0,0 +1,40 @@
+"""tests of the parallel parsing of the scenarios"""
+
+import os
+import scenarios
+
+
+def test_discover_scenarios(tmp_path):
+    for name in ("Sc10", "Sc2", "Sc01", "Sc1a", "Other03"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "Sc04").write_text("not a folder")
+    folder_path = str(tmp_path / "Sc")
+    # the numbers are sorted by value, not by name
+    assert scenarios.discover_scenarios(folder_path) == ["01", "2", "10"]
+    assert scenarios.discover_scenarios(folder_path, ["1*"]) == ["10"]
+    assert scenarios.discover_scenarios(folder_path, ["01", "?"]) == ["01", "2"]
+    assert scenarios.discover_scenarios(folder_path, ["99"]) == []
+
+
+def test_parse_scenarios_in_parallel(inputs):
+    folder_path = os.path.join(inputs, "Sc")
+    sc_number = scenarios.discover_scenarios(folder_path)
+    assert sc_number == ["00", "01", "02", "03"]
+    facts = scenarios.parse_scenarios(folder_path, sc_number, jobs=1)
+    assert facts["00"]["function_blocks"] is None
+    assert facts["01"]["function_blocks"]
+    assert all(facts[sc]["component_list"] for sc in sc_number)
+    parallel_facts = scenarios.parse_scenarios(folder_path, sc_number, jobs=2)
+    assert list(parallel_facts) == sc_number
+    assert parallel_facts == facts
+
+
+def test_parallel_build_equals_sequential(inputs, tmp_path, run_onto_main):
+    outputs = {}
+    for jobs in ("1", "3"):
+        output = str(tmp_path / jobs / "xPPU_onto.nt")
+        run_onto_main("--inputs", inputs, "-o", output, "-j", jobs, "-q")
+        with open(output, "rb") as file:
+            outputs[jobs] = file.read()
+    assert outputs["1"]
+    assert outputs["1"] == outputs["3"]
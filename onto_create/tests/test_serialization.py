@@ -0,0 +1,99 @@
+"""tests of the ontology formats"""
+
+import os
+import shutil
+import owlready2 as o2
+import pytest
+import rdflib
+from rdflib.compare import isomorphic
+import serialization
+
+IRI = "http://example.org/onto-example.owl#"
+
+
+@pytest.fixture
+def onto():
+    world = o2.World()
+    onto = world.get_ontology(IRI)
+    with onto:
+        class Scenario(o2.Thing): pass
+        class plc(o2.Thing): pass
+        class has_info_source(o2.ObjectProperty): pass
+        class has_max_value(o2.DatatypeProperty): pass
+        # a restriction is a blank node
+        Scenario.is_a.append(has_info_source.some(plc))
+        scenario = Scenario("xPPU_Sc01", label=[o2.locstr("Szenario 1", "de")])
+        scenario.comment = ['a "quoted"\nline \\ with ä']
+        scenario.has_max_value = [3, 2.5, "high"]
+        scenario.has_info_source = [plc("xPPU_Sc01_PLCOpenXML"), plc("Sc01.plc-file")]
+    yield onto
+    world.close()
+
+
+def get_graph(world):
+    """ the triples of a world as rdflib graph, without the ontology declaration, whose IRI is the file after a load
+    """
+    graph = rdflib.Graph()
+    for triple in world.as_rdflib_graph():
+        if triple[2] != rdflib.OWL.Ontology:
+            graph.add(triple)
+    return graph
+
+
+@pytest.mark.parametrize("name", ["onto.owl", "onto.nt", "onto.ttl", "onto.sqlite3", "onto.owl.gz", "onto.nt.gz",
+                                  "onto.ttl.gz"])
+def test_round_trip(onto, tmp_path, name):
+    path = str(tmp_path / name)
+    serialization.save(onto, path)
+    assert os.listdir(tmp_path) == [name]
+    assert serialization.detect_format(path) == serialization.format_from_path(path)
+    if name.endswith(".sqlite3"):
+        loaded = serialization.load(path)
+    else:
+        loaded = serialization.load(path, o2.World())
+    try:
+        assert loaded.xPPU_Sc01 is not None
+        graph = get_graph(onto.world)
+        assert len(graph) > 10
+        assert isomorphic(get_graph(loaded.world), graph)
+    finally:
+        loaded.world.close()
+
+
+def test_detect_format(onto, tmp_path):
+    for format in serialization.FORMATS:
+        path = serialization.path_with_format(str(tmp_path / "onto.owl"), format)
+        serialization.save(onto, path)
+        # the content decides, not the extension
+        renamed = str(tmp_path / ("unknown_" + format + ".data"))
+        shutil.copy(path, renamed)
+        assert serialization.detect_format(renamed) == (format, False)
+    # N-Triples are Turtle as well, the extension decides for them
+    shutil.copy(str(tmp_path / "onto.nt"), str(tmp_path / "ntriples.ttl"))
+    assert serialization.detect_format(str(tmp_path / "ntriples.ttl")) == ("turtle", False)
+
+
+def test_formats_from_path():
+    assert serialization.format_from_path("onto.nt.gz") == ("ntriples", True)
+    assert serialization.format_from_path("outputs/onto.SQLite") == ("sqlite", False)
+    assert serialization.format_from_path("onto.json") == (None, False)
+    assert serialization.path_with_format("outputs/onto.owl.gz", "ntriples") == "outputs/onto.nt.gz"
+    assert serialization.path_with_format("outputs/onto.owl.gz", "sqlite") == "outputs/onto.sqlite3"
+    assert serialization.path_with_format("outputs/onto.v2", "turtle") == "outputs/onto.v2.ttl"
+    with pytest.raises(ValueError):
+        serialization.path_with_format("onto.owl", "json")
+
+
+def test_invalid_sqlite(onto, tmp_path):
+    with pytest.raises(ValueError):
+        serialization.save(onto, str(tmp_path / "onto.sqlite3.gz"))
+    with pytest.raises(ValueError):
+        serialization.save(onto, str(tmp_path / "onto.owl"), "json")
+    path = str(tmp_path / "onto.sqlite3")
+    serialization.save(onto, path)
+    world = o2.World()
+    try:
+        with pytest.raises(ValueError):
+            serialization.load(path, world)
+    finally:
+        world.close()
@@ -54,5 +54,6 @@ setuptools.setup(
                       'dash_html_components>=2.0.0',
                       'dash_bootstrap_components>=0.11.1',
                       'dash_daq>=0.5.0',
+                      'networkx>=2.6.3',
                       'ontor>=0.3.0'],
 )
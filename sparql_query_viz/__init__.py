@@ -1,4 +1,15 @@
 # import Jaal at root
-from .sparql_query_viz import SQV
+# SQV and the OntologyRegistry pull in dash, pandas and ontor, they are imported when they are first used, so that the
+# light modules of the package (e.g. session or graph_patch) can be imported without the UI and ontology dependencies
+import importlib
+
 # version in setup fetched from here
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+
+def __getattr__(name):
+    if name == 'SQV':
+        return importlib.import_module('.sparql_query_viz', __name__).SQV
+    if name == 'OntologyRegistry':
+        return importlib.import_module('.registry', __name__).OntologyRegistry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
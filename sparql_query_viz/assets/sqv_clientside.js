@@ -0,0 +1,165 @@
+/*
+ * Clientside callbacks of SPARQL-Query-Viz
+ *
+ * apply_graph_patch applies the patches sent by the server (see graph_patch.py) to the vis.js DataSets of the visdcc
+ * network. Every group of server callbacks writes its patches to its own store, only the patches of the triggered
+ * stores are applied. The data property of the network is only written for a reset patch (or if the DataSets can not
+ * be found), because visdcc updates every node and edge of its DataSets when it gets new data.
+ *
+ * The toggle_* functions open and close the collapsible sections and popovers without a round-trip to the server.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    sqv: {
+        apply_graph_patch: function () {
+            // the last argument is the network data, the others are the patch stores
+            var data = arguments[arguments.length - 1];
+            var patches = window.dash_clientside.callback_context.triggered.map(function (trigger) {
+                return trigger.value;
+            }).filter(function (patch) {
+                return patch;
+            });
+            if (!patches.length || !(data || patches[0].data)) {
+                return window.dash_clientside.no_update;
+            }
+            var dataSets = getNetworkDataSets('graph');
+            var reset = patches.some(function (patch) {
+                return patch.data;
+            });
+            if (dataSets && !reset) {
+                patches.forEach(function (patch) {
+                    applyDataSetPatch(dataSets.nodes, patch.nodes);
+                    applyDataSetPatch(dataSets.edges, patch.edges);
+                });
+                return window.dash_clientside.no_update;
+            }
+            patches.forEach(function (patch) {
+                // a reset patch replaces the whole data before the changes are applied
+                if (patch.data) {
+                    data = patch.data;
+                }
+                data = {
+                    nodes: applyElementPatch(data.nodes, patch.nodes),
+                    edges: applyElementPatch(data.edges, patch.edges)
+                };
+            });
+            return data;
+        },
+
+        // a button toggles a section or popover
+        toggle_open: function (n, is_open) {
+            return n ? !is_open : is_open;
+        },
+
+        // the SPARQL query section is also opened, if a template or a query of the library is chosen
+        toggle_query_section: function (n_show, template_value, incons_template_value, library_value, is_open) {
+            var inputId = getTriggeredId();
+            if (inputId === 'filter-show-toggle-button' && n_show) {
+                return !is_open;
+            }
+            if ((inputId === 'sparql_template_dropdown' && template_value) ||
+                (inputId === 'sparql_library_dropdown' && library_value) ||
+                (inputId === 'inconsistency_template_dropdown' && incons_template_value)) {
+                return true;
+            }
+            return is_open;
+        },
+
+        // the SPARQL result section is also opened, if a query is evaluated
+        toggle_result_section: function (n_show, n_evaluate, n_select, is_open) {
+            var inputId = getTriggeredId();
+            if (inputId === 'result-show-toggle-button' && n_show) {
+                return !is_open;
+            }
+            if ((inputId === 'evaluate_query_button' && n_evaluate) || (inputId === 'select_button' && n_select)) {
+                return true;
+            }
+            return is_open;
+        },
+
+        // the A-Box data-property section is shown, if a single A-Box is selected
+        toggle_abox_section: function (n, selection, on_select, is_open, data) {
+            var inputId = getTriggeredId();
+            if (inputId === 'abox-dp-show-toggle-button') {
+                return n ? !is_open : is_open;
+            }
+            if (inputId === 'graph' && !on_select && selection) {
+                if (selection.nodes.length > 0) {
+                    // the data property is not patched, the current nodes are held by the DataSet of the network
+                    var dataSets = getNetworkDataSets('graph');
+                    var node = dataSets ? dataSets.nodes.get(selection.nodes[0]) : (data ? data.nodes : []).find(
+                        function (element) {
+                            return element.id === selection.nodes[0];
+                        });
+                    return node ? node['T/A'] === 'A' : is_open;
+                }
+                return false;
+            }
+            return is_open;
+        },
+
+        // the edge section is shown, if only edges are selected
+        toggle_edge_section: function (n, selection, on_select, is_open) {
+            var inputId = getTriggeredId();
+            if (inputId === 'edge-selection-show-toggle-button') {
+                return n ? !is_open : is_open;
+            }
+            if (inputId === 'graph' && !on_select && selection) {
+                return selection.edges.length > 0 && selection.nodes.length === 0;
+            }
+            return is_open;
+        }
+    }
+});
+
+function getTriggeredId() {
+    var triggered = window.dash_clientside.callback_context.triggered;
+    if (!triggered || triggered.length === 0) {
+        return '';
+    }
+    return triggered[0].prop_id.split('.')[0];
+}
+
+// the DataSets of nodes and edges of a visdcc network are held by its React component, which is found via the DOM
+// element of the network
+function getNetworkDataSets(id) {
+    var element = document.getElementById(id);
+    if (!element) {
+        return null;
+    }
+    var key = Object.keys(element).find(function (name) {
+        return name.startsWith('__reactInternalInstance$') || name.startsWith('__reactFiber$');
+    });
+    for (var fiber = key ? element[key] : null; fiber; fiber = fiber.return) {
+        var component = fiber.stateNode;
+        if (component && component.nn && component.ee) {
+            return {nodes: component.nn, edges: component.ee};
+        }
+    }
+    return null;
+}
+
+function applyDataSetPatch(dataSet, changes) {
+    if (!changes) {
+        return;
+    }
+    dataSet.remove(changes.remove || []);
+    // update merges the changed attributes into the elements and adds the elements that do not exist
+    dataSet.update((changes.update || []).concat(changes.add || []));
+}
+
+function applyElementPatch(elements, changes) {
+    if (!changes) {
+        return elements;
+    }
+    var removed = new Set(changes.remove || []);
+    var updates = {};
+    (changes.update || []).forEach(function (update) {
+        updates[update.id] = Object.assign(updates[update.id] || {}, update);
+    });
+    var patched = elements
+        .filter(function (element) { return !removed.has(element.id); })
+        .map(function (element) {
+            return updates.hasOwnProperty(element.id) ? Object.assign({}, element, updates[element.id]) : element;
+        });
+    return patched.concat(changes.add || []);
+}
@@ -1 +1,12 @@
-from .parse_ontology import *
\ No newline at end of file
+# the parsers of parse_ontology need ontor and pandas, they are imported when they are first used
+import importlib
+
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    parse_ontology = importlib.import_module('.parse_ontology', __name__)
+    try:
+        return getattr(parse_ontology, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
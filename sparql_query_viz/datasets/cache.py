@@ -0,0 +1,45 @@
+"""
+Location and validation of the files SPARQL-Query-Viz caches next to an ontology file
+"""
+# imports
+import hashlib
+import os
+
+# CONSTANTS
+# name of the cache directory, created next to the ontology file
+CACHE_DIR_NAME = '.sqv_cache'
+# size of the chunks read to hash a file
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def get_cache_path(onto_path: str, suffix: str, cache_dir: str = None):
+    """ returns the path of a cache file that belongs to the ontology file (the cache directory is created if needed)
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param suffix: suffix of the cache file, e.g. 'fts.sqlite'
+     :type suffix: str
+     :param cache_dir: directory of the cache files, defaults to a '.sqv_cache' directory next to the ontology file
+     :type cache_dir: str
+     :return: path of the cache file
+     :rtype: str
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(onto_path)), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, os.path.basename(onto_path) + '.' + suffix)
+
+
+def get_file_hash(path: str):
+    """ returns the sha256 hash of the content of a file, used to detect outdated cache files
+
+    :param path: path to the file
+     :type path: str
+     :return: hex digest of the file content
+     :rtype: str
+    """
+    file_hash = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
@@ -0,0 +1,220 @@
+"""
+Persistent full-text index (SQLite FTS5) over the A-Boxes of an ontology
+
+For every individual the name, IRI, rdfs:labels, rdfs:comments and data-property values are indexed. The index is
+stored in a cache file next to the ontology and only rebuilt if the ontology file changed.
+"""
+# imports
+import logging
+import os
+import re
+import sqlite3
+from ontor import OntoEditor
+from owlready2 import Thing
+from .cache import get_cache_path, get_file_hash
+
+# CONSTANTS
+# increase when the table layout changes, so that existing index files are rebuilt
+SCHEMA_VERSION = '1'
+# number of rows inserted per statement while building the index
+INSERT_BATCH_SIZE = 10000
+# bm25 weights of the columns name, iri, labels, comments and properties
+COLUMN_WEIGHTS = (10.0, 1.0, 5.0, 2.0, 1.0)
+
+
+def get_abox_document(ins):
+    """ returns the searchable texts of an individual
+
+    :param ins: the individual
+     :type ins: owlready2.Thing
+     :return: tuple with name, iri, labels, comments and data-property values of the individual
+     :rtype: tuple[str, str, str, str, str]
+    """
+    properties = []
+    for prop in ins.get_properties():
+        for value in prop[ins]:
+            # object-properties are edges of the graph, only literals are indexed
+            if type(value) == float or type(value) == int or type(value) == str:
+                properties.append(prop.name + ' = ' + str(value))
+    return (ins.name, ins.iri, '\n'.join(str(label) for label in ins.label),
+            '\n'.join(str(comment) for comment in ins.comment), '\n'.join(properties))
+
+
+def get_abox_documents(onto: OntoEditor):
+    """ yields the searchable texts of all individuals of the ontology
+
+    :param onto: ontology from which the individuals are extracted
+     :type onto: OntoEditor
+     :return: generator of tuples with name, iri, labels, comments and data-property values of an individual
+     :rtype: generator[tuple[str, str, str, str, str]]
+    """
+    for ins in onto.onto.individuals():
+        yield get_abox_document(ins)
+
+
+def get_fts_query(search_text: str):
+    """ converts the search text into a FTS5 query, in which every word is searched as prefix
+
+    :param search_text: the text the index will be searched for
+     :type search_text: str
+     :return: FTS5 query string or an empty string if the search text contains no words
+     :rtype: str
+    """
+    terms = re.findall(r'\w+', search_text or '')
+    return ' '.join('"' + term + '"*' for term in terms)
+
+
+class FullTextIndex:
+    """ full-text index over the A-Boxes of an ontology, stored in a SQLite database
+    """
+
+    def __init__(self, index_path: str):
+        """ opens (and creates if needed) the index file
+
+        :param index_path: path to the SQLite file of the index
+         :type index_path: str
+        """
+        self.index_path = index_path
+        # the connection is shared by the threads of the dash server, the index is only read after building it
+        self.connection = sqlite3.connect(index_path, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS abox USING fts5("
+                                "name, iri, labels, comments, properties, tokenize='unicode61')")
+        self.connection.commit()
+
+    def _get_meta(self, key: str):
+        """ returns the value stored for key in the meta table or None
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def is_up_to_date(self, source_hash: str):
+        """ checks if the index was built from the ontology file with the given hash
+
+        :param source_hash: hash of the ontology file
+         :type source_hash: str
+         :return: whether the index can be used without rebuilding it
+         :rtype: bool
+        """
+        return self._get_meta('source_hash') == source_hash and self._get_meta('schema_version') == SCHEMA_VERSION
+
+    def build(self, onto: OntoEditor, source_hash: str):
+        """ (re)builds the index from the individuals of the ontology
+
+        :param onto: ontology from which the individuals are extracted
+         :type onto: OntoEditor
+         :param source_hash: hash of the ontology file the index is built from
+         :type source_hash: str
+        """
+        documents = get_abox_documents(onto)
+        number_of_documents = 0
+        with self.connection:
+            self.connection.execute("DELETE FROM abox")
+            while True:
+                batch = [doc for _, doc in zip(range(INSERT_BATCH_SIZE), documents)]
+                if not batch:
+                    break
+                self.connection.executemany("INSERT INTO abox VALUES (?, ?, ?, ?, ?)", batch)
+                number_of_documents = number_of_documents + len(batch)
+            self.connection.execute("INSERT INTO abox(abox) VALUES ('optimize')")
+            self.connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                        [('source_hash', source_hash), ('schema_version', SCHEMA_VERSION)])
+        logging.info("successfully built full-text index over %i A-Boxes", number_of_documents)
+
+    def update(self, onto: OntoEditor, iris: set, source_hash: str):
+        """ replaces the documents of the given entities, so that only the individuals changed by a reload of the
+        ontology are indexed again
+
+        :param onto: the reloaded ontology
+         :type onto: OntoEditor
+         :param iris: IRIs of the changed entities, IRIs that are no individuals (anymore) are only removed
+         :type iris: set[str]
+         :param source_hash: hash of the ontology file the index is updated to
+         :type source_hash: str
+        """
+        documents = []
+        for iri in iris:
+            entity = onto.onto_world[iri]
+            if isinstance(entity, Thing):
+                documents.append(get_abox_document(entity))
+        with self.connection:
+            # the iri column is not indexed by FTS5, the changed rows are deleted in one scan of the table
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS changed_iris (iri TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM changed_iris")
+            self.connection.executemany("INSERT OR IGNORE INTO changed_iris VALUES (?)", [(iri,) for iri in iris])
+            self.connection.execute("DELETE FROM abox WHERE iri IN (SELECT iri FROM changed_iris)")
+            self.connection.executemany("INSERT INTO abox VALUES (?, ?, ?, ?, ?)", documents)
+            self.connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                        [('source_hash', source_hash), ('schema_version', SCHEMA_VERSION)])
+        logging.info("successfully updated %i A-Boxes in full-text index", len(documents))
+
+    def copy(self, index_path: str):
+        """ copies the index to another file, e.g. to update the copy while the index is searched
+
+        :param index_path: path to the SQLite file of the copy, an existing file is overwritten
+         :type index_path: str
+         :return: the copy of the index
+         :rtype: FullTextIndex
+        """
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        index = FullTextIndex(index_path)
+        self.connection.backup(index.connection)
+        return index
+
+    def replace(self, index):
+        """ replaces the index file by the file of another index, which is closed and moved
+
+        :param index: the index that replaces this index, e.g. an updated copy
+         :type index: FullTextIndex
+        """
+        index.close()
+        self.connection.close()
+        os.replace(index.index_path, self.index_path)
+        self.connection = sqlite3.connect(self.index_path, check_same_thread=False)
+
+    def search(self, search_text: str, limit: int = 50):
+        """ searches the index and returns the best matching individuals first
+
+        :param search_text: the text the index will be searched for, every word is matched as prefix
+         :type search_text: str
+         :param limit: maximal number of returned individuals
+         :type limit: int
+         :return: list of dicts with name, iri, snippet of the matching text and rank (lower is better)
+         :rtype: list[dict]
+        """
+        fts_query = get_fts_query(search_text)
+        if not fts_query:
+            return []
+        rows = self.connection.execute(
+            "SELECT name, iri, snippet(abox, -1, '', '', '...', 10), bm25(abox, ?, ?, ?, ?, ?) AS rank "
+            "FROM abox WHERE abox MATCH ? ORDER BY rank LIMIT ?", (*COLUMN_WEIGHTS, fts_query, limit)).fetchall()
+        return [{'name': name, 'iri': iri, 'snippet': snippet, 'rank': rank} for name, iri, snippet, rank in rows]
+
+    def close(self):
+        """ closes the connection to the index file
+        """
+        self.connection.close()
+
+
+def get_fulltext_index(onto: OntoEditor, onto_path: str, cache_dir: str = None):
+    """ opens the full-text index that belongs to the ontology file and rebuilds it if the file changed
+
+    :param onto: ontology from which the individuals are extracted
+     :type onto: OntoEditor
+     :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param cache_dir: directory of the cache files, defaults to a '.sqv_cache' directory next to the ontology file
+     :type cache_dir: str
+     :return: the up-to-date full-text index or None, if it could not be created
+     :rtype: FullTextIndex
+    """
+    try:
+        index = FullTextIndex(get_cache_path(onto_path, 'fts.sqlite', cache_dir))
+        source_hash = get_file_hash(onto_path)
+        if not index.is_up_to_date(source_hash):
+            index.build(onto, source_hash)
+    except (OSError, sqlite3.Error) as error:
+        logging.warning("full-text index could not be created: %s", error)
+        return None
+    return index
@@ -0,0 +1,154 @@
+"""
+Loading of ontology files in several formats
+
+Besides RDF/XML, the ontology file may be written as N-Triples, as Turtle or as the native SQLite quadstore of
+owlready2 (e.g. by onto_create), and the text formats may be compressed with gzip. The format and the compression are
+detected from the content of the file. A SQLite quadstore is opened read-only in place, so several processes can share
+it and nothing has to be parsed. owlready2 can not parse Turtle, so a Turtle file is parsed by rdflib and its triples are
+passed on to owlready2 as N-Triples through a temporary file, one triple at a time.
+"""
+# imports
+import gzip
+import importlib.resources as pkg_resources
+import logging
+import os
+import tempfile
+from owlready2 import World
+from ontor import OntoEditor, queries
+
+# CONSTANTS
+FORMATS = ('rdfxml', 'ntriples', 'turtle', 'sqlite')
+# formats by file extension, used if the content of a file is ambiguous
+EXTENSIONS = {'.owl': 'rdfxml', '.rdf': 'rdfxml', '.xml': 'rdfxml', '.nt': 'ntriples', '.ttl': 'turtle',
+              '.sqlite': 'sqlite', '.sqlite3': 'sqlite', '.db': 'sqlite'}
+GZIP_MAGIC = b'\x1f\x8b'
+SQLITE_MAGIC = b'SQLite format 3\x00'
+# number of bytes read to detect the format
+FORMAT_HEAD_SIZE = 4096
+# IRI of the ontology owlready2 creates in every world
+ANONYMOUS_IRI = 'http://anonymous/'
+
+
+def get_ontology_format(onto_path: str):
+    """ detects the format and the compression of an ontology file from its content
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :return: the format (one of FORMATS) and whether the file is compressed with gzip
+     :rtype: tuple[str, bool]
+    """
+    with open(onto_path, 'rb') as onto_file:
+        compressed = onto_file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    with (gzip.open if compressed else open)(onto_path, 'rb') as onto_file:
+        head = onto_file.read(FORMAT_HEAD_SIZE)
+    path = onto_path[:-len('.gz')] if onto_path.endswith('.gz') else onto_path
+    extension_format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if head.startswith(SQLITE_MAGIC):
+        return 'sqlite', compressed
+    # the first line, that is not empty or a comment
+    lines = [line.strip() for line in head.lstrip(b'\xef\xbb\xbf').splitlines()]
+    first_line = next((line for line in lines if line and not line.startswith(b'#')), b'')
+    if first_line.startswith((b'@prefix', b'@base')) or first_line.upper().startswith((b'PREFIX', b'BASE')):
+        return 'turtle', compressed
+    if first_line.startswith((b'<?xml', b'<rdf:RDF', b'<!DOCTYPE')):
+        return 'rdfxml', compressed
+    if first_line.startswith((b'<', b'_:')) and first_line.endswith(b'.'):
+        # N-Triples are valid Turtle as well, so the extension decides
+        return ('turtle' if extension_format == 'turtle' else 'ntriples'), compressed
+    return extension_format or 'rdfxml', compressed
+
+
+def escape_string(value: str):
+    """ escapes a string for a literal of N-Triples
+
+    :param value: the string
+     :type value: str
+     :return: the escaped string
+     :rtype: str
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def write_ntriples_from_turtle(turtle_file, ntriples_file):
+    """ parses a Turtle file with rdflib and writes its triples as N-Triples, every triple is written as soon as it is
+    parsed instead of being added to a graph
+
+    :param turtle_file: binary file object of the Turtle file
+     :param ntriples_file: binary file object the N-Triples are written to
+    """
+    import rdflib
+
+    def get_term(node):
+        if isinstance(node, rdflib.Literal):
+            literal = '"' + escape_string(str(node)) + '"'
+            if node.language:
+                return literal + '@' + node.language
+            return literal + ('^^<' + node.datatype + '>' if node.datatype else '')
+        return node.n3()
+
+    class NTriplesSink(rdflib.Graph):
+        """ graph the parser adds the triples to, which writes them instead of storing them
+        """
+
+        def add(self, triple):
+            ntriples_file.write((' '.join(get_term(node) for node in triple) + ' .\n').encode('utf-8'))
+            return self
+
+    NTriplesSink().parse(turtle_file, format='turtle')
+
+
+def load_ontology_file(onto_path: str, world: World = None):
+    """ loads an ontology file in any of the FORMATS, possibly compressed with gzip
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param world: world the ontology is loaded into, a new world if None; it must be None for a SQLite quadstore, which
+        is always opened read-only as its own world
+     :type world: World
+     :return: the loaded ontology
+     :rtype: Ontology
+    """
+    onto_format, compressed = get_ontology_format(onto_path)
+    if onto_format == 'sqlite':
+        if compressed:
+            raise ValueError("a SQLite quadstore can not be opened from a compressed file")
+        if world is not None:
+            raise ValueError("a SQLite quadstore is opened as its own world, it can not be loaded into another world")
+        quadstore = World(filename=onto_path, exclusive=False, read_only=True)
+        # the ontology with the most triples of the quadstore
+        ontologies = [onto for onto in quadstore.ontologies.values() if onto.base_iri != ANONYMOUS_IRI]
+        return max(ontologies, key=lambda onto: len(onto.graph))
+    if world is None:
+        world = World()
+    onto = world.get_ontology('file://' + os.path.abspath(onto_path))
+    with gzip.open(onto_path, 'rb') if compressed else open(onto_path, 'rb') as onto_file:
+        if onto_format == 'turtle':
+            with tempfile.TemporaryFile() as ntriples_file:
+                write_ntriples_from_turtle(onto_file, ntriples_file)
+                ntriples_file.seek(0)
+                onto = onto.load(fileobj=ntriples_file)
+        else:
+            onto = onto.load(fileobj=onto_file)
+    logging.info("successfully loaded ontology file (format %s%s)", onto_format, ', gzip' if compressed else '')
+    return onto
+
+
+class OntologyFileEditor(OntoEditor):
+    """ OntoEditor, whose ontology is loaded from an ontology file in any of the FORMATS instead of RDF/XML only
+    """
+
+    def __init__(self, iri: str, path: str):
+        """ loads the ontology file, the attributes are the same as in OntoEditor
+
+        :param iri: IRI of the ontology
+         :type iri: str
+         :param path: local path to the ontology file
+         :type path: str
+        """
+        self.iri = iri
+        self.path = path
+        self.filename = path.split(sep="/")[-1]
+        self.logger = logging.getLogger(self.filename.split(".")[0])
+        self.query_prefixes = pkg_resources.read_text(queries, 'prefixes.sparql')
+        self.onto = load_ontology_file(path)
+        self.onto_world = self.onto.world
@@ -325,6 +325,45 @@ def get_aboxes(onto: OntoEditor, nodelist: list, edgelist: list):
     return nodelist, edgelist
 
 
+def get_abox_elements(ins):
+    """ extracts the node and the edges of one instance/ A-Box like get_aboxes, so that a changed A-Box can be parsed
+    again without parsing the whole ontology
+
+    :param ins: the instance
+     :type ins: owlready2.Thing
+     :returns: the node of the instance and its edges in the format of nodelist and edgelist
+     :rtype: tuple[list, list]
+    """
+    edgelist = []
+    # write property in node or edge list depending on OP or DP
+    prop_value = ''
+    for prop in ins.get_properties():
+        for value in prop[ins]:
+            if type(value) == float or type(value) == int or type(value) == str:
+                if prop_value == '' and not (prop.name + ' = ' + str(value)) in prop_value:
+                    prop_value = prop.name + ' = ' + str(value)
+                elif not (prop.name + ' = ' + str(value)) in prop_value:
+                    prop_value = prop_value + ',\n ' + prop.name + ' = ' + str(value)
+            else:
+                identifier = ins.name + ' ' + prop.name + ' ' + value.name
+                new_edge = [ins.name, value.name, identifier, 1, prop.name, False]
+                if not new_edge in edgelist:
+                    edgelist.append(new_edge)
+    # the relation to the superclass is added to an existing edge between the instance and its superclass
+    superclass = ins.is_a
+    identifier = ins.name + ' is_a ' + superclass[0].name
+    edge_in_edgelist = False
+    for rel in edgelist:
+        if rel[1] == superclass[0].name:
+            edge_in_edgelist = True
+            rel[2] = rel[2] + ',\n ' + identifier
+            rel[4] = rel[4] + ',\n ' + 'is_a'
+            rel[3] = rel[3] + 1
+    if not edge_in_edgelist:
+        edgelist.append([ins.name, superclass[0].name, identifier, 1, 'is_a', False])
+    return [ins.name, 1, 'box', 'A', prop_value], edgelist
+
+
 def is_already_in_list(nodename: str, nodelist: list):
     """ checks if a node with a given name, is already in the given list
 
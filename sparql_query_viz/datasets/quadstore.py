@@ -0,0 +1,106 @@
+"""
+Persistent owlready2 quadstore of an ontology
+
+Parsing the RDF/XML file of a large ontology into a fresh in-memory world takes minutes. Instead, the ontology is
+parsed once into an owlready2 quadstore in an SQLite file, which is reopened on later starts as long as the hash of
+the ontology file is unchanged. The quadstore is opened read-only, so that several processes can share it.
+"""
+# imports
+import importlib.resources as pkg_resources
+import json
+import logging
+import os
+from owlready2 import World
+from ontor import OntoEditor, queries
+from .cache import get_file_hash
+from .ontology_file import load_ontology_file
+
+
+def get_quadstore_info(quadstore_path: str):
+    """ returns the information about the ontology file, from which the quadstore was built
+
+    :param quadstore_path: path to the SQLite file of the quadstore
+     :type quadstore_path: str
+     :return: dict with the hash of the ontology file ('source_hash') and the IRI of the ontology ('base_iri'), None
+        if the quadstore does not exist
+     :rtype: dict
+    """
+    try:
+        with open(quadstore_path + '.json', 'r') as info_file:
+            return json.load(info_file)
+    except (OSError, ValueError):
+        return None
+
+
+def build_quadstore(onto_path: str, quadstore_path: str, source_hash: str = None):
+    """ parses the ontology file into a new quadstore, that replaces the existing quadstore
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param quadstore_path: path to the SQLite file of the quadstore
+     :type quadstore_path: str
+     :param source_hash: hash of the ontology file, computed if None
+     :type source_hash: str
+     :return: the IRI of the ontology
+     :rtype: str
+    """
+    if source_hash is None:
+        source_hash = get_file_hash(onto_path)
+    # the quadstore is built in a temporary file, so that other processes never open a partial quadstore
+    temporary_path = quadstore_path + '.' + str(os.getpid())
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    world = World(filename=temporary_path)
+    try:
+        base_iri = load_ontology_file(onto_path, world).base_iri
+        world.save()
+    finally:
+        world.close()
+    os.replace(temporary_path, quadstore_path)
+    with open(quadstore_path + '.json', 'w') as info_file:
+        json.dump({'source_hash': source_hash, 'base_iri': base_iri}, info_file)
+    logging.info("successfully built quadstore from ontology file")
+    return base_iri
+
+
+def open_quadstore(onto_path: str, quadstore_path: str):
+    """ opens the quadstore of an ontology file read-only, the quadstore is (re)built if the ontology file changed
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param quadstore_path: path to the SQLite file of the quadstore
+     :type quadstore_path: str
+     :return: the world of the quadstore and the ontology
+     :rtype: tuple[World, Ontology]
+    """
+    source_hash = get_file_hash(onto_path)
+    info = get_quadstore_info(quadstore_path)
+    if info is None or info['source_hash'] != source_hash or not os.path.exists(quadstore_path):
+        base_iri = build_quadstore(onto_path, quadstore_path, source_hash)
+    else:
+        base_iri = info['base_iri']
+    world = World(filename=quadstore_path, exclusive=False, read_only=True)
+    logging.info("successfully opened quadstore")
+    return world, world.get_ontology(base_iri)
+
+
+class QuadstoreOntoEditor(OntoEditor):
+    """ OntoEditor, whose world is the persistent quadstore of the ontology file instead of a freshly parsed world
+    """
+
+    def __init__(self, iri: str, path: str, quadstore_path: str):
+        """ opens the quadstore of the ontology file, the attributes are the same as in OntoEditor
+
+        :param iri: IRI of the ontology
+         :type iri: str
+         :param path: local path to the ontology file
+         :type path: str
+         :param quadstore_path: path to the SQLite file of the quadstore
+         :type quadstore_path: str
+        """
+        self.iri = iri
+        self.path = path
+        self.filename = path.split(sep="/")[-1]
+        self.logger = logging.getLogger(self.filename.split(".")[0])
+        self.query_prefixes = pkg_resources.read_text(queries, 'prefixes.sparql')
+        self.onto_world, self.onto = open_quadstore(path, quadstore_path)
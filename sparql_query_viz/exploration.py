@@ -0,0 +1,126 @@
+"""
+Focus-and-context exploration of the graph
+
+In the exploration mode the browser does not get the whole graph, but only a focus node and its k-hop neighbourhood.
+Selecting a node expands its neighbourhood, which is looked up in an adjacency index on the server. The expanded
+neighbourhoods (regions) of a session are kept in the order they were expanded, if the number of shown nodes exceeds
+a cap, the least recently expanded regions are removed from the graph.
+"""
+# imports
+from collections import defaultdict, OrderedDict
+
+# CONSTANTS
+# maximal number of nodes shown in the exploration mode
+DEFAULT_MAX_VISIBLE_NODES = 200
+# number of hops around a focus node that are shown
+DEFAULT_EXPLORATION_HOPS = 1
+# key of the region that holds the result of the last SPARQL query
+QUERY_RESULT_REGION = ''
+
+
+class AdjacencyIndex:
+    """ index over the neighbours and the edges of every node of the graph
+    """
+
+    def __init__(self, graph_data: dict):
+        """ builds the index
+
+        :param graph_data: network data in format of visdcc
+         :type graph_data: dict
+        """
+        self.nodes = {node['id']: node for node in graph_data['nodes']}
+        self.edges = graph_data['edges']
+        # edges are followed in both directions
+        self.neighbours = defaultdict(list)
+        self.node_edges = defaultdict(list)
+        for i, edge in enumerate(self.edges):
+            if edge['from'] in self.nodes and edge['to'] in self.nodes:
+                self.neighbours[edge['from']].append(edge['to'])
+                self.neighbours[edge['to']].append(edge['from'])
+                self.node_edges[edge['from']].append(i)
+                self.node_edges[edge['to']].append(i)
+
+    def get_neighbourhood(self, node_id: str, hops: int = DEFAULT_EXPLORATION_HOPS, limit: int = None):
+        """ returns the ids of the nodes within a number of hops around a node, the nearest nodes first
+
+        :param node_id: id of the focus node
+         :type node_id: str
+         :param hops: number of hops around the focus node
+         :type hops: int
+         :param limit: maximal number of returned node ids, None for no limit
+         :type limit: int
+         :return: ids of the focus node and its neighbourhood in breadth-first order
+         :rtype: list[str]
+        """
+        if node_id not in self.nodes:
+            return []
+        neighbourhood = [node_id]
+        visited = {node_id}
+        current_level = [node_id]
+        for _ in range(hops):
+            next_level = []
+            for current_id in current_level:
+                for neighbour in self.neighbours[current_id]:
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        next_level.append(neighbour)
+            neighbourhood.extend(next_level)
+            current_level = next_level
+            if limit is not None and len(neighbourhood) >= limit:
+                break
+        return neighbourhood[:limit]
+
+    def get_edges(self, node_ids: set):
+        """ returns the edges between the given nodes
+
+        :param node_ids: ids of the nodes
+         :type node_ids: set
+         :return: edges in format of visdcc, whose start and end node are both in node_ids
+         :rtype: list[dict]
+        """
+        edge_indices = {i for node_id in node_ids for i in self.node_edges[node_id]
+                        if self.edges[i]['from'] in node_ids and self.edges[i]['to'] in node_ids}
+        return [self.edges[i] for i in sorted(edge_indices)]
+
+    def get_most_connected_node(self):
+        """ returns the id of the node with the most neighbours, used as default focus node
+
+        :return: id of the node or None, if the graph is empty
+         :rtype: str
+        """
+        return max(self.nodes, key=lambda node_id: len(self.neighbours[node_id]), default=None)
+
+
+def add_region(regions: OrderedDict, focus: str, node_ids: list, max_visible_nodes: int = DEFAULT_MAX_VISIBLE_NODES):
+    """ adds the region of a focus node as most recently expanded region and removes the least recently expanded
+    regions, until at most max_visible_nodes are shown
+
+    :param regions: maps the focus nodes to the ids of the nodes of their regions, in the order they were expanded
+     :type regions: OrderedDict
+     :param focus: id of the focus node or QUERY_RESULT_REGION
+     :type focus: str
+     :param node_ids: ids of the nodes of the region
+     :type node_ids: list[str]
+     :param max_visible_nodes: maximal number of shown nodes
+     :type max_visible_nodes: int
+     :return: ids of the shown nodes
+     :rtype: set
+    """
+    regions.pop(focus, None)
+    regions[focus] = node_ids[:max_visible_nodes]
+    shown_node_ids = get_shown_node_ids(regions)
+    while len(shown_node_ids) > max_visible_nodes:
+        regions.popitem(last=False)
+        shown_node_ids = get_shown_node_ids(regions)
+    return shown_node_ids
+
+
+def get_shown_node_ids(regions: OrderedDict):
+    """ returns the ids of the nodes of all regions
+
+    :param regions: maps the focus nodes to the ids of the nodes of their regions
+     :type regions: OrderedDict
+     :return: ids of the shown nodes
+     :rtype: set
+    """
+    return {node_id for node_ids in regions.values() for node_id in node_ids}
@@ -0,0 +1,130 @@
+"""
+Patches for the visdcc graph
+
+Instead of sending the whole network data to the browser on every interaction, the callbacks send a patch that only
+contains the changed nodes and edges. The patch is merged into the network data in the browser by the clientside
+function `sqv.apply_graph_patch` (see assets/sqv_clientside.js). A patch has the format
+
+    {'nodes': {'add': [node, ...], 'update': [{'id': ..., attribute: value}, ...], 'remove': [id, ...]},
+     'edges': {'add': [edge, ...], 'update': [{'id': ..., attribute: value}, ...], 'remove': [id, ...]}}
+
+and may additionally contain the whole network data as 'data', which replaces the data of the browser before the
+changes are applied.
+"""
+
+
+def get_empty_patch():
+    """ returns a patch that does not change the graph
+
+    :return: empty patch for the network data
+    :rtype: dict
+    """
+    return {'nodes': {'add': [], 'update': [], 'remove': []},
+            'edges': {'add': [], 'update': [], 'remove': []}}
+
+
+def get_reset_patch(graph_data: dict):
+    """ returns a patch that replaces the whole network data of the browser
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: patch for the network data
+     :rtype: dict
+    """
+    patch = get_empty_patch()
+    patch['data'] = graph_data
+    return patch
+
+
+def is_empty_patch(patch: dict):
+    """ checks whether a patch changes the graph
+
+    :param patch: patch for the network data
+     :type patch: dict
+     :return: True, if the patch contains no changes
+     :rtype: bool
+    """
+    return 'data' not in patch and not any(changes for elements in (patch['nodes'], patch['edges'])
+                                           for changes in elements.values())
+
+
+def get_attribute_updates(values: dict, attribute: str, previous_values: dict, shown_ids: set = None):
+    """ returns the partial elements (id and attribute) of all elements whose attribute changed
+
+    :param values: maps the element ids to the new attribute values
+     :type values: dict
+     :param attribute: name of the attribute, e.g. 'color' or 'size'
+     :type attribute: str
+     :param previous_values: maps the element ids to the attribute values the browser currently shows
+     :type previous_values: dict
+     :param shown_ids: ids of the elements currently shown in the browser, None if all elements are shown
+     :type shown_ids: set
+     :return: list of partial elements
+     :rtype: list[dict]
+    """
+    return [{'id': element_id, attribute: value} for element_id, value in values.items()
+            if (shown_ids is None or element_id in shown_ids) and previous_values.get(element_id) != value]
+
+
+def get_visibility_updates(old_visible_ids: set, new_visible_ids: set):
+    """ returns the partial nodes (id and hidden) of all nodes whose visibility changed
+
+    :param old_visible_ids: ids of the nodes that are visible in the browser
+     :type old_visible_ids: set
+     :param new_visible_ids: ids of the nodes that will be visible
+     :type new_visible_ids: set
+     :return: list of partial nodes
+     :rtype: list[dict]
+    """
+    return [{'id': node_id, 'hidden': node_id not in new_visible_ids}
+            for node_id in old_visible_ids ^ new_visible_ids]
+
+
+def get_node_set_patch(nodes: list, old_ids: set, new_ids: set):
+    """ returns the patch that replaces the nodes shown in the browser by another subset of the nodes
+
+    :param nodes: all nodes in format of visdcc
+     :type nodes: list[dict]
+     :param old_ids: ids of the nodes currently shown in the browser
+     :type old_ids: set
+     :param new_ids: ids of the nodes that will be shown
+     :type new_ids: set
+     :return: patch for the network data
+     :rtype: dict
+    """
+    patch = get_empty_patch()
+    patch['nodes']['remove'] = list(old_ids - new_ids)
+    added_ids = new_ids - old_ids
+    if added_ids:
+        patch['nodes']['add'] = [node for node in nodes if node['id'] in added_ids]
+    return patch
+
+
+def get_graph_diff_patch(old_graph_data: dict, new_graph_data: dict):
+    """ returns the patch that changes the network data shown in the browser into other network data
+
+    :param old_graph_data: network data currently shown in the browser
+     :type old_graph_data: dict
+     :param new_graph_data: network data that will be shown
+     :type new_graph_data: dict
+     :return: patch for the network data
+     :rtype: dict
+    """
+    def is_changed(old_value, new_value):
+        # NaN values are never equal to themselves
+        return old_value != new_value and not (old_value != old_value and new_value != new_value)
+
+    patch = get_empty_patch()
+    for element_type in ('nodes', 'edges'):
+        old_elements = {element['id']: element for element in old_graph_data[element_type]}
+        new_elements = {element['id']: element for element in new_graph_data[element_type]}
+        patch[element_type]['remove'] = [element_id for element_id in old_elements if element_id not in new_elements]
+        for element_id, element in new_elements.items():
+            old_element = old_elements.get(element_id)
+            if old_element is None:
+                patch[element_type]['add'].append(element)
+            elif old_element is not element:
+                changes = {key: value for key, value in element.items() if is_changed(old_element.get(key), value)}
+                if changes:
+                    patch[element_type]['update'].append({'id': element_id, **changes})
+    return patch
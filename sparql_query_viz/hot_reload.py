@@ -0,0 +1,214 @@
+"""
+Hot reload of the ontology file of SQV
+
+The OntologyWatcher polls the modification time and size of the ontology file in a background thread. If the file
+changed and was completely written, SQV loads the new content into a fresh owlready2 world, compares its triples with
+the loaded triples and only applies the changed triples to the graph. The new graph is built next to the served one and
+swapped in while holding the write side of a ModelLock. The callbacks hold its read side, so that a request never sees
+a mix of the old and the new graph.
+"""
+# imports
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+# CONSTANTS
+# seconds between two checks of the ontology file
+DEFAULT_WATCH_INTERVAL = 2.0
+# triples of an owlready2 quadstore as strings in sorted order, the IRIs are looked up in the resources table
+TRIPLES_QUERY = ("SELECT DISTINCT COALESCE(s.iri, '_:' || q.s), COALESCE(p.iri, '_:' || q.p), "
+                 "CASE WHEN q.d = 'o' THEN COALESCE(o.iri, '_:' || q.o) ELSE CAST(q.o AS TEXT) END, "
+                 "CASE WHEN typeof(q.d) = 'integer' THEN COALESCE(d.iri, CAST(q.d AS TEXT)) "
+                 "ELSE CAST(q.d AS TEXT) END "
+                 "FROM quads2 q LEFT JOIN resources s ON s.storid = q.s LEFT JOIN resources p ON p.storid = q.p "
+                 "LEFT JOIN resources o ON q.d = 'o' AND o.storid = q.o "
+                 "LEFT JOIN resources d ON typeof(q.d) = 'integer' AND d.storid = q.d "
+                 "ORDER BY 1, 2, 3, 4")
+
+
+class ModelLock:
+    """ readers-writer lock: any number of requests read the graph model at the same time, a reload waits until they
+    finished and blocks new requests while it swaps the model
+    """
+
+    def __init__(self):
+        """ initialize ModelLock class
+        """
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        """ context manager for a request that reads the graph model
+        """
+        with self._condition:
+            # waiting writers go first, so that a steady stream of requests does not delay a reload forever
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers = self._readers + 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers = self._readers - 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        """ context manager for swapping the graph model, waits until the running requests finished
+        """
+        with self._condition:
+            self._waiting_writers = self._waiting_writers + 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers = self._waiting_writers - 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+def get_sorted_triples(world):
+    """ returns a cursor over the triples of an owlready2 world, sorted by SQLite, so that they are not loaded into
+    memory at once
+
+    :param world: the world
+     :type world: owlready2.World
+     :return: cursor of (subject, predicate, object, datatype) tuples of strings, blank nodes are given as '_:' and their
+        number, the datatype of an object is 'o'
+     :rtype: sqlite3.Cursor
+    """
+    return world.graph.db.execute(TRIPLES_QUERY)
+
+
+def get_triple_diff(old_world, new_world):
+    """ compares the triples of two owlready2 worlds, both are read in sorted order and merged, so that only the
+    changed triples are kept in memory
+
+    :param old_world: world of the loaded ontology
+     :type old_world: owlready2.World
+     :param new_world: world of the reloaded ontology
+     :type new_world: owlready2.World
+     :return: the added and the removed triples as (subject, predicate, object, datatype) tuples
+     :rtype: tuple[list, list]
+    """
+    added_triples = []
+    removed_triples = []
+    old_triples = get_sorted_triples(old_world)
+    new_triples = get_sorted_triples(new_world)
+    old_triple = next(old_triples, None)
+    new_triple = next(new_triples, None)
+    while old_triple is not None or new_triple is not None:
+        if new_triple is None or old_triple is not None and old_triple < new_triple:
+            removed_triples.append(old_triple)
+            old_triple = next(old_triples, None)
+        elif old_triple is None or new_triple < old_triple:
+            added_triples.append(new_triple)
+            new_triple = next(new_triples, None)
+        else:
+            old_triple = next(old_triples, None)
+            new_triple = next(new_triples, None)
+    return added_triples, removed_triples
+
+
+def is_blank(term: str):
+    """ checks if a term of a triple returned by get_triple_diff is a blank node
+
+    :param term: subject, predicate or object of the triple
+     :type term: str
+     :rtype: bool
+    """
+    return term.startswith('_:')
+
+
+def get_changed_iris(triples: list):
+    """ returns the IRIs of the entities described by changed triples
+
+    :param triples: the added and removed triples
+     :type triples: list
+     :return: IRIs of the subjects and objects of the triples
+     :rtype: set[str]
+    """
+    iris = {subject for subject, _, _, _ in triples if not is_blank(subject)}
+    iris.update(obj for _, _, obj, datatype in triples if datatype == 'o' and not is_blank(obj))
+    return iris
+
+
+def get_file_state(path: str):
+    """ returns the modification time and size of a file, that change when the file is written
+
+    :param path: path to the file
+     :type path: str
+     :return: modification time in nanoseconds and size in bytes or None, if the file does not exist
+     :rtype: tuple[int, int]
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class OntologyWatcher:
+    """ polls an ontology file in a background thread and calls a function, when it changed
+    """
+
+    def __init__(self, path: str, on_change, interval: float = DEFAULT_WATCH_INTERVAL):
+        """ initialize OntologyWatcher class, the file is watched after start is called
+
+        :param path: local path to the ontology file
+         :type path: str
+         :param on_change: function without arguments, that reloads the ontology
+         :type on_change: callable
+         :param interval: seconds between two checks of the file
+         :type interval: float
+        """
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        # the state of the file when the ontology was loaded, changes made before start are detected as well
+        self.loaded_state = get_file_state(path)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """ starts watching the file
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name='sqv-ontology-watcher', daemon=True)
+        self._thread.start()
+        logging.info("watching ontology file %s for changes", self.path)
+
+    def stop(self, wait: bool = False):
+        """ stops watching the file, a running reload is finished by the background thread
+
+        :param wait: wait until the background thread finished a running reload
+         :type wait: bool
+        """
+        self._stopped.set()
+        thread = self._thread
+        self._thread = None
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _watch(self):
+        """ polls the file, a change is only reported once the file stayed unchanged for one interval, so that a file
+        that is still written is not loaded
+        """
+        last_state = get_file_state(self.path)
+        while not self._stopped.wait(self.interval):
+            state = get_file_state(self.path)
+            if state is not None and state == last_state and state != self.loaded_state:
+                try:
+                    self.on_change()
+                except Exception:
+                    logging.exception("reloading the changed ontology file failed")
+                self.loaded_state = state
+            last_state = state
@@ -6,12 +6,14 @@ Editor: Maximilian Mayerhofer
 Layout code for the application
 """
 # import
+import copy
 import logging
 import dash_bootstrap_components as dbc
 import dash_daq as daq
 import pandas as pd
 import visdcc
 from dash import dcc, html
+from dash.development.base_component import Component
 from ontor import OntoEditor
 from sparql_query_viz.components import scenario_select_form
 # CONSTANTS
@@ -48,6 +50,9 @@ KELLY_COLORS_HEX = [
     "#232C16",  # Dark Olive Green
 ]
 
+# stores of the patches for the graph data, every group of callbacks sends its patches to its own store
+GRAPH_PATCH_STORES = ['search-patch', 'color-patch', 'size-patch', 'nodes-patch']
+
 DEFAULT_OPTIONS = {
     'height': '800px',
     'width': '100%',
@@ -460,12 +465,69 @@ def get_numerical_features(df_: pd.DataFrame):
         numeric_features.remove('width')
     except ValueError:
         pass
+    # remove the node positions computed on the server
+    for position in ('x', 'y'):
+        if position in numeric_features:
+            numeric_features.remove(position)
     # return
     return numeric_features
 
 
+def get_graph_features(graph_data: dict):
+    """ identify the features of the nodes and edges, that are offered in the settings to color and size the graph
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: categorical node features, categorical edge features, numerical node features and numerical edge
+        features
+     :rtype: tuple[list[str], list[str], list[str], list[str]]
+    """
+    cat_node_features = get_categorical_features(pd.DataFrame(graph_data['nodes']),
+                                                 20, ['shape', 'label', 'id', 'title', 'color'])
+    cat_edge_features = get_categorical_features(
+        pd.DataFrame(graph_data['edges']).drop(
+            columns=['color', 'from', 'to', 'id', 'arrows']), 20,
+        ['color', 'from', 'to', 'id'])
+    num_node_features = get_numerical_features(
+        pd.DataFrame(graph_data['nodes']))
+    num_edge_features = get_numerical_features(
+        pd.DataFrame(graph_data['edges']))
+    return cat_node_features, cat_edge_features, num_node_features, num_edge_features
+
+
+def replace_component_properties(component, properties: dict):
+    """ returns a copy of the layout, in which properties of the components with the given ids are replaced, the
+    components that contain none of them are shared with the original layout
+
+    :param component: the layout or a component of it
+     :type component: dash.development.base_component.Component
+     :param properties: maps the ids of the components to dicts of their new property values
+     :type properties: dict
+     :return: the layout with the replaced properties
+     :rtype: dash.development.base_component.Component
+    """
+    children = getattr(component, 'children', None)
+    new_children = children
+    if isinstance(children, (list, tuple)):
+        new_children = [replace_component_properties(child, properties) for child in children]
+        if all(new_child is child for new_child, child in zip(new_children, children)):
+            new_children = children
+    elif isinstance(children, Component):
+        new_children = replace_component_properties(children, properties)
+    component_id = getattr(component, 'id', None)
+    if new_children is children and not (isinstance(component_id, str) and component_id in properties):
+        return component
+    component = copy.copy(component)
+    if new_children is not children:
+        component.children = new_children
+    for name, value in properties.get(component_id, {}).items():
+        setattr(component, name, value)
+    return component
+
+
 def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = None,
-                   directed: bool = False, vis_opts: dict = None, abox: bool = False):
+                   directed: bool = False, vis_opts: dict = None, abox: bool = False, shown_graph_data: dict = None,
+                   physics: bool = True, ontology_links: dict = None):
     """ create and return the layout of the app
 
     :param graph_data: network data in format of visdcc
@@ -480,27 +542,35 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
      :type vis_opts: dict
      :param abox: indicates whether A-Boxes are visualized
      :type abox: bool
+     :param shown_graph_data: aggregated network data initially shown in the graph, None to show graph_data
+     :type shown_graph_data: dict
+     :param physics: indicates whether the physics simulation lays out the graph, False if the nodes have positions
+     :type physics: bool
+     :param ontology_links: maps the names of the other ontologies hosted by the server to their URLs, None if only
+        one ontology is hosted
+     :type ontology_links: dict
      :return: html-element of the layout
      :rtype: html.Div
     """
-    # Step 1-2: find categorical features of nodes and edges
     if color_legends is None:
         color_legends = []
-    cat_node_features = get_categorical_features(pd.DataFrame(graph_data['nodes']),
-                                                 20, ['shape', 'label', 'id', 'title', 'color']) 
-    cat_edge_features = get_categorical_features(
-        pd.DataFrame(graph_data['edges']).drop(
-            columns=['color', 'from', 'to', 'id', 'arrows']), 20,
-        ['color', 'from', 'to', 'id'])
-    # Step 3-4: Get numerical features of nodes and edges
-    num_node_features = get_numerical_features(
-        pd.DataFrame(graph_data['nodes']))
-    num_edge_features = get_numerical_features(
-        pd.DataFrame(graph_data['edges']))
+    # the button to collapse clusters is only shown for aggregated graphs
+    collapse_style = {} if shown_graph_data is not None else {'display': 'none'}
+    if shown_graph_data is None:
+        shown_graph_data = graph_data
+    # the subtitle is the name of the ontology, followed by a menu to switch to another hosted ontology
+    subtitle = [html.H3(children=onto.onto.name)]
+    if ontology_links:
+        subtitle.append(dbc.DropdownMenu([dbc.DropdownMenuItem(name, href=href, external_link=True)
+                                           for name, href in ontology_links.items()],
+                                          id="ontology-switch", label="Switch ontology", color="secondary",
+                                          bs_size="sm", style={'margin-left': 10}))
+    # Step 1-4: find categorical and numerical features of nodes and edges
+    cat_node_features, cat_edge_features, num_node_features, num_edge_features = get_graph_features(graph_data)
     # Step 5: create and return the layout
     layout_with_abox = html.Div([
         create_row(html.H2(children="SPARQL Query Viz")),  # Title
-        create_row(html.H3(children=onto.onto.name)),  # Subtitle
+        create_row(subtitle),  # Subtitle
         create_row([
             dbc.Col([
                 # setting panel
@@ -508,9 +578,14 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                     # ---- search section ----
                     create_row([
                         html.H6("Search"),
-                        dbc.Button("Un-/Freeze", id="freeze-physics", outline=True,
-                                   color="secondary",
-                                   size="sm"),
+                        html.Div([
+                            dbc.Button("Collapse", id="collapse-clusters", outline=True,
+                                       color="secondary",
+                                       size="sm", style=collapse_style),
+                            dbc.Button("Un-/Freeze", id="freeze-physics", outline=True,
+                                       color="secondary",
+                                       size="sm"),
+                        ]),
                     ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
                         'justify-content': 'space-between'}),
                     html.Hr(className="my-2"),
@@ -730,13 +805,15 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                    ], className="card", style={'padding': '5px', 'background': '#e5e5e5'}),
             ], width=3, style={'display': 'flex', 'justify-content': 'center', 'align-items': 'center'}, align="start"),
             # graph
-            dbc.Col(
+            dbc.Col([
                 visdcc.Network(
                     id='graph',
-                    data=graph_data,
+                    data=shown_graph_data,
                     selection={'nodes': [], 'edges': []},
-                    options=get_options(directed, vis_opts)),
-                width=9, align="start")])
+                    options=get_options(directed, vis_opts, physics)),
+                # patches for the graph data sent by the server, merged in the browser
+                *[dcc.Store(id=store_id) for store_id in GRAPH_PATCH_STORES],
+            ], width=9, align="start")])
     ])
     if abox:
         logging.info(
@@ -745,7 +822,7 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
     logging.info("returning standard app-layout")
     return html.Div([
         create_row(html.H2(children="SPARQL Query Viz")),  # Title
-        create_row(html.H3(children=onto.onto.name)),  # Subtitle
+        create_row(subtitle),  # Subtitle
         create_row([
             dbc.Col([
                 # setting panel
@@ -753,9 +830,14 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                     # ---- search section ----
                     create_row([
                         html.H6("Search"),
-                        dbc.Button("Un-/Freeze", id="freeze-physics", outline=True,
-                                   color="secondary",
-                                   size="sm"),
+                        html.Div([
+                            dbc.Button("Collapse", id="collapse-clusters", outline=True,
+                                       color="secondary",
+                                       size="sm", style=collapse_style),
+                            dbc.Button("Un-/Freeze", id="freeze-physics", outline=True,
+                                       color="secondary",
+                                       size="sm"),
+                        ]),
                     ], {**fetch_flex_row_style(), 'margin-left': 0, 'margin-right': 0,
                         'justify-content': 'space-between'}),
                     html.Hr(className="my-2"),
@@ -951,11 +1033,13 @@ def get_app_layout(graph_data: dict, onto: OntoEditor, color_legends: list = Non
                 ], className="card", style={'padding': '5px', 'background': '#e5e5e5'}),
             ], width=3, style={'display': 'flex', 'justify-content': 'center', 'align-items': 'center'}, align="start"),
             # graph
-            dbc.Col(
+            dbc.Col([
                 visdcc.Network(
                     id='graph',
-                    data=graph_data,
+                    data=shown_graph_data,
                     selection={'nodes': [], 'edges': []},
-                    options=get_options(directed, vis_opts)),
-                width=9, align="start")])
+                    options=get_options(directed, vis_opts, physics)),
+                # patches for the graph data sent by the server, merged in the browser
+                *[dcc.Store(id=store_id) for store_id in GRAPH_PATCH_STORES],
+            ], width=9, align="start")])
     ])
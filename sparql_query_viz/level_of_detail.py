@@ -0,0 +1,190 @@
+"""
+Level-of-detail aggregation for large graphs
+
+Beyond a few thousand nodes, the physics simulation of vis.js in the browser becomes unusable. If the graph exceeds a
+threshold, the nodes are therefore aggregated into cluster nodes: by default the A-Boxes of a class are collapsed into
+one cluster node per class, alternatively the communities found by label propagation on the networkx graph are
+collapsed. Parallel edges between the same (cluster) nodes are summarized into one weighted edge. A cluster is
+expanded on demand by selecting it in the graph.
+"""
+# imports
+import logging
+import math
+from collections import defaultdict
+import networkx
+from .layout import DEFAULT_COLOR
+
+# CONSTANTS
+# number of nodes above which the graph is aggregated
+DEFAULT_LOD_THRESHOLD = 2000
+# prefixes of the ids of cluster nodes and summary edges
+CLUSTER_ID_PREFIX = 'cluster: '
+SUMMARY_EDGE_ID_PREFIX = 'summary: '
+# minimal number of nodes that are aggregated into a cluster
+MIN_CLUSTER_SIZE = 2
+# size of the smallest cluster node, grows logarithmic with the number of aggregated nodes
+CLUSTER_NODE_SIZE = 10
+# maximal number of different labels listed by a summary edge
+MAX_SUMMARY_LABELS = 3
+# maximal width of a summary edge, the width grows logarithmic with the number of edges
+MAX_SUMMARY_EDGE_WIDTH = 10
+
+
+def get_class_clusters(graph_data: dict):
+    """ groups the A-Boxes of the graph by the class they are an instance of
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: maps the name of a class to the ids of its A-Boxes
+     :rtype: dict
+    """
+    abox_ids = {node['id'] for node in graph_data['nodes'] if node.get('T/A') == 'A'}
+    clustered_ids = set()
+    clusters = defaultdict(list)
+    for edge in graph_data['edges']:
+        # an A-Box is aggregated into the cluster of the first class it is an instance of
+        if edge['from'] in abox_ids and edge['from'] not in clustered_ids and edge['to'] not in abox_ids \
+                and 'is_a' in edge['label'].split(',\n '):
+            clusters[edge['to']].append(edge['from'])
+            clustered_ids.add(edge['from'])
+    return dict(clusters)
+
+
+def get_community_clusters(graph_data: dict):
+    """ groups the nodes of the graph by the communities found with label propagation
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: maps the name of a community to the ids of its nodes
+     :rtype: dict
+    """
+    graph = networkx.Graph()
+    graph.add_nodes_from(node['id'] for node in graph_data['nodes'])
+    graph.add_edges_from((edge['from'], edge['to']) for edge in graph_data['edges']
+                         if edge['from'] in graph and edge['to'] in graph)
+    communities = sorted((sorted(community) for community in
+                          networkx.algorithms.community.label_propagation_communities(graph)),
+                         key=len, reverse=True)
+    return {'community ' + str(i + 1): community for i, community in enumerate(communities)}
+
+
+def get_summary_edge(from_id: str, to_id: str, edges: list):
+    """ returns the weighted edge that summarizes parallel edges
+
+    :param from_id: id of the node the edges start from
+     :type from_id: str
+     :param to_id: id of the node the edges end at
+     :type to_id: str
+     :param edges: the summarized edges in format of visdcc
+     :type edges: list[dict]
+     :return: the summary edge in format of visdcc
+     :rtype: dict
+    """
+    labels = sorted({label for edge in edges for label in edge['label'].split(',\n ')})
+    if len(labels) > MAX_SUMMARY_LABELS:
+        label = str(len(labels)) + ' relations'
+    else:
+        label = ', '.join(labels)
+    return {'id': SUMMARY_EDGE_ID_PREFIX + from_id + ' -> ' + to_id, 'from': from_id, 'to': to_id,
+            'label': label, 'title': str(len(edges)) + ' edges', 'weight': len(edges), 'dashes': False,
+            'width': min(1 + math.log2(len(edges)), MAX_SUMMARY_EDGE_WIDTH), 'color': {'color': DEFAULT_COLOR},
+            'arrows': edges[0].get('arrows', {})}
+
+
+class LevelOfDetail:
+    """ aggregates the nodes of a large graph into clusters, that can be expanded on demand
+    """
+
+    def __init__(self, graph_data: dict, method: str = 'class'):
+        """ finds the clusters of the graph
+
+        :param graph_data: network data in format of visdcc
+         :type graph_data: dict
+         :param method: 'class' to aggregate the A-Boxes of a class, 'community' to aggregate communities of nodes
+         :type method: str
+        """
+        if method == 'class':
+            clusters = get_class_clusters(graph_data)
+        elif method == 'community':
+            clusters = get_community_clusters(graph_data)
+        else:
+            raise ValueError("unknown level-of-detail method '" + method + "', use 'class' or 'community'")
+        # maps the id of a cluster node to the ids of the aggregated nodes and vice versa
+        self.clusters = {CLUSTER_ID_PREFIX + name: members for name, members in clusters.items()
+                         if len(members) >= MIN_CLUSTER_SIZE}
+        self.cluster_names = {CLUSTER_ID_PREFIX + name: name for name in clusters}
+        self.node_cluster = {member: cluster_id for cluster_id, members in self.clusters.items()
+                             for member in members}
+        logging.info("successfully aggregated %i nodes into %i clusters", len(self.node_cluster),
+                     len(self.clusters))
+
+    def is_cluster(self, node_id: str):
+        """ checks whether a node id belongs to a cluster node
+
+        :param node_id: id of the node
+         :type node_id: str
+         :return: True, if the node is a cluster node
+         :rtype: bool
+        """
+        return node_id in self.clusters
+
+    def get_display_id(self, node_id: str, expanded_clusters: set):
+        """ returns the id of the node that represents a node in the aggregated graph
+
+        :param node_id: id of the node
+         :type node_id: str
+         :param expanded_clusters: ids of the clusters that are expanded
+         :type expanded_clusters: set
+         :return: the id of the cluster node or the id of the node itself, if it is not aggregated
+         :rtype: str
+        """
+        cluster_id = self.node_cluster.get(node_id)
+        if cluster_id is None or cluster_id in expanded_clusters:
+            return node_id
+        return cluster_id
+
+    def aggregate(self, graph_data: dict, expanded_clusters: set = None):
+        """ aggregates the nodes and edges of the graph, that are not in an expanded cluster
+
+        :param graph_data: network data in format of visdcc, the nodes are the nodes shown in the browser
+         :type graph_data: dict
+         :param expanded_clusters: ids of the clusters that are expanded
+         :type expanded_clusters: set
+         :return: aggregated network data in format of visdcc
+         :rtype: dict
+        """
+        if expanded_clusters is None:
+            expanded_clusters = set()
+        nodes = []
+        cluster_members = defaultdict(list)
+        for node in graph_data['nodes']:
+            display_id = self.get_display_id(node['id'], expanded_clusters)
+            if display_id == node['id']:
+                nodes.append(node)
+            else:
+                cluster_members[display_id].append(node)
+        for cluster_id, members in cluster_members.items():
+            nodes.append({'id': cluster_id, 'label': self.cluster_names[cluster_id] + ' (' + str(len(members)) + ')',
+                          'title': str(len(members)) + ' nodes, select to expand', 'shape': 'diamond',
+                          'T/A': 'cluster', 'color': DEFAULT_COLOR,
+                          'size': CLUSTER_NODE_SIZE + 5 * math.log2(len(members)),
+                          'hidden': all(member.get('hidden', False) for member in members)})
+            # a cluster is placed in the center of its nodes, if the nodes have positions
+            if 'x' in members[0]:
+                nodes[-1]['x'] = sum(member['x'] for member in members) / len(members)
+                nodes[-1]['y'] = sum(member['y'] for member in members) / len(members)
+        edges = []
+        summarized_edges = defaultdict(list)
+        for edge in graph_data['edges']:
+            from_id = self.get_display_id(edge['from'], expanded_clusters)
+            to_id = self.get_display_id(edge['to'], expanded_clusters)
+            if from_id == edge['from'] and to_id == edge['to']:
+                edges.append(edge)
+            elif from_id != to_id:
+                summarized_edges[(from_id, to_id)].append(edge)
+        # only summary edges between shown nodes are added
+        for (from_id, to_id), parallel_edges in summarized_edges.items():
+            if (from_id in cluster_members or from_id not in self.clusters) and \
+                    (to_id in cluster_members or to_id not in self.clusters):
+                edges.append(get_summary_edge(from_id, to_id, parallel_edges))
+        return {'nodes': nodes, 'edges': edges}
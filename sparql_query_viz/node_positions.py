@@ -0,0 +1,177 @@
+"""
+Node positions computed on the server
+
+Instead of letting the physics simulation of vis.js lay out the graph on every load, the positions of the nodes can
+be computed once on the server, either as hierarchical layout of the is_a taxonomy or as force-directed (spring)
+layout. The positions are cached in the '.sqv_cache' directory next to the ontology file and shipped with the nodes,
+so that the browser shows the graph instantly and always in the same way.
+"""
+# imports
+import hashlib
+import json
+import logging
+import math
+from collections import defaultdict
+import networkx
+from .datasets.cache import get_cache_path
+
+# CONSTANTS
+# methods to compute the node positions
+NODE_LAYOUTS = ('hierarchical', 'spring')
+# horizontal distance of the nodes and vertical distance of the rows in the hierarchical layout
+NODE_SPACING = 150
+ROW_SPACING = 200
+# maximal number of nodes in a row of the hierarchical layout, wider levels of the taxonomy are wrapped
+MAX_NODES_PER_ROW = 40
+# the positions of the spring layout are scaled by this factor
+SPRING_LAYOUT_SCALE = 2000
+# seed of the spring layout, so that the layout is the same for every computation
+SPRING_LAYOUT_SEED = 42
+
+
+def get_graph_hash(graph_data: dict):
+    """ returns a hash of the nodes and edges of the graph, used to detect outdated cached positions
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: hex digest of the graph structure
+     :rtype: str
+    """
+    graph_hash = hashlib.sha256()
+    for node_id in sorted(node['id'] for node in graph_data['nodes']):
+        graph_hash.update(node_id.encode() + b'\n')
+    for edge_id in sorted(edge['id'] for edge in graph_data['edges']):
+        graph_hash.update(edge_id.encode() + b'\n')
+    return graph_hash.hexdigest()
+
+
+def get_hierarchical_positions(graph_data: dict):
+    """ computes the positions of the nodes in layers of the is_a taxonomy, the superclasses above their subclasses
+    and instances
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: maps the node ids to their x and y coordinates
+     :rtype: dict
+    """
+    node_ids = [node['id'] for node in graph_data['nodes']]
+    parents = defaultdict(list)
+    children = defaultdict(list)
+    for edge in graph_data['edges']:
+        if 'is_a' in edge['label'].split(',\n ') and edge['from'] != edge['to']:
+            parents[edge['from']].append(edge['to'])
+            children[edge['to']].append(edge['from'])
+    # the depth of a node is the length of the longest is_a path to a root, computed in topological order
+    depth = {}
+    number_of_open_parents = {node_id: len(parents[node_id]) for node_id in node_ids}
+    current_level = [node_id for node_id in node_ids if not parents[node_id]]
+    for node_id in current_level:
+        depth[node_id] = 0
+    while current_level:
+        next_level = []
+        for node_id in current_level:
+            for child in children[node_id]:
+                depth[child] = max(depth.get(child, 0), depth[node_id] + 1)
+                number_of_open_parents[child] = number_of_open_parents.get(child, 1) - 1
+                if number_of_open_parents[child] == 0:
+                    next_level.append(child)
+        current_level = next_level
+    # nodes in is_a cycles have no depth and are placed in the first level
+    levels = defaultdict(list)
+    for node_id in node_ids:
+        levels[depth.get(node_id, 0)].append(node_id)
+    positions = {}
+    row = 0
+    for level in sorted(levels):
+        # the nodes are ordered by the mean x coordinate of their superclasses to avoid crossing edges
+        def get_parent_position(node_id):
+            parent_x = [positions[parent][0] for parent in parents[node_id] if parent in positions]
+            return (sum(parent_x) / len(parent_x) if parent_x else 0, node_id)
+        level_nodes = sorted(levels[level], key=get_parent_position)
+        number_of_rows = math.ceil(len(level_nodes) / MAX_NODES_PER_ROW)
+        for i in range(number_of_rows):
+            row_nodes = level_nodes[i * MAX_NODES_PER_ROW:(i + 1) * MAX_NODES_PER_ROW]
+            for j, node_id in enumerate(row_nodes):
+                positions[node_id] = ((j - (len(row_nodes) - 1) / 2) * NODE_SPACING, row * ROW_SPACING)
+            row = row + 1
+    return positions
+
+
+def get_spring_positions(graph_data: dict):
+    """ computes the positions of the nodes with the force-directed layout of Fruchterman and Reingold
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :return: maps the node ids to their x and y coordinates
+     :rtype: dict
+    """
+    graph = networkx.Graph()
+    graph.add_nodes_from(node['id'] for node in graph_data['nodes'])
+    graph.add_edges_from((edge['from'], edge['to']) for edge in graph_data['edges']
+                         if edge['from'] in graph and edge['to'] in graph)
+    positions = networkx.spring_layout(graph, seed=SPRING_LAYOUT_SEED, scale=SPRING_LAYOUT_SCALE)
+    return {node_id: (float(x), float(y)) for node_id, (x, y) in positions.items()}
+
+
+def compute_node_positions(graph_data: dict, method: str = 'hierarchical'):
+    """ computes the positions of the nodes with the given method
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :param method: 'hierarchical' for the layers of the is_a taxonomy, 'spring' for a force-directed layout
+     :type method: str
+     :return: maps the node ids to their x and y coordinates
+     :rtype: dict
+    """
+    if method == 'hierarchical':
+        return get_hierarchical_positions(graph_data)
+    elif method == 'spring':
+        try:
+            return get_spring_positions(graph_data)
+        except ImportError as error:
+            # networkx needs scipy for the spring layout of large graphs
+            logging.warning("spring layout could not be computed (%s), using hierarchical layout", error)
+            return get_hierarchical_positions(graph_data)
+    raise ValueError("unknown node layout '" + method + "', use one of " + ', '.join(NODE_LAYOUTS))
+
+
+def get_node_positions(graph_data: dict, method: str = 'hierarchical', onto_path: str = None,
+                       cache_dir: str = None):
+    """ returns the positions of the nodes, read from the cache file of the ontology or computed if the graph changed
+
+    :param graph_data: network data in format of visdcc
+     :type graph_data: dict
+     :param method: 'hierarchical' for the layers of the is_a taxonomy, 'spring' for a force-directed layout
+     :type method: str
+     :param onto_path: local path to the ontology file, None to compute the positions without cache
+     :type onto_path: str
+     :param cache_dir: directory of the cache files, defaults to a '.sqv_cache' directory next to the ontology file
+     :type cache_dir: str
+     :return: maps the node ids to their x and y coordinates
+     :rtype: dict
+    """
+    if method not in NODE_LAYOUTS:
+        raise ValueError("unknown node layout '" + method + "', use one of " + ', '.join(NODE_LAYOUTS))
+    if onto_path is None:
+        return compute_node_positions(graph_data, method)
+    graph_hash = get_graph_hash(graph_data)
+    cache_path = None
+    try:
+        cache_path = get_cache_path(onto_path, 'positions-' + method + '.json', cache_dir)
+        with open(cache_path, 'r') as cache_file:
+            cached = json.load(cache_file)
+        if cached.get('graph_hash') == graph_hash:
+            logging.info("successfully read node positions from cache")
+            return {node_id: tuple(position) for node_id, position in cached['positions'].items()}
+    except (OSError, ValueError):
+        # no or an unreadable cache file, the positions are computed
+        pass
+    positions = compute_node_positions(graph_data, method)
+    logging.info("successfully computed %s node positions", method)
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'w') as cache_file:
+                json.dump({'graph_hash': graph_hash, 'positions': positions}, cache_file)
+        except OSError as error:
+            logging.warning("node positions could not be cached: %s", error)
+    return positions
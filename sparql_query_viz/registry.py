@@ -0,0 +1,233 @@
+"""
+Hosting of several ontologies by one server
+
+Every ontology gets its own SQV instance (with its own owlready2 world) and its own Dash app, served under the path
+'/<name>/'. The apps are created when an ontology is first requested. If the memory of the loaded ontologies exceeds
+a budget, the least recently used ontologies that are not serving a request are evicted and reloaded on their next
+access. The layout of every app offers a menu to switch to the other ontologies.
+
+The memory of an ontology is the growth of the resident memory of the process while its app is created. The ontologies
+are loaded one after another, but the allocations of requests served at the same time are counted as well and freed
+memory is not always returned to the system, so the memory is an estimate and the budget a soft limit.
+"""
+# imports
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from werkzeug.exceptions import NotFound
+from werkzeug.serving import run_simple
+from werkzeug.utils import redirect
+from werkzeug.wsgi import ClosingIterator
+from .sparql_query_viz import SQV
+
+# CONSTANTS
+# memory in bytes the loaded ontologies may use, before idle ontologies are evicted
+DEFAULT_MEMORY_BUDGET = 2 * 1024 ** 3
+# if the resident memory of the process can not be measured, the memory of an ontology is estimated as multiple of
+# the size of its file
+FILE_SIZE_MEMORY_FACTOR = 20
+
+
+def get_resident_memory():
+    """ returns the resident memory of the process (only available on Linux)
+
+    :return: resident memory in bytes or None, if it can not be measured
+     :rtype: int
+    """
+    try:
+        with open('/proc/self/statm', 'r') as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class HostedOntology:
+    """ an ontology hosted by the registry, its app is created on first access
+    """
+
+    def __init__(self, name: str, sqv_options: dict):
+        """ initialize HostedOntology class
+
+        :param name: name of the ontology, used as path of its app
+         :type name: str
+         :param sqv_options: keyword arguments of SQV, e.g. iri and path
+         :type sqv_options: dict
+        """
+        self.name = name
+        self.sqv_options = sqv_options
+        # the app is None, as long as the ontology is not loaded
+        self.sqv = None
+        self.app = None
+        self.memory = 0
+        self.last_access = 0.0
+        self.active_requests = 0
+
+
+class OntologyRegistry:
+    """ WSGI application that hosts several ontologies, each with its own SQV app
+    """
+
+    def __init__(self, ontologies: dict, memory_budget: int = DEFAULT_MEMORY_BUDGET, directed: bool = True,
+                 vis_opts: dict = None):
+        """ initialize OntologyRegistry class, no ontology is loaded before it is requested
+
+        :param ontologies: maps the names of the ontologies to the keyword arguments of SQV, e.g.
+            {'pizza': {'iri': 'http://example.org/onto-ex.owl', 'path': 'pizza-onto.owl'}}
+         :type ontologies: dict
+         :param memory_budget: memory in bytes the loaded ontologies may use, before idle ontologies are evicted
+         :type memory_budget: int
+         :param directed: indicates whether the graphs are directed
+         :type directed: bool
+         :param vis_opts: additional visualization options for the visdcc-graphs
+         :type vis_opts: dict
+        """
+        if not ontologies:
+            raise ValueError("at least one ontology has to be hosted")
+        self.ontologies = OrderedDict((name, HostedOntology(name, sqv_options))
+                                      for name, sqv_options in ontologies.items())
+        self.memory_budget = memory_budget
+        self.directed = directed
+        self.vis_opts = vis_opts
+        # the lock protects the states of the hosted ontologies, the load lock serializes the loading of ontologies
+        # (so that their memory can be measured), while the loaded ontologies keep serving requests
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+
+    def get_ontology_links(self, name: str):
+        """ returns the URLs of the other hosted ontologies
+
+        :param name: name of the current ontology
+         :type name: str
+         :return: maps the names of the other ontologies to their URLs
+         :rtype: dict
+        """
+        return {other: '/' + other + '/' for other in self.ontologies if other != name}
+
+    def load(self, ontology: HostedOntology):
+        """ creates the SQV app of an ontology and estimates its memory by the growth of the resident memory of the
+        process, or by the size of the ontology file, if the resident memory can not be measured
+
+        :param ontology: the ontology to be loaded
+         :type ontology: HostedOntology
+         :return: the SQV instance, its app and its memory in bytes
+         :rtype: tuple[SQV, dash.Dash, int]
+        """
+        memory_before = get_resident_memory()
+        sqv = SQV(**ontology.sqv_options)
+        app = sqv.create(directed=self.directed, vis_opts=self.vis_opts,
+                         requests_pathname_prefix='/' + ontology.name + '/',
+                         ontology_links=self.get_ontology_links(ontology.name))
+        memory_after = get_resident_memory()
+        if memory_before is not None and memory_after is not None:
+            memory = max(memory_after - memory_before, 0)
+        else:
+            memory = os.path.getsize(ontology.sqv_options['path']) * FILE_SIZE_MEMORY_FACTOR
+        logging.info("successfully loaded ontology %s (%i MB)", ontology.name, memory // 1024 ** 2)
+        return sqv, app, memory
+
+    def acquire(self, name: str):
+        """ returns the app of an ontology, which is loaded if needed, and marks it as serving a request
+
+        :param name: name of the ontology
+         :type name: str
+         :return: the app of the ontology
+         :rtype: dash.Dash
+        """
+        ontology = self.ontologies[name]
+        with self.lock:
+            ontology.active_requests = ontology.active_requests + 1
+            ontology.last_access = time.monotonic()
+            app = ontology.app
+        if app is not None:
+            return app
+        try:
+            with self.load_lock:
+                # another request may have loaded the ontology in the meantime
+                app = ontology.app
+                if app is None:
+                    sqv, app, memory = self.load(ontology)
+                    with self.lock:
+                        ontology.sqv = sqv
+                        ontology.app = app
+                        ontology.memory = memory
+                        evicted = self.evict()
+                    # the worlds and index files of the evicted ontologies are closed outside of the lock, since a
+                    # running reload of a watched ontology file is finished first
+                    for evicted_sqv in evicted:
+                        evicted_sqv.close()
+                    if evicted:
+                        gc.collect()
+        except Exception:
+            self.release(name)
+            raise
+        return app
+
+    def release(self, name: str):
+        """ marks that an ontology finished serving a request
+
+        :param name: name of the ontology
+         :type name: str
+        """
+        with self.lock:
+            self.ontologies[name].active_requests = self.ontologies[name].active_requests - 1
+
+    def evict(self):
+        """ evicts the least recently used idle ontologies, until the loaded ontologies are within the memory budget
+        (has to be called with the lock held)
+
+        :return: SQV instances of the evicted ontologies, which have to be closed by the caller
+         :rtype: list[SQV]
+        """
+        evicted = []
+        loaded = [ontology for ontology in self.ontologies.values() if ontology.app is not None]
+        memory = sum(ontology.memory for ontology in loaded)
+        for ontology in sorted(loaded, key=lambda hosted: hosted.last_access):
+            if memory <= self.memory_budget:
+                break
+            if ontology.active_requests > 0:
+                continue
+            evicted.append(ontology.sqv)
+            ontology.sqv = None
+            ontology.app = None
+            memory = memory - ontology.memory
+            ontology.memory = 0
+            logging.info("ontology %s was evicted from memory", ontology.name)
+        return evicted
+
+    def __call__(self, environ, start_response):
+        """ dispatches a request to the app of the ontology named by the first segment of the path
+        """
+        path = environ.get('PATH_INFO', '')
+        name, separator, rest = path.lstrip('/').partition('/')
+        if name not in self.ontologies:
+            # the root is redirected to the first ontology
+            if name == '':
+                return redirect('/' + next(iter(self.ontologies)) + '/')(environ, start_response)
+            return NotFound()(environ, start_response)
+        if not separator:
+            return redirect('/' + name + '/')(environ, start_response)
+        app = self.acquire(name)
+        try:
+            app_environ = dict(environ, SCRIPT_NAME=environ.get('SCRIPT_NAME', '') + '/' + name,
+                               PATH_INFO='/' + rest)
+            response = app.server(app_environ, start_response)
+        except BaseException:
+            self.release(name)
+            raise
+        # the ontology serves the request until the server consumed and closed the response, which may be streamed
+        return ClosingIterator(response, lambda: self.release(name))
+
+    def plot(self, debug: bool = False, host: str = "127.0.0.1", port: int = 8050):
+        """ hosts the ontologies on a development server
+
+        :param debug: run the debugger of the server?
+         :type debug: bool
+         :param host: ip address on which to run the server
+         :type host: str
+         :param port: port on which to expose the server
+         :type port: int
+        """
+        run_simple(host, port, self, use_debugger=debug, threaded=True)
@@ -0,0 +1,181 @@
+"""
+Inverted n-gram index for the graph search box
+
+The index is built once at load time over node ids, node labels and edge labels of the visdcc graph data.
+A search returns the ids of the matching nodes, so the search callback only has to update their visibility.
+"""
+
+# import
+import logging
+from collections import Counter
+
+# CONSTANTS
+# length of the n-grams used for substring matching
+NGRAM_SIZE = 3
+
+
+def get_ngrams(text: str, n: int = NGRAM_SIZE):
+    """ returns the n-grams of a text (each n-gram is only returned once)
+
+    :param text: text from which the n-grams are extracted
+     :type text: str
+     :param n: length of the n-grams
+     :type n: int
+     :return: list of distinct n-grams in order of their first occurrence
+     :rtype: list[str]
+    """
+    return list(dict.fromkeys(text[i:i + n] for i in range(len(text) - n + 1)))
+
+
+def get_substring_edit_distance(pattern: str, text: str):
+    """ computes the smallest edit distance between pattern and any substring of text (Sellers algorithm)
+
+    :param pattern: the searched pattern
+     :type pattern: str
+     :param text: the text in which the pattern is searched
+     :type text: str
+     :return: minimal number of insertions, deletions and substitutions to find pattern in text
+     :rtype: int
+    """
+    # the column holds the distances of the pattern prefixes to a substring ending at the current text position
+    column = list(range(len(pattern) + 1))
+    best = column[-1]
+    for char in text:
+        previous_diagonal = column[0]
+        # a match may start anywhere in the text, therefore the first row stays zero
+        column[0] = 0
+        for i, pattern_char in enumerate(pattern, start=1):
+            current = min(column[i] + 1,
+                          column[i - 1] + 1,
+                          previous_diagonal + (pattern_char != char))
+            previous_diagonal = column[i]
+            column[i] = current
+        best = min(best, column[-1])
+    return best
+
+
+class SearchIndex:
+    """ inverted n-gram index over node ids, node labels and edge labels of the visdcc graph data
+    """
+
+    def __init__(self, graph_data: dict, n: int = NGRAM_SIZE):
+        """ builds the search index
+
+        :param graph_data: network data in format of visdcc
+         :type graph_data: dict
+         :param n: length of the n-grams used for substring matching
+         :type n: int
+        """
+        self.n = n
+        # searchable (lower case) texts of nodes and edges and the node ids they stand for
+        self.node_ids = []
+        self.node_texts = []
+        self.edge_texts = []
+        self.edge_node_ids = []
+        # posting lists map all grams of length 1 to n to the positions of the texts containing them
+        self.node_postings = {}
+        self.edge_postings = {}
+        for node in graph_data['nodes']:
+            texts = list(dict.fromkeys([str(node['id']).lower(), str(node.get('label', node['id'])).lower()]))
+            self._add(self.node_postings, len(self.node_texts), texts)
+            self.node_ids.append(node['id'])
+            self.node_texts.append(texts)
+        for edge in graph_data['edges']:
+            texts = [str(edge.get('label', '')).lower()]
+            self._add(self.edge_postings, len(self.edge_texts), texts)
+            self.edge_node_ids.append((edge['from'], edge['to']))
+            self.edge_texts.append(texts)
+        logging.info("successfully built search index over %i nodes and %i edges",
+                     len(self.node_texts), len(self.edge_texts))
+
+    def _add(self, postings: dict, position: int, texts: list):
+        """ adds all grams of length 1 to n of the texts to the posting lists
+
+        :param postings: the posting lists the grams are added to
+         :type postings: dict
+         :param position: position of the element the texts belong to
+         :type position: int
+         :param texts: searchable texts of the element
+         :type texts: list[str]
+        """
+        for text in texts:
+            for length in range(1, self.n + 1):
+                for gram in get_ngrams(text, length):
+                    postings.setdefault(gram, set()).add(position)
+
+    def _find(self, postings: dict, texts: list, query: str):
+        """ returns the positions of all elements with a text that contains the query
+
+        :param postings: the posting lists that are searched
+         :type postings: dict
+         :param texts: searchable texts of all elements
+         :type texts: list[list[str]]
+         :param query: lower case search text
+         :type query: str
+         :return: positions of the matching elements
+         :rtype: set[int]
+        """
+        # short queries are grams themselves, so their posting list is the exact result
+        if len(query) <= self.n:
+            return postings.get(query, set())
+        # intersect the posting lists of all n-grams of the query, starting with the shortest
+        gram_postings = sorted((postings.get(gram, set()) for gram in get_ngrams(query, self.n)), key=len)
+        candidates = set(gram_postings[0])
+        for posting in gram_postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        # the candidates contain all n-grams, but not necessarily in the right order
+        return {pos for pos in candidates if any(query in text for text in texts[pos])}
+
+    def _find_fuzzy(self, postings: dict, texts: list, query: str, max_typos: int):
+        """ returns the positions of all elements with a text that contains the query with at most max_typos typos
+
+        :param postings: the posting lists that are searched
+         :type postings: dict
+         :param texts: searchable texts of all elements
+         :type texts: list[list[str]]
+         :param query: lower case search text
+         :type query: str
+         :param max_typos: maximal edit distance between the query and the matching part of the text
+         :type max_typos: int
+         :return: positions of the matching elements
+         :rtype: set[int]
+        """
+        grams = get_ngrams(query, self.n)
+        # every typo destroys at most n of the n-grams of the query (q-gram lemma), queries that are too short
+        # to keep a shared n-gram are only searched exactly
+        min_shared_grams = len(query) - self.n + 1 - max_typos * self.n
+        if min_shared_grams < 1:
+            return self._find(postings, texts, query)
+        shared_grams = Counter()
+        for gram in grams:
+            shared_grams.update(postings.get(gram, ()))
+        return {pos for pos, count in shared_grams.items() if count >= min_shared_grams
+                and any(get_substring_edit_distance(query, text) <= max_typos for text in texts[pos])}
+
+    def search(self, search_text: str, fuzzy: bool = False, max_typos: int = 1):
+        """ returns the ids of all nodes that match the search text, either by their id or label or by
+        being connected through an edge with a matching label
+
+        :param search_text: the text the graph will be searched for
+         :type search_text: str
+         :param fuzzy: indicates whether typos are tolerated, if the exact search has no results
+         :type fuzzy: bool
+         :param max_typos: maximal number of typos tolerated by the fuzzy search
+         :type max_typos: int
+         :return: ids of the matching nodes
+         :rtype: set[str]
+        """
+        query = (search_text or '').lower()
+        if not query:
+            return set(self.node_ids)
+        node_positions = self._find(self.node_postings, self.node_texts, query)
+        edge_positions = self._find(self.edge_postings, self.edge_texts, query)
+        if fuzzy and not node_positions and not edge_positions:
+            node_positions = self._find_fuzzy(self.node_postings, self.node_texts, query, max_typos)
+            edge_positions = self._find_fuzzy(self.edge_postings, self.edge_texts, query, max_typos)
+        matches = {self.node_ids[pos] for pos in node_positions}
+        for pos in edge_positions:
+            matches.update(self.edge_node_ids[pos])
+        return matches
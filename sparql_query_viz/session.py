@@ -0,0 +1,262 @@
+"""
+Per-session state of SPARQL-Query-Viz
+
+Every browser session gets an id (stored client-side in the 'session-id' store) and a server-side SessionState, that
+holds the composed SPARQL query, the query history and the appearance of the graph shown in the browser. The graph
+and the ontology are shared by all sessions and never modified by a callback.
+
+The SessionStore keeps the states in memory and evicts the least recently used ones (LRU) and those that were not
+used for a while (TTL). If a path is passed, the states are additionally written to a SQLite file, so that several
+worker processes of a WSGI server can serve the same session.
+"""
+# imports
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# CONSTANTS
+# maximal number of sessions kept in memory
+DEFAULT_MAX_SESSIONS = 100
+# seconds after which an unused session is evicted
+DEFAULT_SESSION_TTL = 2 * 60 * 60
+
+
+class SessionState:
+    """ the state of the SPARQL-Query-Viz GUI for one browser session
+    """
+
+    def __init__(self, shown_node_ids: set = None, appearance: dict = None):
+        """ initialize the state of a new session
+
+        :param shown_node_ids: ids of the nodes the browser shows at the beginning
+         :type shown_node_ids: set
+         :param appearance: features the nodes and edges are colored and sized by at the beginning
+         :type appearance: dict
+        """
+        if shown_node_ids is None:
+            shown_node_ids = set()
+        if appearance is None:
+            appearance = {}
+        # composition of the sparql query
+        self.sparql_query = ''
+        self.sparql_query_last_input = ['']
+        self.sparql_query_last_input_type = ['']
+        self.sparql_query_history = ''
+        self.counter_query_history = 0
+        self.sparql_query_result = ''
+        # names of the graph elements in the result of the last evaluated query
+        self.sparql_query_result_list = []
+        # selection made by the user for query templates
+        self.selected_template = ''
+        self.nodes_selected_for_template = 0
+        self.selected_node_for_template = ''
+        self.edges_selected_for_template = 0
+        self.selected_edge_for_template = ''
+        # graph shown in the browser: shown nodes, nodes not hidden by the search and the appearance features
+        self.shown_node_ids = set(shown_node_ids)
+        self.visible_node_ids = self.shown_node_ids
+        self.appearance = {'color_nodes': 'None', 'color_edges': 'None', 'size_nodes': 'None', 'size_edges': 'None',
+                           **appearance}
+        self.node_value_color_mapping = {}
+        self.edge_value_color_mapping = {}
+        # ids of the clusters the user expanded, if the graph is aggregated
+        self.expanded_clusters = set()
+        # nodes shown in the exploration mode: maps the expanded focus nodes to the nodes of their neighbourhood
+        self.explored_regions = OrderedDict()
+        # True, if the browser may show a graph that differs from this state (the session was evicted)
+        self.needs_graph_reset = False
+        # version of the graph model the state refers to, it changes when the ontology file is reloaded
+        self.model_version = 0
+
+    def clear_selection_for_template_query(self):
+        """ deletes/ clears the selection made by the user for query templates
+        """
+        self.selected_template = ''
+        self.nodes_selected_for_template = 0
+        self.selected_node_for_template = ''
+        self.edges_selected_for_template = 0
+        self.selected_edge_for_template = ''
+
+    def delete_last_user_input(self):
+        """ deletes the last input of the user from the sparql query
+        """
+        if not self.sparql_query_last_input_type:
+            return
+        elif self.sparql_query_last_input_type[-1] == 'user_input':
+            self.sparql_query = self.sparql_query.replace(
+                self.sparql_query_last_input[-1], '')
+        elif self.sparql_query_last_input_type[-1] == 'select_node':
+            self.sparql_query = self.sparql_query.replace(
+                self.sparql_query_last_input[-1], ':[node]', 1)
+            self.selected_node_for_template = ''
+            self.nodes_selected_for_template = self.nodes_selected_for_template - 1
+        elif self.sparql_query_last_input_type[-1] == 'select_edge':
+            self.sparql_query = self.sparql_query.replace(
+                self.sparql_query_last_input[-1], ':[edge]', 1)
+            self.selected_edge_for_template = ''
+            self.edges_selected_for_template = self.edges_selected_for_template - 1
+        self.sparql_query_last_input.pop(-1)
+        self.sparql_query_last_input_type.pop(-1)
+
+    def add_to_query_history(self):
+        """ adds the evaluated query to the query history
+        """
+        self.counter_query_history = self.counter_query_history + 1
+        self.sparql_query_history = self.sparql_query_history + str(
+            self.counter_query_history) + ": " + self.sparql_query + '\n'
+
+
+class SessionStore:
+    """ stores the SessionState of every browser session, with LRU and TTL eviction
+    """
+
+    def __init__(self, create_state, max_sessions: int = DEFAULT_MAX_SESSIONS, ttl: float = DEFAULT_SESSION_TTL,
+                 path: str = None):
+        """ initialize the session store
+
+        :param create_state: function without arguments that returns the state of a new session
+         :type create_state: callable
+         :param max_sessions: maximal number of sessions kept in memory
+         :type max_sessions: int
+         :param ttl: seconds after which an unused session is evicted
+         :type ttl: float
+         :param path: path to a SQLite file shared by several worker processes, None to keep the sessions in memory only
+         :type path: str
+        """
+        self.create_state = create_state
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.path = path
+        # session id -> [state, version, last access]
+        self._sessions = OrderedDict()
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path is not None:
+            with self._connect() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("CREATE TABLE IF NOT EXISTS sessions "
+                                   "(id TEXT PRIMARY KEY, version INTEGER, last_access REAL, state BLOB)")
+
+    def _connect(self):
+        """ returns the connection to the shared SQLite file of the current thread
+        """
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = sqlite3.connect(self.path, timeout=30)
+        return self._local.connection
+
+    def _evict(self, now: float):
+        """ removes the least recently used sessions and those that expired, the lock of a session is only removed if
+        no request uses it
+        """
+        while self._sessions:
+            session_id, (_, _, last_access) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - last_access <= self.ttl:
+                break
+            del self._sessions[session_id]
+            if session_id in self._locks and self._locks[session_id][1] == 0:
+                del self._locks[session_id]
+            logging.info("session %s was evicted", session_id)
+
+    def _load(self, session_id: str, version: int):
+        """ returns the state and version stored in the shared SQLite file, if it is newer than version
+        """
+        row = self._connect().execute("SELECT version, state FROM sessions WHERE id = ? AND version > ?",
+                                      (session_id, version)).fetchone()
+        if row is None:
+            return None, version
+        return pickle.loads(row[1]), row[0]
+
+    def _store(self, session_id: str, state: SessionState, version: int, now: float):
+        """ writes the state to the shared SQLite file, if the stored version is still the one the state was loaded
+        with, and removes expired sessions from it
+
+        :return: False, if another worker process stored a newer version of the session in the meantime
+         :rtype: bool
+        """
+        row = (version, now, pickle.dumps(state), session_id)
+        with self._connect() as connection:
+            stored = connection.execute("UPDATE sessions SET version = ?, last_access = ?, state = ? "
+                                        "WHERE id = ? AND version = ?", row + (version - 1,)).rowcount == 1
+            if not stored:
+                # a new session or one that expired in the file, a stored session is never replaced
+                stored = connection.execute("INSERT OR IGNORE INTO sessions (version, last_access, state, id) "
+                                            "VALUES (?, ?, ?, ?)", row).rowcount == 1
+            connection.execute("DELETE FROM sessions WHERE last_access < ?", (now - self.ttl,))
+        return stored
+
+    @contextmanager
+    def session(self, session_id: str):
+        """ context manager that yields the state of a session and stores the changes made to it; the callbacks of
+        one session are serialized
+
+        :param session_id: id of the browser session
+         :type session_id: str
+         :return: the state of the session
+         :rtype: SessionState
+        """
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            # [lock, number of requests using it], the lock is kept while it is used, even if the session is evicted
+            lock_entry = self._locks.setdefault(session_id, [threading.Lock(), 0])
+            lock_entry[1] = lock_entry[1] + 1
+        try:
+            with lock_entry[0]:
+                with self._lock:
+                    entry = self._sessions.get(session_id)
+                    if entry is not None:
+                        entry[2] = now
+                state, version = (entry[0], entry[1]) if entry is not None else (None, 0)
+                if self.path is not None:
+                    stored_state, version = self._load(session_id, version)
+                    if stored_state is not None:
+                        state = stored_state
+                if state is None:
+                    state = self.create_state()
+                    # the session was evicted, the browser shows a graph this new state knows nothing about
+                    state.needs_graph_reset = True
+                    logging.info("session %s was recreated", session_id)
+                try:
+                    yield state
+                finally:
+                    # the callbacks raise PreventUpdate after changing the state as well, so it is stored in any case
+                    self._put(session_id, state, version + 1, now)
+        finally:
+            with self._lock:
+                lock_entry[1] = lock_entry[1] - 1
+                if lock_entry[1] == 0 and session_id not in self._sessions:
+                    self._locks.pop(session_id, None)
+
+    def _put(self, session_id: str, state: SessionState, version: int, now: float):
+        """ puts the state of the session into the memory and the shared SQLite file
+        """
+        if self.path is not None and not self._store(session_id, state, version, now):
+            # the newer state of the other worker process is loaded by the next request of the session
+            logging.warning("session %s was changed by another worker process, the changes were discarded",
+                            session_id)
+            with self._lock:
+                self._sessions.pop(session_id, None)
+            return
+        with self._lock:
+            self._sessions[session_id] = [state, version, now]
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+
+    def create(self, session_id: str):
+        """ creates the state of a new browser session, called when the layout is served to the browser
+
+        :param session_id: id of the new browser session
+         :type session_id: str
+        """
+        self._put(session_id, self.create_state(), 1, time.time())
+        logging.info("new session %s was created", session_id)
+
+    def __len__(self):
+        """ returns the number of sessions kept in memory
+        """
+        return len(self._sessions)
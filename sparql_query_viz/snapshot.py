@@ -0,0 +1,143 @@
+"""
+Warm-start snapshot of the initial state of SQV
+
+Parsing the ontology into the visdcc data, coloring and sizing all elements and building the component tree of the
+layout takes long for large ontologies. With a snapshot, this initial state is pickled into the '.sqv_cache' directory
+next to the ontology file when the app is created, and restored on the next start. A snapshot is only restored, if the
+ontology file, the options of SQV and the source code of the package are unchanged.
+"""
+# imports
+import hashlib
+import importlib
+import json
+import logging
+import os
+import pickle
+from dash.development.base_component import Component
+from .datasets.cache import get_cache_path, get_file_hash
+
+# CONSTANTS
+# version of the format of the snapshot, snapshots of another format are not restored
+SNAPSHOT_FORMAT = 1
+# directory of the package, a change of its source code outdates the snapshots
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SnapshotPickler(pickle.Pickler):
+    """ pickler that stores Dash components by their namespace, type and properties, since the generated classes of
+    some component libraries (e.g. dash_daq) can not be pickled by reference
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Component):
+            # the properties are pickled recursively, nested components and shared graph data included
+            return create_component, (obj._namespace, obj._type, {
+                prop_name: getattr(obj, prop_name) for prop_name in obj._prop_names if hasattr(obj, prop_name)})
+        return NotImplemented
+
+
+def create_component(namespace: str, component_type: str, props: dict):
+    """ creates a Dash component of a component library, used to restore the components of a snapshot
+
+    :param namespace: name of the module of the component library, e.g. 'dash_bootstrap_components'
+     :type namespace: str
+     :param component_type: name of the component class
+     :type component_type: str
+     :param props: properties of the component
+     :type props: dict
+     :return: the component
+     :rtype: Component
+    """
+    return getattr(importlib.import_module(namespace), component_type)(**props)
+
+
+def get_source_hash():
+    """ returns a hash of the source code and assets of the package
+
+    :return: hex digest of the source files
+     :rtype: str
+    """
+    source_hash = hashlib.sha256()
+    for directory, directory_names, file_names in os.walk(PACKAGE_DIR):
+        directory_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(('.py', '.js', '.css')):
+                source_hash.update(file_name.encode())
+                source_hash.update(get_file_hash(os.path.join(directory, file_name)).encode())
+    return source_hash.hexdigest()
+
+
+def get_snapshot_key(onto_path: str, options: dict):
+    """ returns the key of the snapshot of an ontology, that changes if the ontology, the options or the source code
+    of the package change
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param options: options that affect the initial state, must be serializable as JSON
+     :type options: dict
+     :return: key of the snapshot
+     :rtype: str
+    """
+    key = hashlib.sha256()
+    key.update(str(SNAPSHOT_FORMAT).encode())
+    key.update(get_file_hash(onto_path).encode())
+    key.update(get_source_hash().encode())
+    key.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return key.hexdigest()
+
+
+def load_snapshot(onto_path: str, key: str, cache_dir: str = None):
+    """ returns the state stored in the snapshot of an ontology, if the snapshot has the given key
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param key: key of the snapshot, see get_snapshot_key
+     :type key: str
+     :param cache_dir: directory of the cache files, defaults to a '.sqv_cache' directory next to the ontology file
+     :type cache_dir: str
+     :return: the stored state or None, if there is no snapshot with the key
+     :rtype: dict
+    """
+    try:
+        with open(get_cache_path(onto_path, 'snapshot.pickle', cache_dir), 'rb') as snapshot_file:
+            # the key is stored before the state, so that an outdated state is not unpickled
+            if pickle.load(snapshot_file) != key:
+                logging.info("snapshot is outdated, the initial state is computed")
+                return None
+            state = pickle.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+        logging.warning("snapshot could not be restored: %s", error)
+        return None
+    logging.info("successfully restored the initial state from snapshot")
+    return state
+
+
+def save_snapshot(onto_path: str, key: str, state: dict, cache_dir: str = None):
+    """ stores a state in the snapshot of an ontology
+
+    :param onto_path: local path to the ontology file
+     :type onto_path: str
+     :param key: key of the snapshot, see get_snapshot_key
+     :type key: str
+     :param state: the state, must be picklable
+     :type state: dict
+     :param cache_dir: directory of the cache files, defaults to a '.sqv_cache' directory next to the ontology file
+     :type cache_dir: str
+    """
+    temporary_path = None
+    try:
+        snapshot_path = get_cache_path(onto_path, 'snapshot.pickle', cache_dir)
+        # the snapshot is written to a temporary file first, so that other processes never read a partial snapshot
+        temporary_path = snapshot_path + '.' + str(os.getpid())
+        with open(temporary_path, 'wb') as snapshot_file:
+            pickle.dump(key, snapshot_file, pickle.HIGHEST_PROTOCOL)
+            SnapshotPickler(snapshot_file, pickle.HIGHEST_PROTOCOL).dump(state)
+        os.replace(temporary_path, snapshot_path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as error:
+        logging.warning("snapshot could not be saved: %s", error)
+        if temporary_path is not None and os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return
+    logging.info("successfully saved the initial state to snapshot")
@@ -8,18 +8,37 @@ Main class for SPARQL-Query-Viz ontology visualization and querying GUI
 
 # import
 from .layout import get_app_layout, get_distinct_colors, create_color_legend, get_categorical_features, \
-    get_numerical_features, DEFAULT_COLOR, DEFAULT_NODE_SIZE, DEFAULT_EDGE_SIZE, get_options
+    get_numerical_features, DEFAULT_COLOR, DEFAULT_NODE_SIZE, DEFAULT_EDGE_SIZE, GRAPH_PATCH_STORES, get_options, \
+    get_graph_features, replace_component_properties
 from .datasets.parse_ontology import *
 from .datasets.parse_dataframe import parse_dataframe
+from .datasets.cache import get_file_hash
+from .graph_patch import get_empty_patch, get_reset_patch, is_empty_patch, get_attribute_updates, \
+    get_visibility_updates, get_node_set_patch, get_graph_diff_patch
+from .level_of_detail import LevelOfDetail, DEFAULT_LOD_THRESHOLD
+from .node_positions import get_node_positions
+from .exploration import AdjacencyIndex, add_region, DEFAULT_MAX_VISIBLE_NODES, DEFAULT_EXPLORATION_HOPS, \
+    QUERY_RESULT_REGION
+from .search_index import SearchIndex
+from .session import SessionState, SessionStore, DEFAULT_MAX_SESSIONS, DEFAULT_SESSION_TTL
+from owlready2 import Thing
 from ontor import OntoEditor
+import copy
 import datetime
+from contextlib import contextmanager
+from collections import OrderedDict
 import logging
 import os
 import pyparsing
+import uuid
 import dash
-from dash import html
+import dash.exceptions
+from dash import dcc, html
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, ClientsideFunction
+
+# the modules of the optional features (snapshot, full-text search, quadstore, other formats of the ontology file and
+# hot reload) are imported in the code paths that use them
 
 # basic configuration for logging
 dir_file = os.path.dirname(__file__)
@@ -38,35 +57,56 @@ PREFIXES = 'PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> ' \
            'PREFIX owlready: <http://www.lesfleursdunormal.fr/static/_downloads/owlready_ontology.owl#> ' \
            'PREFIX obo: <http://purl.obolibrary.org/obo/>' \
            'PREFIX : <http://example.org/onto-example.owl#>'
-
-
-def _callback_search_graph(graph_data: dict, search_text: str):
+# maximal number of A-Boxes the full-text index adds to the results of the graph search
+FULLTEXT_SEARCH_LIMIT = 100
+# attributes of SQV that hold its initial state, they are saved to and restored from the snapshot
+SNAPSHOT_ATTRIBUTES = ['edge_df', 'node_df', 'data', 'scaling_vars', 'node_frame', 'edge_frame', 'appearance_cache',
+                       'search_index', 'adjacency_index', 'focus_node', 'level_of_detail', 'default_appearance',
+                       'default_node_value_color_mapping', 'default_edge_value_color_mapping']
+# attributes of SQV that hold the graph model, they are swapped together when the ontology file is reloaded
+MODEL_ATTRIBUTES = ['onto'] + SNAPSHOT_ATTRIBUTES + ['layout', 'snapshot_key', 'snapshot_layout']
+# attributes of a session state that refer to the graph model, they are reset when the ontology file is reloaded
+SESSION_GRAPH_ATTRIBUTES = ['shown_node_ids', 'visible_node_ids', 'expanded_clusters', 'explored_regions',
+                            'model_version']
+# popovers and hide/show sections that are toggled by a button in the browser
+TOGGLE_BUTTONS = {"color-legend-popup": "color-legend-toggle",
+                  "info-sparql-popup": "info-sparql-query-button",
+                  "history-show-toggle": "history-show-toggle-button",
+                  "color-show-toggle": "color-show-toggle-button",
+                  "size-show-toggle": "size-show-toggle-button",
+                  "template-show-toggle": "template-show-toggle-button",
+                  "library-show-toggle": "library-show-toggle-button"}
+
+
+def _callback_search_graph(search_text: str, search_index: SearchIndex, shown_node_ids: set, visible_node_ids: set,
+                           fuzzy: bool = False, fulltext_index=None):
     """ only show the nodes which match the search text
 
-    :param graph_data: network data in format of visdcc
-     :type graph_data: dict
-     :param search_text: the text the graph will be searched for
+    :param search_text: the text the graph will be searched for
      :type search_text: str
-     :return: network data with only the matching results in format of visdcc
-     :rtype: dict
+     :param search_index: index over the node ids, node labels and edge labels of the graph
+     :type search_index: SearchIndex
+     :param shown_node_ids: ids of the nodes currently shown in the graph
+     :type shown_node_ids: set
+     :param visible_node_ids: ids of the shown nodes that are currently not hidden
+     :type visible_node_ids: set
+     :param fuzzy: indicates whether typos are tolerated, if there are no exact matches
+     :type fuzzy: bool
+     :param fulltext_index: index over the IRIs, labels, comments and data-property values of the A-Boxes
+     :type fulltext_index: FullTextIndex
+     :return: patch that only updates the visibility of the nodes and the ids of the nodes that are visible afterwards
+     :rtype: tuple[dict, set]
     """
-    nodes = graph_data['nodes']
-    edges = graph_data['edges']
-    for node in nodes:
-        if (search_text.lower() not in node['label'].lower()) and (search_text not in node['label']):
-            node['hidden'] = True
-        else:
-            node['hidden'] = False
-    for edge in edges:
-        if search_text in edge['label'].lower():
-            for node in nodes:
-                if edge['from'].lower() == node['label'].lower():
-                    node['hidden'] = False
-                elif edge['to'].lower() == node['label'].lower():
-                    node['hidden'] = False
-    graph_data['nodes'] = nodes
-    graph_data['edges'] = edges
-    return graph_data
+    if search_text:
+        matches = search_index.search(search_text, fuzzy=fuzzy)
+        if fulltext_index is not None:
+            matches.update(hit['name'] for hit in fulltext_index.search(search_text, FULLTEXT_SEARCH_LIMIT))
+        new_visible_node_ids = shown_node_ids & matches
+    else:
+        new_visible_node_ids = shown_node_ids
+    patch = get_empty_patch()
+    patch['nodes']['update'] = get_visibility_updates(visible_node_ids, new_visible_node_ids)
+    return patch, new_visible_node_ids
 
 
 def get_color_popover_legend_children(node_value_color_mapping: dict = None, edge_value_color_mapping: dict = None):
@@ -123,14 +163,35 @@ def get_color_popover_legend_children(node_value_color_mapping: dict = None, edg
     return popover_legend_children
 
 
+def get_feature_colors(frame: pd.DataFrame, feature: str, for_nodes: bool = True):
+    """ gets the color of every node or edge according to a feature
+
+    :param frame: nodes or edges in a DataFrame with an 'id' column
+     :type frame: pd.DataFrame
+     :param feature: the feature that is used to color the nodes or edges, 'None' for the default color
+     :type feature: str
+     :param for_nodes: indicates whether nodes or edges will be colored
+     :type for_nodes: bool
+     :return: the color of every id and the color-value mapping
+     :rtype: tuple[dict, dict]
+    """
+    # color option is None, default color
+    if feature == 'None':
+        return dict.fromkeys(frame['id'], DEFAULT_COLOR), {}
+    unique_values = frame[feature].unique()
+    colors = get_distinct_colors(len(unique_values), for_nodes=for_nodes)
+    value_color_mapping = {x: y for x, y in zip(unique_values, colors)}
+    return dict(zip(frame['id'], frame[feature].map(value_color_mapping).tolist())), value_color_mapping
+
+
 def get_nodes_to_be_shown(graph_data: dict, res_list: list = None, number_of_edges_to_be_shown_around_result: int = 1):
     """ gets the nodes in graph_data that are listed in res_list and therefore will be shown in the graph NOTE: with
     number_of_edges_to_be_shown_around_result how many layers of the surrounding neighbourhood will be displayed
 
     :param graph_data: network data in format of visdcc
      :type graph_data: dict
-     :param res_list: list of nodes that will be shown in the graph
-     :type res_list: list
+     :param res_list: names of the nodes that will be shown in the graph
+     :type res_list: list[str]
      :param number_of_edges_to_be_shown_around_result: how many layers of the surrounding neighbourhood will be displayed
      :type number_of_edges_to_be_shown_around_result: int
      :return: filtered node graph_data and the result nodes that will be selected
@@ -138,27 +199,20 @@ def get_nodes_to_be_shown(graph_data: dict, res_list: list = None, number_of_edg
      """
     if res_list is None:
         res_list = []
-    filtered_node_data = []
-    n = 1
-    for node in graph_data['nodes']:
-        for result in res_list:
-            try:
-                res_name = result.name
-            except AttributeError:
-                res_name = ''
-            if node['id'] == res_name:
-                filtered_node_data.append(node)
+    res_names = set(res_list)
+    filtered_node_data = [node for node in graph_data['nodes'] if node['id'] in res_names]
     node_selection = filtered_node_data.copy()
     current_level_res_list = node_selection.copy()
     next_level_res_list = []
+    n = 1
     while n <= number_of_edges_to_be_shown_around_result:
-        for result in current_level_res_list:
-            for edge in graph_data['edges']:
-                if edge['from'] == result['id']:
-                    for node in graph_data['nodes']:
-                        if node['id'] == edge['to']:
-                            filtered_node_data.append(node)
-                            next_level_res_list.append(node)
+        current_level_ids = {result['id'] for result in current_level_res_list}
+        for edge in graph_data['edges']:
+            if edge['from'] in current_level_ids:
+                for node in graph_data['nodes']:
+                    if node['id'] == edge['to']:
+                        filtered_node_data.append(node)
+                        next_level_res_list.append(node)
         current_level_res_list = next_level_res_list.copy()
         next_level_res_list = []
         n = n + 1
@@ -170,7 +224,13 @@ class SQV:
     """
 
     def __init__(self, iri: str = "http://example.org/onto-ex.owl",
-                 path: str = "./sparql_query_viz/datasets/ontologies/pizza-onto.owl", abox: bool = True):
+                 path: str = "./sparql_query_viz/datasets/ontologies/pizza-onto.owl", abox: bool = True,
+                 fuzzy_search: bool = False, fulltext_search: bool = True, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 session_ttl: float = DEFAULT_SESSION_TTL, session_store_path: str = None,
+                 lod_threshold: int = DEFAULT_LOD_THRESHOLD, lod_method: str = 'class', node_layout: str = None,
+                 exploration: bool = False, focus_node: str = None, exploration_hops: int = DEFAULT_EXPLORATION_HOPS,
+                 max_visible_nodes: int = DEFAULT_MAX_VISIBLE_NODES, log_ui_events: bool = False,
+                 snapshot: bool = False, quadstore_path: str = None, watch_interval: float = None):
         """ initialize SQV class
 
         :param iri: IRI of the ontology
@@ -179,34 +239,348 @@ class SQV:
          :type path: str
          :param abox: indicates whether A-Boxes are visualized
          :type abox: bool
+         :param fuzzy_search: indicates whether the graph search tolerates typos, if there are no exact matches
+         :type fuzzy_search: bool
+         :param fulltext_search: indicates whether the graph search includes the data-property values, comments
+            and IRIs of the A-Boxes
+         :type fulltext_search: bool
+         :param max_sessions: maximal number of browser sessions kept in memory
+         :type max_sessions: int
+         :param session_ttl: seconds after which the state of an unused browser session is discarded
+         :type session_ttl: float
+         :param session_store_path: path to a SQLite file, in which the browser sessions are shared by several worker
+            processes, None to keep them in the memory of the process only
+         :type session_store_path: str
+         :param lod_threshold: number of nodes above which the graph is aggregated into clusters, that are expanded
+            on demand, None to always show all nodes
+         :type lod_threshold: int
+         :param lod_method: 'class' to aggregate the A-Boxes of a class, 'community' to aggregate communities of nodes
+         :type lod_method: str
+         :param node_layout: 'hierarchical' or 'spring' to compute (and cache) the node positions on the server and
+            disable the physics simulation of the browser, None to let the browser lay out the graph
+         :type node_layout: str
+         :param exploration: indicates whether only a focus node and the neighbourhoods of the nodes selected by the
+            user are shown, instead of the whole graph
+         :type exploration: bool
+         :param focus_node: id of the node shown at the beginning of the exploration, defaults to the node with the
+            most neighbours
+         :type focus_node: str
+         :param exploration_hops: number of hops around a selected node that are shown in the exploration
+         :type exploration_hops: int
+         :param max_visible_nodes: maximal number of nodes shown in the exploration, the least recently expanded
+            neighbourhoods are removed first
+         :type max_visible_nodes: int
+         :param log_ui_events: indicates whether the sections and popovers toggled in the browser are logged on the
+            server
+         :type log_ui_events: bool
+         :param snapshot: indicates whether the initial state (parsed graph data, colors, sizes, legends and layout)
+            is saved to a snapshot when the app is created and restored on the next start
+         :type snapshot: bool
+         :param quadstore_path: path to the SQLite file of a persistent owlready2 quadstore, that is built once from
+            the ontology file and reopened read-only as long as the ontology file is unchanged, None to parse the
+            ontology file on every start
+         :type quadstore_path: str
+         :param watch_interval: seconds between two checks of the ontology file, if it changed, the graph is reloaded
+            in the background while the app keeps serving the old graph, None to not watch the file
+         :type watch_interval: float
          :return: returns an instance of the SQV class
          :rtype: SQV
         """
         self.logger = logging.getLogger('sparql_query_viz-app')
+        self.log_ui_events = log_ui_events
         self.abox = abox
-        self.onto = ontor.OntoEditor(iri, path)
+        self.quadstore_path = quadstore_path
+        self.onto = self.load_ontology(iri, path)
+        self.fuzzy_search = fuzzy_search
+        self.node_layout = node_layout
+        self.focus_node = focus_node
+        self.exploration_hops = exploration_hops
+        self.max_visible_nodes = max_visible_nodes
+        # appearance of the graph served to new browser sessions, set in forced_callback_execution_at_beginning
+        self.default_appearance = {}
+        self.default_node_value_color_mapping = {}
+        self.default_edge_value_color_mapping = {}
+        self.exploration = exploration
+        self.lod_threshold = lod_threshold
+        self.lod_method = lod_method
+        # the initial state is restored from the snapshot of the last start, if the ontology and options are unchanged
+        self.path = path
+        self.snapshot_options = None
+        self.snapshot_key = None
+        self.snapshot_layout = None
+        restored_state = None
+        if snapshot:
+            self.snapshot_options = {
+                'iri': iri, 'abox': abox, 'lod_threshold': lod_threshold, 'lod_method': lod_method,
+                'node_layout': node_layout, 'exploration': exploration, 'focus_node': focus_node,
+                'exploration_hops': exploration_hops, 'max_visible_nodes': max_visible_nodes}
+            from .snapshot import get_snapshot_key, load_snapshot
+            self.snapshot_key = get_snapshot_key(path, self.snapshot_options)
+            restored_state = load_snapshot(path, self.snapshot_key)
+        if restored_state is not None:
+            for attribute in SNAPSHOT_ATTRIBUTES:
+                setattr(self, attribute, restored_state[attribute])
+            self.snapshot_layout = restored_state['layout']
+        else:
+            self.parse_graph()
+        self.fulltext_index = None
+        if self.abox and fulltext_search:
+            from .datasets.fulltext_index import get_fulltext_index
+            self.fulltext_index = get_fulltext_index(self.onto, path)
+        # the graph in self.data is shared by all browser sessions, everything a user changes is kept per session
+        self.sessions = SessionStore(self.create_session_state, max_sessions, session_ttl, session_store_path)
+        # the graph model (self.onto, self.data, the indexes and caches and the layout) is replaced as a whole, when
+        # the watched ontology file is reloaded, the callbacks read it while holding the model lock
+        self.layout = None
+        self.layout_options = None
+        from .hot_reload import ModelLock
+        self.model_lock = ModelLock()
+        self.model_version = 0
+        self.source_hash = get_file_hash(path) if watch_interval is not None else None
+        self.watcher = None
+        if watch_interval is not None:
+            from .hot_reload import OntologyWatcher
+            self.watcher = OntologyWatcher(path, self.reload_ontology, watch_interval)
+
+    def load_ontology(self, iri: str, path: str):
+        """ loads the ontology file into a new owlready2 world, or opens its quadstore (the format of the file is
+        detected from its content)
+
+        :param iri: IRI of the ontology
+         :type iri: str
+         :param path: local path to ontology file
+         :type path: str
+         :return: the loaded ontology
+         :rtype: OntoEditor
+        """
+        from .datasets.ontology_file import OntologyFileEditor, get_ontology_format
+        onto_format, compressed = get_ontology_format(path) if os.path.exists(path) else ('rdfxml', False)
+        # an ontology file that is a SQLite quadstore already is opened in place
+        if onto_format == 'sqlite':
+            return OntologyFileEditor(iri, path)
+        if self.quadstore_path is not None:
+            from .datasets.quadstore import QuadstoreOntoEditor
+            return QuadstoreOntoEditor(iri, path, self.quadstore_path)
+        if onto_format != 'rdfxml' or compressed:
+            return OntologyFileEditor(iri, path)
+        return ontor.OntoEditor(iri, path)
+
+    def parse_graph(self):
+        """ parses the ontology into the visdcc data and builds the indexes over the graph
+        """
         self.edge_df, self.node_df = get_df_from_ontology(self.onto, self.abox)
+        self.index_graph()
+
+    def patch_graph(self, old_onto, triples: list):
+        """ applies the triples changed by a reload of the ontology file to the parsed dataframes, only the A-Boxes
+        described by the triples are parsed again, and builds the visdcc data and the indexes over the graph
+
+        :param old_onto: the ontology the dataframes were parsed from
+         :type old_onto: OntoEditor
+         :param triples: the added and removed triples as returned by get_triple_diff
+         :type triples: list
+         :return: whether the triples were applied, False if they changed T-Boxes, so that the whole ontology has to
+            be parsed again
+         :rtype: bool
+        """
+        from .hot_reload import get_changed_iris, is_blank
+        subjects = {subject for subject, _, _, _ in triples}
+        # a changed class, property or restriction (a blank node) can change any edge of the graph
+        if any(is_blank(subject) for subject in subjects):
+            return False
+        t_boxes = set(self.node_df.loc[self.node_df['T/A'] == 'T', 'id'])
+        changed_iris = get_changed_iris(triples)
+        changed_names = set()
+        for iri in changed_iris:
+            for world in (old_onto.onto_world, self.onto.onto_world):
+                entity = world[iri]
+                if isinstance(entity, Thing):
+                    if entity.name in t_boxes:
+                        return False
+                    changed_names.add(entity.name)
+                elif entity is not None and iri in subjects:
+                    return False
+        node_rows = []
+        edge_rows = []
+        if self.abox:
+            # like get_aboxes, only the instances of the classes of the ontology are A-Boxes of the graph
+            classes = set(self.onto.onto.classes())
+            for iri in changed_iris:
+                ins = self.onto.onto_world[iri]
+                if isinstance(ins, Thing) and not classes.isdisjoint(ins.INDIRECT_is_a):
+                    node_row, ins_edge_rows = get_abox_elements(ins)
+                    node_rows.append(node_row)
+                    edge_rows.extend(ins_edge_rows)
+        # the names of the A-Boxes are no T-Boxes, so that all edges starting at them are edges of the A-Boxes
+        node_df = self.node_df[~(self.node_df['id'].isin(changed_names) & (self.node_df['T/A'] == 'A'))]
+        edge_df = self.edge_df[~self.edge_df['from'].isin(changed_names)]
+        node_df = pd.concat([node_df, pd.DataFrame(node_rows, columns=node_df.columns)], ignore_index=True)
+        edge_df = pd.concat([edge_df, pd.DataFrame(edge_rows, columns=edge_df.columns)], ignore_index=True)
+        # the importance of a node is the number of incoming is_a relations, see get_node_importance
+        is_a_counts = edge_df.loc[edge_df['label'] == 'is_a', 'to'].value_counts()
+        node_df['importance'] = 10 + node_df['id'].map(is_a_counts).fillna(0).astype(int)
+        self.edge_df, self.node_df = edge_df, node_df
+        self.index_graph()
+        self.logger.info("successfully applied changes of %i A-Boxes to the graph", len(changed_names))
+        return True
+
+    def index_graph(self):
+        """ parses the dataframes into the visdcc data and builds the indexes over the graph
+        """
         self.logger.info(
             "begin parsing data from dataframes to visdcc data format...")
         self.data, self.scaling_vars = parse_dataframe(
             self.edge_df, self.node_df)
         self.logger.info(
             "...successfully parsed data from dataframes to visdcc data format")
-        self.filtered_data = self.data.copy()
-        self.node_value_color_mapping = {}
-        self.edge_value_color_mapping = {}
-        self.sparql_query = ''
-        self.sparql_query_last_input = ['']
-        self.sparql_query_last_input_type = ['']
-        self.sparql_query_history = ''
-        self.counter_query_history = 0
-        self.sparql_query_result = ''
-        self.sparql_query_result_list = []
-        self.selected_template = ''
-        self.nodes_selected_for_template = 0
-        self.selected_node_for_template = ''
-        self.edges_selected_for_template = 0
-        self.selected_edge_for_template = ''
+        # the parsed data as DataFrames, the colors and sizes of the features are computed from them (the node sizes
+        # are scaled relative to the parsed sizes) and cached per feature
+        self.node_frame = pd.DataFrame(self.data['nodes'])
+        self.edge_frame = pd.DataFrame(self.data['edges'])
+        self.appearance_cache = {}
+        # the positions of the nodes are computed on the server, if a node layout is chosen
+        if self.node_layout is not None:
+            positions = get_node_positions(self.data, self.node_layout, self.path)
+            for node in self.data['nodes']:
+                node['x'], node['y'] = positions[node['id']]
+        self.search_index = SearchIndex(self.data)
+        # in the exploration mode only a focus node and the neighbourhoods expanded by the user are shown
+        self.adjacency_index = None
+        if self.exploration:
+            self.adjacency_index = AdjacencyIndex(self.data)
+            if self.focus_node not in self.adjacency_index.nodes:
+                self.focus_node = self.adjacency_index.get_most_connected_node()
+        # otherwise large graphs are aggregated into clusters, that are expanded on demand
+        self.level_of_detail = None
+        if not self.exploration and self.lod_threshold is not None and len(self.data['nodes']) > self.lod_threshold:
+            self.level_of_detail = LevelOfDetail(self.data, self.lod_method)
+
+    def create_session_state(self):
+        """ returns the state of a new browser session, which shows the whole graph (or the focus node in the
+        exploration mode) in its default appearance
+
+        :return: state of the new session
+         :rtype: SessionState
+        """
+        if self.adjacency_index is not None:
+            explored_regions = OrderedDict()
+            shown_node_ids = add_region(explored_regions, self.focus_node, self.adjacency_index.get_neighbourhood(
+                self.focus_node, self.exploration_hops, self.max_visible_nodes), self.max_visible_nodes)
+            state = SessionState(shown_node_ids, self.default_appearance)
+            state.explored_regions = explored_regions
+        else:
+            state = SessionState({node['id'] for node in self.data['nodes']}, self.default_appearance)
+        state.node_value_color_mapping = self.default_node_value_color_mapping
+        state.edge_value_color_mapping = self.default_edge_value_color_mapping
+        state.model_version = self.model_version
+        return state
+
+    @contextmanager
+    def session(self, session_id: str):
+        """ context manager that yields the state of a browser session, the graph model is not swapped by a reload
+        until the context is left
+
+        :param session_id: id of the browser session
+         :type session_id: str
+         :return: the state of the session
+         :rtype: SessionState
+        """
+        with self.model_lock.read():
+            with self.sessions.session(session_id) as session:
+                if session.model_version != self.model_version:
+                    self.reset_session_graph(session)
+                yield session
+
+    def reset_session_graph(self, session: SessionState):
+        """ lets a session show the reloaded graph, the composed query and the appearance (as far as its features
+        still exist) are kept
+
+        :param session: state of the browser session
+         :type session: SessionState
+        """
+        initial_state = self.create_session_state()
+        for attribute in SESSION_GRAPH_ATTRIBUTES:
+            setattr(session, attribute, getattr(initial_state, attribute))
+        for key, frame in [('color_nodes', self.node_frame), ('size_nodes', self.node_frame),
+                           ('color_edges', self.edge_frame), ('size_edges', self.edge_frame)]:
+            if session.appearance[key] != 'None' and session.appearance[key] not in frame.columns:
+                session.appearance[key] = initial_state.appearance[key]
+        _, session.node_value_color_mapping = self.get_node_colors(session.appearance['color_nodes'])
+        _, session.edge_value_color_mapping = self.get_edge_colors(session.appearance['color_edges'])
+        session.sparql_query_result_list = []
+        session.needs_graph_reset = True
+        self.logger.info("session state was reset to the reloaded graph")
+
+    def get_session_nodes(self, session: SessionState, node_ids: set):
+        """ returns nodes in the appearance of a session
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :param node_ids: ids of the nodes
+         :type node_ids: set
+         :return: nodes in format of visdcc
+         :rtype: list[dict]
+        """
+        node_colors, _ = self.get_node_colors(session.appearance['color_nodes'])
+        node_sizes = self.get_node_sizes(session.appearance['size_nodes'])
+        if self.adjacency_index is not None:
+            nodes = [self.adjacency_index.nodes[node_id] for node_id in node_ids]
+        else:
+            nodes = [node for node in self.data['nodes'] if node['id'] in node_ids]
+        return [{**node, 'color': node_colors[node['id']], 'size': node_sizes[node['id']],
+                 'hidden': node['id'] not in session.visible_node_ids} for node in nodes]
+
+    def get_session_graph_data(self, session: SessionState):
+        """ returns the network data that the browser of a session shows
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :return: network data in format of visdcc
+         :rtype: dict
+        """
+        nodes = self.get_session_nodes(session, session.shown_node_ids)
+        edge_colors, _ = self.get_edge_colors(session.appearance['color_edges'])
+        edge_widths = self.get_edge_widths(session.appearance['size_edges'])
+        # in the exploration mode the browser only gets the edges between the shown nodes
+        if self.adjacency_index is not None:
+            edges = self.adjacency_index.get_edges(session.shown_node_ids)
+        else:
+            edges = self.data['edges']
+        edges = [{**edge, 'color': edge_colors[edge['id']], 'width': edge_widths[edge['id']]} for edge in edges]
+        if self.level_of_detail is not None:
+            return self.level_of_detail.aggregate({'nodes': nodes, 'edges': edges}, session.expanded_clusters)
+        return {'nodes': nodes, 'edges': edges}
+
+    def get_session_patch(self, session: SessionState, graph_patch: dict):
+        """ returns the patch for the graph of a session, or a patch that resets the whole graph, if the session was
+        recreated after its eviction
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :param graph_patch: patch for the network data, None for no changes
+         :type graph_patch: dict
+         :return: patch for the network data
+         :rtype: dict
+        """
+        if session.needs_graph_reset:
+            session.needs_graph_reset = False
+            self.logger.info("graph data was reset for recreated session or reloaded graph")
+            return get_reset_patch(self.get_session_graph_data(session))
+        return graph_patch
+
+    def search_aboxes(self, search_text: str, limit: int = 50):
+        """ searches the full-text index of the A-Boxes and returns the best matching individuals first
+
+        :param search_text: the text the A-Boxes will be searched for
+         :type search_text: str
+         :param limit: maximal number of returned individuals
+         :type limit: int
+         :return: list of dicts with name, iri, snippet of the matching text and rank (lower is better)
+         :rtype: list[dict]
+        """
+        if self.fulltext_index is None:
+            return []
+        return self.fulltext_index.search(search_text, limit)
 
     def edit_edge_appearance(self, directed: bool = True):
         """ edits the arrow heads of is_a relations
@@ -223,19 +597,12 @@ class SQV:
                     'to': {'enabled': directed, 'type': 'arrow'}}}
             edge.update(arrow_type)
 
-    def clear_selection_for_template_query(self):
-        """ deletes/ clears the selection made by the user for query templates
-        """
-        self.selected_template = ''
-        self.nodes_selected_for_template = 0
-        self.selected_node_for_template = ''
-        self.edges_selected_for_template = 0
-        self.selected_edge_for_template = ''
-
-    def complete_sparql_query_with_selection(self, selection: dict, template: str):
+    def complete_sparql_query_with_selection(self, session: SessionState, selection: dict, template: str):
         """ inserts the selection made by the user into the chosen template
 
-        :param selection: selected node/ edge
+        :param session: state of the browser session
+         :type session: SessionState
+         :param selection: selected node/ edge
          :type selection: dict
          :param template: file name of the template that was chosen
          :type template: str
@@ -245,7 +612,7 @@ class SQV:
             placeholder = ''
             for node in self.data['nodes']:
                 if [node['id']] == selection['nodes']:
-                    self.sparql_query_last_input.append(' :' + node['id'])
+                    session.sparql_query_last_input.append(' :' + node['id'])
                     if template == "template_2.sparql":
                         max_number_of_selected_nodes = 1
                     elif template == "template_3.sparql":
@@ -284,35 +651,35 @@ class SQV:
                         max_number_of_selected_nodes = 4
                     elif template == "template_20.sparql":
                         max_number_of_selected_nodes = 3
-                    if '[:node]' in self.sparql_query:
+                    if '[:node]' in session.sparql_query:
                         placeholder = "[:node]"
-                    elif '[:node1]' in self.sparql_query:
+                    elif '[:node1]' in session.sparql_query:
                         placeholder = "[:node1]"
-                    elif '[:node2]' in self.sparql_query:
+                    elif '[:node2]' in session.sparql_query:
                         placeholder = "[:node2]"
-                    elif '[:node3]' in self.sparql_query:
+                    elif '[:node3]' in session.sparql_query:
                         placeholder = "[:node3]"
-                    if self.nodes_selected_for_template < max_number_of_selected_nodes and template and (
+                    if session.nodes_selected_for_template < max_number_of_selected_nodes and template and (
                             placeholder != ''):
-                        self.sparql_query = self.sparql_query.replace(
-                            placeholder, self.sparql_query_last_input[-1])
-                        self.nodes_selected_for_template = self.nodes_selected_for_template + 1
-                        self.selected_node_for_template = self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('select_node')
-                    elif self.nodes_selected_for_template == max_number_of_selected_nodes:
+                        session.sparql_query = session.sparql_query.replace(
+                            placeholder, session.sparql_query_last_input[-1])
+                        session.nodes_selected_for_template = session.nodes_selected_for_template + 1
+                        session.selected_node_for_template = session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('select_node')
+                    elif session.nodes_selected_for_template == max_number_of_selected_nodes:
                         pass
                     else:
-                        self.sparql_query = self.sparql_query + \
-                            self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
+                        session.sparql_query = session.sparql_query + \
+                            session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('user_input')
                     self.logger.info("%s added to sparql query",
-                                     self.sparql_query_last_input[-1])
+                                     session.sparql_query_last_input[-1])
         elif len(selection['edges']) > 0:
             max_number_of_selected_edges = -1
             placeholder = ''
             for edge in self.data['edges']:
                 if [edge['id']] == selection['edges']:
-                    self.sparql_query_last_input.append(' :' + edge['label'])
+                    session.sparql_query_last_input.append(' :' + edge['label'])
                     if template == "template_2.sparql":
                         max_number_of_selected_edges = 1
                     elif template == "template_3.sparql":
@@ -345,90 +712,62 @@ class SQV:
                         max_number_of_selected_edges = 3
                     elif template == "template_20.sparql":
                         max_number_of_selected_edges = 1
-                    if '[:edge]' in self.sparql_query:
+                    if '[:edge]' in session.sparql_query:
                         placeholder = "[:edge]"
-                    elif '[:edge1]' in self.sparql_query:
+                    elif '[:edge1]' in session.sparql_query:
                         placeholder = "[:edge1]"
-                    elif '[:edge2]' in self.sparql_query:
+                    elif '[:edge2]' in session.sparql_query:
                         placeholder = "[:edge2]"
-                    elif '[:edge3]' in self.sparql_query:
+                    elif '[:edge3]' in session.sparql_query:
                         placeholder = "[:edge3]"
-                    if self.edges_selected_for_template < max_number_of_selected_edges and (placeholder != ''):
-                        self.sparql_query = self.sparql_query.replace(
-                            placeholder, self.sparql_query_last_input[-1])
-                        self.edges_selected_for_template = self.edges_selected_for_template + 1
-                        self.selected_edge_for_template = self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('select_edge')
-                    elif self.edges_selected_for_template == max_number_of_selected_edges:
+                    if session.edges_selected_for_template < max_number_of_selected_edges and (placeholder != ''):
+                        session.sparql_query = session.sparql_query.replace(
+                            placeholder, session.sparql_query_last_input[-1])
+                        session.edges_selected_for_template = session.edges_selected_for_template + 1
+                        session.selected_edge_for_template = session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('select_edge')
+                    elif session.edges_selected_for_template == max_number_of_selected_edges:
                         pass
                     else:
-                        self.sparql_query = self.sparql_query + \
-                            self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
+                        session.sparql_query = session.sparql_query + \
+                            session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('user_input')
                     self.logger.info("%s added to sparql query",
-                                     self.sparql_query_last_input[-1])
-
-    def delete_last_user_input(self):
-        if not self.sparql_query_last_input_type:
-            pass
-        elif self.sparql_query_last_input_type[-1] == 'user_input':
-            self.sparql_query = self.sparql_query.replace(
-                self.sparql_query_last_input[-1], '')
-        elif self.sparql_query_last_input_type[-1] == 'select_node':
-            self.sparql_query = self.sparql_query.replace(
-                self.sparql_query_last_input[-1], ':[node]', 1)
-            self.selected_node_for_template = ''
-            self.nodes_selected_for_template = self.nodes_selected_for_template - 1
-        elif self.sparql_query_last_input_type[-1] == 'select_edge':
-            self.sparql_query = self.sparql_query.replace(
-                self.sparql_query_last_input[-1], ':[edge]', 1)
-            self.selected_edge_for_template = ''
-            self.edges_selected_for_template = self.edges_selected_for_template - 1
-        self.sparql_query_last_input.pop(-1)
-        self.sparql_query_last_input_type.pop(-1)
-        self.logger.info(
-            'last input from user deleted from sparql query, triggered by user')
+                                     session.sparql_query_last_input[-1])
 
-    def add_to_query_history(self):
-        """ adds the evaluated query to the query history
-        """
-        self.counter_query_history = self.counter_query_history + 1
-        self.sparql_query_history = self.sparql_query_history + str(
-            self.counter_query_history) + ": " + self.sparql_query + '\n'
-
-    def _callback_filter_nodes(self, graph_data: dict, shown_result_level: int = 1):
+    def _callback_filter_nodes(self, session: SessionState, shown_result_level: int = 1):
         """ filters the nodes based on the SPARQL query syntax
 
-        :param graph_data: network data in format of visdcc
-         :type graph_data: dict
+        :param session: state of the browser session
+         :type session: SessionState
          :param shown_result_level: how many layers of the surrounding neighbourhood will be displayed
          :type shown_result_level: int
-         :return: the filtered graph_data, the result nodes as string, and the nodes  that will be selected
-         :rtype: tuple[dict, str, dict]
+         :return: the nodes to be shown, the result nodes as string, and the nodes  that will be selected
+         :rtype: tuple[list, str, dict]
         """
-        self.filtered_data = self.data.copy()
         selection = {'nodes': [], 'edges': []}
-        if self.sparql_query:
+        if session.sparql_query:
             try:
                 rdflib_onto = self.onto.onto_world.as_rdflib_graph()
                 res_list = list(rdflib_onto.query_owlready(
-                    PREFIXES + self.sparql_query))
+                    PREFIXES + session.sparql_query))
 
                 if not res_list:
-                    graph_data = self.data
+                    shown_nodes = self.data['nodes']
                     result = "No results for this SPARQL query."
-                    self.sparql_query_result = result
-                    self.add_to_query_history()
+                    session.sparql_query_result = result
+                    session.add_to_query_history()
                     self.logger.info(
                         "valid sparql query successfully evaluated")
                     self.logger.info("result for passed sparql query is empty")
-                    return graph_data, result, selection
+                    return shown_nodes, result, selection
                 else:
                     if type(res_list[0]) == list:
                         flat_res_list = [x for l in res_list for x in l]
                     else:
                         flat_res_list = res_list
-                    self.sparql_query_result_list = flat_res_list
+                    session.sparql_query_result_list = [flat_res.name for flat_res in flat_res_list
+                                                        if hasattr(flat_res, 'name')]
                     result = ""
                     res_is_no_data_object = True
                 for flat_res in flat_res_list:
@@ -438,51 +777,149 @@ class SQV:
                             "result is a valid node/edge of graph")
                         res_is_no_data_object = False
                     except AttributeError:
-                        graph_data = self.data
+                        shown_nodes = self.data['nodes']
                         result = result + str(flat_res) + "\n"
                         self.logger.info(
                             "result is not an object (A-/ T-Box) in graph (different data-type)")
-                self.sparql_query_result = result
+                session.sparql_query_result = result
                 if not res_is_no_data_object:
-                    self.filtered_data['nodes'], selection['nodes'] = get_nodes_to_be_shown(self.filtered_data,
-                                                                                            flat_res_list,
-                                                                                            shown_result_level)
-                    graph_data = self.filtered_data
-                self.add_to_query_history()
+                    shown_nodes, selection['nodes'] = get_nodes_to_be_shown(
+                        self.data, session.sparql_query_result_list, shown_result_level)
+                session.add_to_query_history()
                 self.logger.info("valid sparql query successfully evaluated")
             except pyparsing.ParseException:
-                graph_data = self.data
+                shown_nodes = self.data['nodes']
                 result = "Syntax Error in SPARQL Query."
-                self.sparql_query_result = result
+                session.sparql_query_result = result
                 self.logger.warning(
                     "sparql query passed from user includes a syntax error")
             except Exception:
-                graph_data = self.data
+                shown_nodes = self.data['nodes']
                 result = "An unknown Error occurred! Possible reasons are: " \
                          "\n - Used Prefix is not defined " \
                          "\n - Structural mistake in query"
-                self.sparql_query_result = result
+                session.sparql_query_result = result
                 self.logger.warning(
                     "sparql query passed from user includes an error")
 
         else:
-            graph_data = self.data
+            shown_nodes = self.data['nodes']
             result = "There is nothing to evaluate."
-            self.sparql_query_result = result
+            session.sparql_query_result = result
             self.logger.warning("sparql query passed from user is empty")
-        return graph_data, result, selection
+        return shown_nodes, result, selection
+
+    def _callback_show_nodes(self, session: SessionState, shown_nodes: list):
+        """ replaces the nodes shown in the graph, the search is reset for the newly shown nodes
 
-    def _callback_sparql_query_history(self, number_of_shown_queries: int):
+        :param session: state of the browser session
+         :type session: SessionState
+         :param shown_nodes: the nodes to be shown
+         :type shown_nodes: list[dict]
+         :return: patch for the network data
+         :rtype: dict
+        """
+        new_shown_node_ids = {node['id'] for node in shown_nodes}
+        if self.adjacency_index is not None:
+            # the result of a query replaces the explored neighbourhoods
+            session.explored_regions = OrderedDict()
+            new_shown_node_ids = add_region(session.explored_regions, QUERY_RESULT_REGION,
+                                            list(dict.fromkeys(node['id'] for node in shown_nodes)),
+                                            self.max_visible_nodes)
+        if self.level_of_detail is not None or self.adjacency_index is not None:
+            old_graph_data = self.get_session_graph_data(session)
+            session.shown_node_ids = new_shown_node_ids
+            session.visible_node_ids = new_shown_node_ids
+            return get_graph_diff_patch(old_graph_data, self.get_session_graph_data(session))
+        old_shown_node_ids = session.shown_node_ids
+        old_visible_node_ids = session.visible_node_ids
+        # the shown nodes are visible, before the added nodes are built
+        session.shown_node_ids = new_shown_node_ids
+        session.visible_node_ids = new_shown_node_ids
+        patch = get_node_set_patch(self.get_session_nodes(session, new_shown_node_ids - old_shown_node_ids),
+                                   old_shown_node_ids, new_shown_node_ids)
+        # nodes that stay in the graph are shown again, if the search hid them
+        patch['nodes']['update'] = get_visibility_updates(old_visible_node_ids & new_shown_node_ids,
+                                                          old_shown_node_ids & new_shown_node_ids)
+        return patch
+
+    def _callback_expand_clusters(self, session: SessionState, selected_node_ids: list):
+        """ expands the selected cluster nodes of the aggregated graph
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :param selected_node_ids: ids of the nodes selected in the graph
+         :type selected_node_ids: list[str]
+         :return: patch for the network data or None, if no collapsed cluster was selected
+         :rtype: dict
+        """
+        cluster_ids = {node_id for node_id in selected_node_ids
+                       if self.level_of_detail.is_cluster(node_id)} - session.expanded_clusters
+        if not cluster_ids:
+            return None
+        old_graph_data = self.get_session_graph_data(session)
+        session.expanded_clusters = session.expanded_clusters | cluster_ids
+        return get_graph_diff_patch(old_graph_data, self.get_session_graph_data(session))
+
+    def _callback_collapse_clusters(self, session: SessionState):
+        """ collapses all expanded clusters of the aggregated graph
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :return: patch for the network data
+         :rtype: dict
+        """
+        old_graph_data = self.get_session_graph_data(session)
+        session.expanded_clusters = set()
+        return get_graph_diff_patch(old_graph_data, self.get_session_graph_data(session))
+
+    def _callback_explore_node(self, session: SessionState, node_id: str):
+        """ shows the neighbourhood of a node in the exploration mode
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :param node_id: id of the node selected by the user
+         :type node_id: str
+         :return: patch for the network data
+         :rtype: dict
+        """
+        old_graph_data = self.get_session_graph_data(session)
+        neighbourhood = self.adjacency_index.get_neighbourhood(node_id, self.exploration_hops, self.max_visible_nodes)
+        new_shown_node_ids = add_region(session.explored_regions, node_id, neighbourhood, self.max_visible_nodes)
+        # the new nodes are visible, the nodes that stay keep their visibility
+        session.visible_node_ids = (session.visible_node_ids & new_shown_node_ids) | \
+            (new_shown_node_ids - session.shown_node_ids)
+        session.shown_node_ids = new_shown_node_ids
+        return get_graph_diff_patch(old_graph_data, self.get_session_graph_data(session))
+
+    def _callback_reset_exploration(self, session: SessionState):
+        """ shows only the focus node and its neighbourhood again in the exploration mode
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :return: patch for the network data
+         :rtype: dict
+        """
+        old_graph_data = self.get_session_graph_data(session)
+        initial_state = self.create_session_state()
+        session.explored_regions = initial_state.explored_regions
+        session.shown_node_ids = initial_state.shown_node_ids
+        session.visible_node_ids = initial_state.visible_node_ids
+        return get_graph_diff_patch(old_graph_data, self.get_session_graph_data(session))
+
+    def _callback_sparql_query_history(self, session: SessionState, number_of_shown_queries: int):
         """ gets the sparql queries to be shown in the sparql query history
 
+        :param session: state of the browser session
+        :type session: SessionState
         :param number_of_shown_queries: how many queries will be included in the history
         :type number_of_shown_queries: int
         :return: the history of sparql queries to be shown
         :rtype: str
         """
-        sparql_query_history = self.sparql_query_history
-        if self.counter_query_history > number_of_shown_queries:
-            separator = str(self.counter_query_history -
+        sparql_query_history = session.sparql_query_history
+        if session.counter_query_history > number_of_shown_queries:
+            separator = str(session.counter_query_history -
                             (number_of_shown_queries - 1)) + ": "
             partition = sparql_query_history.partition(separator)
             shown_sparql_query_history = partition[1] + partition[2]
@@ -490,133 +927,201 @@ class SQV:
             shown_sparql_query_history = sparql_query_history
         return shown_sparql_query_history
 
-    def _callback_color_nodes(self, color_nodes_value: str):
-        """ colors the nodes according to the color_nodes_value
+    def get_node_colors(self, color_nodes_value: str):
+        """ gets the color of every node according to the color_nodes_value, the colors are computed once per feature
 
         :param color_nodes_value: the feature that is used to color the nodes
          :type color_nodes_value: str
-         :return: the graph_data with the adjusted node-color values and the color-value mapping
+         :return: the color of every node id and the color-value mapping
          :rtype: tuple[dict, dict]
         """
-        value_color_mapping = {}
-        # color option is None, revert back all changes
-        if color_nodes_value == 'None':
-            # revert to default color
-            for node in self.data['nodes']:
-                node['color'] = DEFAULT_COLOR
-        else:
-            unique_values = pd.DataFrame(self.data['nodes'])[
-                color_nodes_value].unique()
-            colors = get_distinct_colors(len(unique_values), for_nodes=True)
-            value_color_mapping = {x: y for x, y in zip(unique_values, colors)}
-            for node in self.data['nodes']:
-                node['color'] = value_color_mapping[node[color_nodes_value]]
-        # filter the data currently shown
-        filtered_nodes = [x['id'] for x in self.filtered_data['nodes']]
-        self.filtered_data['nodes'] = [
-            x for x in self.data['nodes'] if x['id'] in filtered_nodes]
-        graph_data = self.filtered_data
-        return graph_data, value_color_mapping
-
-    def _callback_size_nodes(self, size_nodes_value: str):
-        """ sizes the nodes according to the size_nodes_value
+        cache_key = ('node_colors', color_nodes_value)
+        if cache_key not in self.appearance_cache:
+            self.appearance_cache[cache_key] = get_feature_colors(self.node_frame, color_nodes_value, for_nodes=True)
+        return self.appearance_cache[cache_key]
+
+    def get_node_sizes(self, size_nodes_value: str):
+        """ gets the size of every node according to the size_nodes_value, the sizes are computed once per feature
+
+        :param size_nodes_value: the feature that is used to size the nodes
+         :type size_nodes_value: str
+         :return: the size of every node id
+         :rtype: dict
+        """
+        cache_key = ('node_sizes', size_nodes_value)
+        if cache_key not in self.appearance_cache:
+            minn = 0
+            maxx = 100
+            if size_nodes_value != 'None':
+                # fetch the scaling value
+                minn = self.scaling_vars['node'][size_nodes_value]['min']
+                maxx = self.scaling_vars['node'][size_nodes_value]['max']
+            # size option is None or minn and maxx is the same, default size
+            if size_nodes_value == 'None' or minn == maxx:
+                sizes = pd.Series(DEFAULT_NODE_SIZE, index=self.node_frame.index)
+            else:
+                # scale relative to the parsed size
+                sizes = self.node_frame['size'] + 20 * (self.node_frame[size_nodes_value] - minn) / (maxx - minn)
+            self.appearance_cache[cache_key] = dict(zip(self.node_frame['id'], sizes.tolist()))
+        return self.appearance_cache[cache_key]
+
+    def get_edge_colors(self, color_edges_value: str):
+        """ gets the color of every edge according to the color_edges_value, the colors are computed once per feature
+
+        :param color_edges_value: the feature that is used to color the edges
+         :type color_edges_value: str
+         :return: the color (in format of visdcc) of every edge id and the color-value mapping
+         :rtype: tuple[dict, dict]
+        """
+        cache_key = ('edge_colors', color_edges_value)
+        if cache_key not in self.appearance_cache:
+            colors, value_color_mapping = get_feature_colors(self.edge_frame, color_edges_value, for_nodes=False)
+            self.appearance_cache[cache_key] = {edge_id: {'color': color} for edge_id, color in colors.items()}, \
+                value_color_mapping
+        return self.appearance_cache[cache_key]
+
+    def get_edge_widths(self, size_edges_value: str):
+        """ gets the width of every edge according to the size_edges_value, the widths are computed once per feature
 
-                :param size_nodes_value: the feature that is used to size the nodes
-                 :type size_nodes_value: str
-                 :return: the graph_data with the adjusted edge-size values
-                 :rtype: dict
-                """
-        minn = 0
-        maxx = 100
-        # fetch the scaling value
-        if size_nodes_value != 'None':
+        :param size_edges_value: the feature that is used to size the edges
+         :type size_edges_value: str
+         :return: the width of every edge id
+         :rtype: dict
+        """
+        cache_key = ('edge_widths', size_edges_value)
+        if cache_key not in self.appearance_cache:
+            minn = 0
+            maxx = 100
             # fetch the scaling value
-            minn = self.scaling_vars['node'][size_nodes_value]['min']
-            maxx = self.scaling_vars['node'][size_nodes_value]['max']
-        # color option is None, revert back all changes
-        if size_nodes_value == 'None' or minn == maxx:
-            # revert to default size
-            for node in self.data['nodes']:
-                node['size'] = DEFAULT_NODE_SIZE
-        else:
-            # define the scaling function
-            def scale_val(x): return 20 * (x - minn) / (maxx - minn)
-            # set size after scaling
-            for node in self.data['nodes']:
-                node['size'] = node['size'] + scale_val(node[size_nodes_value])
-        # filter the data currently shown
-        filtered_nodes = [x['id'] for x in self.filtered_data['nodes']]
-        self.filtered_data['nodes'] = [
-            x for x in self.data['nodes'] if x['id'] in filtered_nodes]
-        graph_data = self.filtered_data
-        return graph_data
-
-    def _callback_color_edges(self, color_edges_value: str):
+            if size_edges_value != 'None':
+                minn = self.scaling_vars['edge'][size_edges_value]['min']
+                maxx = self.scaling_vars['edge'][size_edges_value]['max']
+            # if size option is None or minn and maxx is the same, default size
+            if size_edges_value == 'None' or minn == maxx:
+                widths = pd.Series(DEFAULT_EDGE_SIZE, index=self.edge_frame.index)
+            else:
+                values = self.edge_frame[size_edges_value]
+                widths = (5 * (values - minn) / (maxx - minn)).where(values != minn, DEFAULT_EDGE_SIZE)
+            self.appearance_cache[cache_key] = dict(zip(self.edge_frame['id'], widths.tolist()))
+        return self.appearance_cache[cache_key]
+
+    def get_color_legend(self, color_nodes_value: str, color_edges_value: str):
+        """ gets the children of the color legend popover, the legend is created once per combination of features
+
+        :param color_nodes_value: the feature that is used to color the nodes
+         :type color_nodes_value: str
+         :param color_edges_value: the feature that is used to color the edges
+         :type color_edges_value: str
+         :return: returns a list of dbc.PopoverHeader, html.Div and dbc.PopoverBody - elements
+         :rtype: list
+        """
+        cache_key = ('color_legend', color_nodes_value, color_edges_value)
+        if cache_key not in self.appearance_cache:
+            _, node_value_color_mapping = self.get_node_colors(color_nodes_value)
+            _, edge_value_color_mapping = self.get_edge_colors(color_edges_value)
+            self.appearance_cache[cache_key] = get_color_popover_legend_children(node_value_color_mapping,
+                                                                                 edge_value_color_mapping)
+        return self.appearance_cache[cache_key]
+
+    def precompute_appearances(self, node_color_features: list, edge_color_features: list,
+                               node_size_features: list, edge_size_features: list):
+        """ computes the colors and sizes for all features offered in the settings, so that a recolor or resize of
+        the graph is only a lookup
+
+        :param node_color_features: features the nodes can be colored by
+         :type node_color_features: list[str]
+         :param edge_color_features: features the edges can be colored by
+         :type edge_color_features: list[str]
+         :param node_size_features: features the nodes can be sized by
+         :type node_size_features: list[str]
+         :param edge_size_features: features the edges can be sized by
+         :type edge_size_features: list[str]
+        """
+        for feature in node_color_features:
+            self.get_node_colors(feature)
+        for feature in edge_color_features:
+            self.get_edge_colors(feature)
+        for feature in node_size_features:
+            self.get_node_sizes(feature)
+        for feature in edge_size_features:
+            self.get_edge_widths(feature)
+        self.logger.info("successfully precomputed the colors and sizes of %i features", len(self.appearance_cache))
+
+    def _callback_color_nodes(self, session: SessionState, color_nodes_value: str):
+        """ colors the nodes according to the color_nodes_value
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :param color_nodes_value: the feature that is used to color the nodes
+         :type color_nodes_value: str
+         :return: patch with the adjusted node-color values
+         :rtype: dict
+        """
+        previous_colors, _ = self.get_node_colors(session.appearance['color_nodes'])
+        colors, session.node_value_color_mapping = self.get_node_colors(color_nodes_value)
+        session.appearance['color_nodes'] = color_nodes_value
+        # only send the colors of the shown nodes that changed
+        patch = get_empty_patch()
+        patch['nodes']['update'] = get_attribute_updates(colors, 'color', previous_colors, session.shown_node_ids)
+        return patch
+
+    def _callback_size_nodes(self, session: SessionState, size_nodes_value: str):
+        """ sizes the nodes according to the size_nodes_value
+
+        :param session: state of the browser session
+         :type session: SessionState
+         :param size_nodes_value: the feature that is used to size the nodes
+         :type size_nodes_value: str
+         :return: patch with the adjusted node-size values
+         :rtype: dict
+        """
+        previous_sizes = self.get_node_sizes(session.appearance['size_nodes'])
+        sizes = self.get_node_sizes(size_nodes_value)
+        session.appearance['size_nodes'] = size_nodes_value
+        # only send the sizes of the shown nodes that changed
+        patch = get_empty_patch()
+        patch['nodes']['update'] = get_attribute_updates(sizes, 'size', previous_sizes, session.shown_node_ids)
+        return patch
+
+    def _callback_color_edges(self, session: SessionState, color_edges_value: str):
         """ colors the edges according to the color_edges_value
 
-                :param color_edges_value: the feature that is used to color the edges
-                 :type color_edges_value: str
-                 :return: the graph_data with the adjusted edge-color values and the color-value mapping
-                 :rtype: tuple[dict, dict]
-                """
-        value_color_mapping = {}
-        # color option is None, revert back all changes
-        if color_edges_value == 'None':
-            # revert to default color
-            for edge in self.data['edges']:
-                edge['color']['color'] = DEFAULT_COLOR
-        else:
-            unique_values = pd.DataFrame(self.data['edges'])[
-                color_edges_value].unique()
-            colors = get_distinct_colors(len(unique_values), for_nodes=False)
-            value_color_mapping = {x: y for x, y in zip(unique_values, colors)}
-            for edge in self.data['edges']:
-                edge['color']['color'] = value_color_mapping[edge[color_edges_value]]
-        # filter the data currently shown
-        filtered_edges = [x['id'] for x in self.filtered_data['edges']]
-        self.filtered_data['edges'] = [
-            x for x in self.data['edges'] if x['id'] in filtered_edges]
-        graph_data = self.filtered_data
-        return graph_data, value_color_mapping
-
-    def _callback_size_edges(self, size_edges_value: str):
+        :param session: state of the browser session
+         :type session: SessionState
+         :param color_edges_value: the feature that is used to color the edges
+         :type color_edges_value: str
+         :return: patch with the adjusted edge-color values
+         :rtype: dict
+        """
+        previous_colors, _ = self.get_edge_colors(session.appearance['color_edges'])
+        colors, session.edge_value_color_mapping = self.get_edge_colors(color_edges_value)
+        session.appearance['color_edges'] = color_edges_value
+        # only send the colors of the edges that changed
+        patch = get_empty_patch()
+        patch['edges']['update'] = get_attribute_updates(colors, 'color', previous_colors)
+        return patch
+
+    def _callback_size_edges(self, session: SessionState, size_edges_value: str):
         """ sizes the edges according to the size_edges_value
 
-        :param size_edges_value: the feature that is used to size the edges
+        :param session: state of the browser session
+         :type session: SessionState
+         :param size_edges_value: the feature that is used to size the edges
          :type size_edges_value: str
-         :return: the graph_data with the adjusted edge-size values
+         :return: patch with the adjusted edge-size values
          :rtype: dict
         """
-        minn = 0
-        maxx = 100
-        # fetch the scaling value
-        if size_edges_value != 'None':
-            minn = self.scaling_vars['edge'][size_edges_value]['min']
-            maxx = self.scaling_vars['edge'][size_edges_value]['max']
-        # if color option is None or minn and maxx is the same, revert back all changes
-        if size_edges_value == 'None' or minn == maxx:
-            # revert to default size
-            for edge in self.data['edges']:
-                edge['width'] = DEFAULT_EDGE_SIZE
-        else:
-            # define the scaling function
-            def scale_val(x): return 5 * (x - minn) / (maxx - minn)
-            # set the size after scaling
-            for edge in self.data['edges']:
-                if edge[size_edges_value] == minn:
-                    edge['width'] = DEFAULT_EDGE_SIZE
-                else:
-                    edge['width'] = scale_val(edge[size_edges_value])
-                # edge['width'] = edge[size_edges_value]
-        # filter the data currently shown
-        filtered_edges = [x['id'] for x in self.filtered_data['edges']]
-        self.filtered_data['edges'] = [
-            x for x in self.data['edges'] if x['id'] in filtered_edges]
-        graph_data = self.filtered_data
-        return graph_data
+        previous_widths = self.get_edge_widths(session.appearance['size_edges'])
+        widths = self.get_edge_widths(size_edges_value)
+        session.appearance['size_edges'] = size_edges_value
+        # only send the sizes of the edges that changed
+        patch = get_empty_patch()
+        patch['edges']['update'] = get_attribute_updates(widths, 'width', previous_widths)
+        return patch
 
     def forced_callback_execution_at_beginning(self, directed=True):
-        """ executes the callback functions for node and edge Coloring and Sizing at start of the app
+        """ executes the callback functions for node and edge Coloring and Sizing at start of the app, the result is
+        the appearance of the graph served to new browser sessions
 
         :param directed: indicates whether graph is directed
          :type directed: bool
@@ -624,69 +1129,211 @@ class SQV:
 
         # Give all is_a edges a circle as arrowhead
         self.edit_edge_appearance(directed=directed)
+        # the callbacks are executed for a state, that is the template for all new browser sessions
+        state = SessionState()
         # Get list of categorical features from nodes
-        cat_node_features = get_categorical_features(pd.DataFrame(self.data['nodes']),
+        cat_node_features = get_categorical_features(self.node_frame,
                                                      20, ['shape', 'label', 'id', 'title', 'color'])
         # Define label and value for each categorical feature
         options = [{'label': opt, 'value': opt} for opt in cat_node_features]
         # If options has more then one categorical feature, the callback function for nodes-coloring is executed once,
         # to set the first option as default value
         if len(options) > 1:
-            self.data, self.node_value_color_mapping = self._callback_color_nodes(
-                options[1].get('value'))
+            self._callback_color_nodes(state, options[1].get('value'))
             self.logger.info("Nodes were initially colored")
         # Get list of categorical features from edges
-        cat_edge_features = get_categorical_features(pd.DataFrame(self.data['edges']).drop(
-            columns=['color', 'from', 'to', 'id', 'arrows']), 20, ['color', 'from', 'to', 'id'])
+        cat_edge_features = get_categorical_features(self.edge_frame.drop(
+            columns=['color', 'from', 'to', 'id', 'arrows'], errors='ignore'), 20, ['color', 'from', 'to', 'id'])
         # Define label and value for each categorical feature
         options = [{'label': opt, 'value': opt} for opt in cat_edge_features]
         # If options has mor then one categorical feature, the callback function for edge-coloring is executed once,
         # to set the first option as default value
         if len(options) > 1:
-            self.data, self.edge_value_color_mapping = self._callback_color_edges(
-                options[1].get('value'))
+            self._callback_color_edges(state, options[1].get('value'))
             self.logger.info("Edges were initially colored")
         # Get list of numerical features from nodes
-        num_node_features = get_numerical_features(
-            pd.DataFrame(self.data['nodes']))
+        num_node_features = get_numerical_features(self.node_frame)
         # Define label and value for each numerical feature
         options = [{'label': opt, 'value': opt} for opt in num_node_features]
         # If options has mor then one numerical feature, the callback function for nodes-sizing is executed once,
         # to set the first option as default value
         if len(options) > 1:
-            self.data = self._callback_size_nodes(options[1].get('value'))
+            self._callback_size_nodes(state, options[1].get('value'))
             self.logger.info("Nodes were initially sized")
         # Get list of numerical features from edges
-        num_edge_features = get_numerical_features(
-            pd.DataFrame(self.data['edges']))
+        num_edge_features = get_numerical_features(self.edge_frame)
         # Define label and value for each numerical feature
         options = [{'label': opt, 'value': opt} for opt in num_edge_features]
         # If options has mor then one numerical feature, the callback function for edge-sizing is executed once,
         # to set the first option as default value
         if len(options) > 1:
-            self.data = self._callback_size_edges(options[1].get('value'))
+            self._callback_size_edges(state, options[1].get('value'))
             self.logger.info("Edges were initially sized")
+        # all features offered in the settings are looked up later
+        self.precompute_appearances(cat_node_features, cat_edge_features, num_node_features, num_edge_features)
+        # the served graph data shows the default appearance
+        self.default_appearance = state.appearance
+        self.default_node_value_color_mapping = state.node_value_color_mapping
+        self.default_edge_value_color_mapping = state.edge_value_color_mapping
+        node_colors, _ = self.get_node_colors(state.appearance['color_nodes'])
+        node_sizes = self.get_node_sizes(state.appearance['size_nodes'])
+        for node in self.data['nodes']:
+            node['color'] = node_colors[node['id']]
+            node['size'] = node_sizes[node['id']]
+        edge_colors, _ = self.get_edge_colors(state.appearance['color_edges'])
+        edge_widths = self.get_edge_widths(state.appearance['size_edges'])
+        for edge in self.data['edges']:
+            edge['color'] = edge_colors[edge['id']]
+            edge['width'] = edge_widths[edge['id']]
+
+    def build_layout(self, directed: bool = False, vis_opts: dict = None, ontology_links: dict = None,
+                     previous_model=None):
+        """ colors and sizes the graph data in its default appearance and builds the layout of the app, the layout
+        and the initial state are saved to the snapshot, if required
 
-    def create(self, directed: bool = False, vis_opts: dict = None):
+        :param directed: indicates whether the graph is directed
+         :type directed: bool
+         :param vis_opts: additional visualization options for the visdcc-graph
+         :type vis_opts: dict
+         :param ontology_links: maps the names of the other hosted ontologies to their URLs
+         :type ontology_links: dict
+         :param previous_model: the graph model served before a reload of the ontology file, only the graph data and
+            the color legends of its layout are replaced, if the graph offers the same features
+         :type previous_model: SQV
+         :return: the layout of the app
+         :rtype: dbc.Container
+        """
+        # get color_mapping and size_mapping once at the start
+        self.forced_callback_execution_at_beginning(directed=directed)
+
+        # define layout
+        shown_graph_data = None
+        if self.level_of_detail is not None or self.adjacency_index is not None:
+            shown_graph_data = self.get_session_graph_data(self.create_session_state())
+        color_legends = get_color_popover_legend_children(self.default_node_value_color_mapping,
+                                                          self.default_edge_value_color_mapping)
+        if previous_model is not None and self.get_layout_features() == previous_model.get_layout_features():
+            layout = replace_component_properties(previous_model.layout, {
+                'graph': {'data': self.data if shown_graph_data is None else shown_graph_data},
+                'color-legend-popup': {'children': color_legends}})
+            self.logger.info("graph data of the layout was replaced")
+        else:
+            layout = get_app_layout(self.data, self.onto, color_legends=color_legends,
+                                    directed=directed, vis_opts=vis_opts, abox=self.abox,
+                                    shown_graph_data=shown_graph_data, physics=self.node_layout is None,
+                                    ontology_links=ontology_links)
+        if self.snapshot_key is not None:
+            from .snapshot import save_snapshot
+            self.snapshot_layout = {'options': self.layout_options, 'layout': layout}
+            state = {attribute: getattr(self, attribute) for attribute in SNAPSHOT_ATTRIBUTES}
+            state['layout'] = self.snapshot_layout
+            save_snapshot(self.path, self.snapshot_key, state)
+        return layout
+
+    def get_layout_features(self):
+        """ returns what the layout shows apart from the graph data and the color legends: the name of the ontology,
+        whether the graph is aggregated and the features offered to color and size the graph
+
+        :return: tuple of the name, the aggregation and the features
+         :rtype: tuple
+        """
+        return ((self.onto.onto.name, self.level_of_detail is not None or self.adjacency_index is not None)
+                + get_graph_features(self.data))
+
+    def reload_ontology(self):
+        """ reloads the changed ontology file in the background: only the changed triples are applied to the graph
+        model, which is swapped in as a whole, after the running callbacks finished
+
+        :return: whether the graph model was swapped
+         :rtype: bool
+        """
+        from .hot_reload import get_triple_diff, get_changed_iris
+        source_hash = get_file_hash(self.path)
+        if source_hash == self.source_hash:
+            return False
+        self.logger.info("ontology file changed, begin reloading it...")
+        onto = self.load_ontology(self.onto.iri, self.path)
+        added_triples, removed_triples = get_triple_diff(self.onto.onto_world, onto.onto_world)
+        if not added_triples and not removed_triples:
+            onto.onto_world.close()
+            self.source_hash = source_hash
+            self.logger.info("...triples of reloaded ontology are unchanged, the graph is kept")
+            return False
+        # the new model is built on a shallow copy, whose model attributes are replaced, while the served model is
+        # still used by the callbacks
+        model = copy.copy(self)
+        model.onto = onto
+        if not model.patch_graph(self.onto, added_triples + removed_triples):
+            self.logger.info("T-Boxes changed, the whole ontology is parsed again")
+            model.parse_graph()
+        if model.snapshot_key is not None:
+            from .snapshot import get_snapshot_key
+            model.snapshot_key = get_snapshot_key(self.path, self.snapshot_options)
+        model.layout = model.build_layout(**self.layout_options, previous_model=self)
+        # only the individuals described by changed triples are indexed again, in a copy of the full-text index that
+        # replaces the searched index together with the graph model
+        fulltext_index = None
+        if self.fulltext_index is not None:
+            fulltext_index = self.fulltext_index.copy(self.fulltext_index.index_path + '.reload')
+            fulltext_index.update(onto, get_changed_iris(added_triples + removed_triples), source_hash)
+        old_onto = self.onto
+        with self.model_lock.write():
+            for attribute in MODEL_ATTRIBUTES:
+                setattr(self, attribute, getattr(model, attribute))
+            self.source_hash = source_hash
+            self.model_version = self.model_version + 1
+            if fulltext_index is not None:
+                self.fulltext_index.replace(fulltext_index)
+        # the callbacks only read the new world from now on
+        old_onto.onto_world.close()
+        self.logger.info("...successfully reloaded ontology (%i triples added, %i triples removed)",
+                         len(added_triples), len(removed_triples))
+        return True
+
+    def create(self, directed: bool = False, vis_opts: dict = None, requests_pathname_prefix: str = None,
+               ontology_links: dict = None):
         """ creates the SPARQl-Query-Viz app and returns it
 
         :param directed: indicates whether the graph is directed
          :type directed: bool
          :param vis_opts: additional visualization options for the visdcc-graph
          :type vis_opts: dict
+         :param requests_pathname_prefix: URL prefix of the app, if it is served under a path of a server that hosts
+            several ontologies, e.g. '/pizza/'
+         :type requests_pathname_prefix: str
+         :param ontology_links: maps the names of the other hosted ontologies to their URLs, they are offered in a
+            menu to switch the ontology
+         :type ontology_links: dict
          :return: the SPARQl-Query-Viz app
          :rtype dash.Dash
         """
         # create the app
-        app = dash.Dash(__name__, external_stylesheets=[
-                        dbc.themes.BOOTSTRAP], title='SPARQL-Query-Viz')
+        if requests_pathname_prefix is not None:
+            app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], title='SPARQL-Query-Viz',
+                            routes_pathname_prefix='/', requests_pathname_prefix=requests_pathname_prefix)
+        else:
+            app = dash.Dash(__name__, external_stylesheets=[
+                            dbc.themes.BOOTSTRAP], title='SPARQL-Query-Viz')
+
+        # the colored and sized graph data and the layout are restored from the snapshot, if it was created with
+        # the same options
+        self.layout_options = {'directed': directed, 'vis_opts': vis_opts, 'ontology_links': ontology_links}
+        if self.snapshot_layout is not None and self.snapshot_layout['options'] == self.layout_options:
+            self.layout = self.snapshot_layout['layout']
+            self.logger.info("layout was restored from snapshot")
+        else:
+            self.layout = self.build_layout(directed, vis_opts, ontology_links)
 
-        # get color_mapping and size_mapping once at the start
-        self.forced_callback_execution_at_beginning(directed=directed)
+        # every page load is a new browser session with its own state
+        def serve_layout():
+            session_id = str(uuid.uuid4())
+            with self.model_lock.read():
+                self.sessions.create(session_id)
+                layout = self.layout
+            return html.Div([dcc.Store(id='session-id', data=session_id), dcc.Store(id='ui-event-log'),
+                             dcc.Store(id='query-history-counter'), layout])
 
-        # define layout
-        app.layout = get_app_layout(self.data, self.onto, color_legends=get_color_popover_legend_children(),
-                                    directed=directed, vis_opts=vis_opts, abox=self.abox)
+        app.layout = serve_layout
 
         # create callback to freeze/ unfreeze simulation
         @app.callback(
@@ -702,42 +1349,19 @@ class SQV:
                     directed=directed, opts_args=vis_opts, physics=False)
             return options
 
-        # create callback to toggle legend popover
-        @app.callback(
-            Output("color-legend-popup", "is_open"),
-            [Input("color-legend-toggle", "n_clicks")],
-            [State("color-legend-popup", "is_open")],
-        )
-        def toggle_popover(n, is_open):
-            if n:
-                if is_open:
-                    self.logger.info(
-                        "legend popup was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "legend popup was shown, triggered by user")
-                return not is_open
-            return is_open
-
-        # create callback to toggle sparql-info popover
-        @app.callback(
-            Output("info-sparql-popup", "is_open"),
-            [Input("info-sparql-query-button", "n_clicks")],
-            [State("info-sparql-popup", "is_open")],
-        )
-        def toggle_popover(n, is_open):
-            if n:
-                if is_open:
-                    self.logger.info(
-                        "sparql info popup was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "sparql info popup was shown, triggered by user")
-                return not is_open
-            return is_open
-
-        # create callback to toggle hide/show sections - SPARQL QUERY section
-        @app.callback(
+        # create clientside callbacks to toggle the popovers and the hide/show sections, a server round-trip is only
+        # made to log the toggles
+        for toggled_id, button_id in TOGGLE_BUTTONS.items():
+            app.clientside_callback(
+                ClientsideFunction(namespace='sqv', function_name='toggle_open'),
+                Output(toggled_id, 'is_open'),
+                [Input(button_id, 'n_clicks')],
+                [State(toggled_id, 'is_open')]
+            )
+
+        # SPARQL QUERY section, also opened if a template or library query is chosen
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='toggle_query_section'),
             Output("filter-show-toggle", "is_open"),
             [Input("filter-show-toggle-button", "n_clicks"),
              Input('sparql_template_dropdown', 'value'),
@@ -745,76 +1369,53 @@ class SQV:
              Input('sparql_library_dropdown', 'value'), ],
             [State("filter-show-toggle", "is_open")],
         )
-        def toggle_filter_collapse(n_show, template_value, incons_template_value, library_value, is_open):
-            ctx = dash.callback_context
-            if not ctx.triggered:
-                return is_open
-            else:
-                input_id = ctx.triggered[0]['prop_id'].split('.')[0]
-                if input_id == "filter-show-toggle-button" and n_show:
-                    if is_open:
-                        self.logger.info(
-                            "sparql query section was hidden, triggered by user")
-                    else:
-                        self.logger.info(
-                            "sparql query section was shown, triggered by user")
-                    return not is_open
-                if (input_id == "sparql_template_dropdown" and template_value) \
-                        or (input_id == "sparql_library_dropdown" and library_value)\
-                        or (input_id == "inconsistency_template_dropdown" and incons_template_value):
-                    self.logger.info(
-                        "sparql query section was shown, because template/library input was triggered")
-                    return True
-            return is_open
 
-        # create callback to toggle hide/show sections - SPARQL RESULT section
-        @app.callback(
+        # SPARQL RESULT section, also opened if a query is evaluated
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='toggle_result_section'),
             Output("result-show-toggle", "is_open"),
             [Input("result-show-toggle-button", "n_clicks"),
              Input('evaluate_query_button', 'n_clicks'),
              Input('select_button', 'n_clicks')],
             [State("result-show-toggle", "is_open")],
         )
-        def toggle_filter_collapse(n_show, n_evaluate, n_select, is_open):
-            ctx = dash.callback_context
-            if not ctx.triggered:
-                return is_open
-            else:
-                input_id = ctx.triggered[0]['prop_id'].split('.')[0]
-                if input_id == "result-show-toggle-button" and n_show:
-                    if is_open:
-                        self.logger.info(
-                            "sparql result section was hidden, triggered by user")
-                    else:
-                        self.logger.info(
-                            "sparql result section was shown, triggered by user")
-                    return not is_open
-                if input_id == "evaluate_query_button" and n_evaluate:
-                    self.logger.info(
-                        "sparql result section was shown, because evaluation button was triggered")
-                    return True
-                elif input_id == "select_button" and n_select:
-                    self.logger.info(
-                        "sparql result section was shown, because select button was triggered")
-                    return True
-            return is_open
 
-        # create callback to toggle hide/show sections - SPARQL HISTORY section
-        @app.callback(
-            Output("history-show-toggle", "is_open"),
-            [Input("history-show-toggle-button", "n_clicks")],
-            [State("history-show-toggle", "is_open")],
+        # A-BOX DATA-PROPERTY section, shown if an A-Box is selected
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='toggle_abox_section'),
+            Output("abox-dp-show-toggle", "is_open"),
+            [Input("abox-dp-show-toggle-button", "n_clicks"),
+             Input('graph', 'selection'),
+             Input("add_node_edge_to_query_button", "on")],
+            [State("abox-dp-show-toggle", "is_open"),
+             State('graph', 'data')],
+        )
+
+        # SELECTED EDGE section, shown if only edges are selected
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='toggle_edge_section'),
+            Output("edge-selection-show-toggle", "is_open"),
+            [Input("edge-selection-show-toggle-button", "n_clicks"),
+             Input('graph', 'selection'),
+             Input("add_node_edge_to_query_button", "on")],
+            [State("edge-selection-show-toggle", "is_open")],
         )
-        def toggle_filter_collapse(n_show, is_open):
-            if n_show:
-                if is_open:
-                    self.logger.info(
-                        "sparql history section was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "sparql history section was shown, triggered by user")
-                return not is_open
-            return is_open
+
+        # create callback to log the toggled sections, if required
+        if self.log_ui_events:
+            toggled_ids = list(TOGGLE_BUTTONS) + ["filter-show-toggle", "result-show-toggle", "abox-dp-show-toggle",
+                                                  "edge-selection-show-toggle"]
+
+            @app.callback(
+                Output('ui-event-log', 'data'),
+                [Input(toggled_id, 'is_open') for toggled_id in toggled_ids],
+                prevent_initial_call=True
+            )
+            def log_ui_event(*is_open):
+                for triggered in dash.callback_context.triggered:
+                    self.logger.info("%s was %s", triggered['prop_id'].split('.')[0],
+                                     'shown' if triggered['value'] else 'hidden')
+                return dash.no_update
 
         # create callback to interactively compose SPARQL queries
         @app.callback(
@@ -830,18 +1431,27 @@ class SQV:
              Input('sparql_template_dropdown', 'value'),
              Input('inconsistency_template_dropdown', 'value'),
              Input('sparql_library_dropdown', 'value')],
-            [State("filter_nodes", "value")],
+            [State("filter_nodes", "value"),
+             State('session-id', 'data')],
         )
         def edit_sparql_query(kw_value, var_value, syn_value, n_add,
                               n_clear, n_delete, on_select, selection, template_value,
-                              inconsistency_template_value, library_value, value):
+                              inconsistency_template_value, library_value, value, session_id):
+            with self.session(session_id) as session:
+                return _edit_sparql_query(session, kw_value, var_value, syn_value, n_add, n_clear, n_delete,
+                                          on_select, selection, template_value, inconsistency_template_value,
+                                          library_value, value)
+
+        def _edit_sparql_query(session, kw_value, var_value, syn_value, n_add,
+                               n_clear, n_delete, on_select, selection, template_value,
+                               inconsistency_template_value, library_value, value):
             ctx = dash.callback_context
-            if self.sparql_query is None:
-                self.sparql_query = ""
+            if session.sparql_query is None:
+                session.sparql_query = ""
 
             if not ctx.triggered:
                 self.logger.info("no trigger by user")
-                return self.sparql_query
+                return session.sparql_query
             else:
                 # find the id of the option which was triggered
                 input_id = ctx.triggered[0]['prop_id'].split('.')[0]
@@ -849,243 +1459,91 @@ class SQV:
                 if input_id == "sparql-keywords-dropdown":
                     if kw_value is not None:
                         if kw_value == "PREFIX":
-                            self.sparql_query_last_input.append(
+                            session.sparql_query_last_input.append(
                                 " PREFIX : <" + self.onto.iri + "#>")
                         elif kw_value == "SELECT":
-                            self.sparql_query_last_input.append(" SELECT")
+                            session.sparql_query_last_input.append(" SELECT")
                         else:
-                            self.sparql_query_last_input.append(" " + kw_value)
-                        self.sparql_query = self.sparql_query + \
-                            self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
+                            session.sparql_query_last_input.append(" " + kw_value)
+                        session.sparql_query = session.sparql_query + \
+                            session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('user_input')
                         self.logger.info(
-                            "%s - keyword added to sparql query", self.sparql_query_last_input[-1])
+                            "%s - keyword added to sparql query", session.sparql_query_last_input[-1])
                 elif input_id == "sparql-variables-dropdown":
                     if var_value is not None:
-                        self.sparql_query_last_input.append(" " + var_value)
-                        if 'COUNT ( ?[...] ) AS' in self.sparql_query:
-                            self.sparql_query = self.sparql_query.replace(
-                                ' ?[...]', self.sparql_query_last_input[-1])
+                        session.sparql_query_last_input.append(" " + var_value)
+                        if 'COUNT ( ?[...] ) AS' in session.sparql_query:
+                            session.sparql_query = session.sparql_query.replace(
+                                ' ?[...]', session.sparql_query_last_input[-1])
                         else:
-                            self.sparql_query = self.sparql_query + \
-                                self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
+                            session.sparql_query = session.sparql_query + \
+                                session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('user_input')
                         self.logger.info(
-                            "%s - variable added to sparql query", self.sparql_query_last_input[-1])
+                            "%s - variable added to sparql query", session.sparql_query_last_input[-1])
                 elif input_id == "sparql-syntax-dropdown":
                     if syn_value is not None:
-                        self.sparql_query_last_input.append(" " + syn_value)
-                        self.sparql_query = self.sparql_query + \
-                            self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
+                        session.sparql_query_last_input.append(" " + syn_value)
+                        session.sparql_query = session.sparql_query + \
+                            session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('user_input')
                         self.logger.info(
-                            "%s - syntax added to sparql query", self.sparql_query_last_input[-1])
+                            "%s - syntax added to sparql query", session.sparql_query_last_input[-1])
                 elif input_id == "add_to_query_button":
                     if n_add and value is not None:
-                        self.sparql_query_last_input.append(' ' + value)
-                        self.sparql_query = self.sparql_query + \
-                            self.sparql_query_last_input[-1]
-                        self.sparql_query_last_input_type.append('user_input')
+                        session.sparql_query_last_input.append(' ' + value)
+                        session.sparql_query = session.sparql_query + \
+                            session.sparql_query_last_input[-1]
+                        session.sparql_query_last_input_type.append('user_input')
                         self.logger.info(
-                            "user-text-input %s added to sparql query", self.sparql_query_last_input[-1])
+                            "user-text-input %s added to sparql query", session.sparql_query_last_input[-1])
                 elif input_id == "clear_query_button":
                     if n_clear:
-                        self.sparql_query_last_input = ['']
-                        self.sparql_query = ''
-                        self.sparql_query_last_input_type = ['']
+                        session.sparql_query_last_input = ['']
+                        session.sparql_query = ''
+                        session.sparql_query_last_input_type = ['']
                         self.logger.info("sparql query cleared by user")
-                        self.clear_selection_for_template_query()
+                        session.clear_selection_for_template_query()
                 elif input_id == "delete_query_button":
                     if n_delete:
-                        self.delete_last_user_input()
+                        session.delete_last_user_input()
                 elif input_id == "sparql_template_dropdown" and template_value:
                     query = open(
                         "sparql_query_viz/datasets/templates/" + template_value, "r")
-                    self.sparql_query_last_input.append(
+                    session.sparql_query_last_input.append(
                         "PREFIX : <" + self.onto.iri + "#>" + "\n" + "\n" + query.read())
-                    self.sparql_query = self.sparql_query_last_input[-1]
-                    self.clear_selection_for_template_query()
-                    self.selected_template = template_value
-                    self.sparql_query_last_input_type.append('user_input')
+                    session.sparql_query = session.sparql_query_last_input[-1]
+                    session.clear_selection_for_template_query()
+                    session.selected_template = template_value
+                    session.sparql_query_last_input_type.append('user_input')
                     self.logger.info(
-                        "standard-template: %s added to sparql query", self.sparql_query_last_input[-1])
+                        "standard-template: %s added to sparql query", session.sparql_query_last_input[-1])
                 elif input_id == "inconsistency_template_dropdown" and inconsistency_template_value:
                     query = open("sparql_query_viz/datasets/templates/" +
                                  inconsistency_template_value, "r")
-                    self.sparql_query_last_input.append(
+                    session.sparql_query_last_input.append(
                         "PREFIX : <" + self.onto.iri + "#>" + "\n" + "\n" + query.read())
-                    self.sparql_query = self.sparql_query_last_input[-1]
-                    self.clear_selection_for_template_query()
-                    self.selected_template = inconsistency_template_value
-                    self.sparql_query_last_input_type.append('user_input')
+                    session.sparql_query = session.sparql_query_last_input[-1]
+                    session.clear_selection_for_template_query()
+                    session.selected_template = inconsistency_template_value
+                    session.sparql_query_last_input_type.append('user_input')
                     self.logger.info("inconsistency-template: %s added to sparql query",
-                                     self.sparql_query_last_input[-1])
+                                     session.sparql_query_last_input[-1])
                 elif input_id == "sparql_library_dropdown" and library_value:
                     query = open(
                         "sparql_query_viz/datasets/queries/" + library_value, "r")
-                    self.sparql_query_last_input.append(
+                    session.sparql_query_last_input.append(
                         "PREFIX : <" + self.onto.iri + "#>" + "\n" + "\n" + query.read())
-                    self.sparql_query = self.sparql_query_last_input[-1]
-                    self.clear_selection_for_template_query()
-                    self.sparql_query_last_input_type.append('user_input')
+                    session.sparql_query = session.sparql_query_last_input[-1]
+                    session.clear_selection_for_template_query()
+                    session.sparql_query_last_input_type.append('user_input')
                     self.logger.info(
-                        "Inconsistency Check: %s added to sparql query", self.sparql_query_last_input[-1])
+                        "Inconsistency Check: %s added to sparql query", session.sparql_query_last_input[-1])
                 elif input_id == "graph" and selection != {'nodes': [], 'edges': []} and on_select:
                     self.complete_sparql_query_with_selection(
-                        selection, self.selected_template)
-            return self.sparql_query
-
-        # create callback to toggle hide/show sections - COLOR section
-        @app.callback(
-            Output("color-show-toggle", "is_open"),
-            [Input("color-show-toggle-button", "n_clicks")],
-            [State("color-show-toggle", "is_open")],
-        )
-        def toggle_filter_collapse(n, is_open):
-            if n:
-                if is_open:
-                    self.logger.info(
-                        "color section was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "color section was shown, triggered by user")
-                return not is_open
-            return is_open
-
-        # create callback to toggle hide/show sections - SIZE section
-        @app.callback(
-            Output("size-show-toggle", "is_open"),
-            [Input("size-show-toggle-button", "n_clicks")],
-            [State("size-show-toggle", "is_open")],
-        )
-        def toggle_filter_collapse(n, is_open):
-            if n:
-                if is_open:
-                    self.logger.info(
-                        "size section was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "size section was shown, triggered by user")
-                return not is_open
-            return is_open
-
-        # create callback to toggle hide/show sections - SPARQL TEMPLATE section
-        @app.callback(
-            Output("template-show-toggle", "is_open"),
-            [Input("template-show-toggle-button", "n_clicks")],
-            [State("template-show-toggle", "is_open")],
-        )
-        def toggle_template_collapse(n, is_open):
-            if n:
-                if is_open:
-                    self.logger.info(
-                        "template section was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "template section was shown, triggered by user")
-                return not is_open
-            return is_open
-
-        # create callback to toggle hide/show sections - SPARQL LIBRARY section
-        @app.callback(
-            Output("library-show-toggle", "is_open"),
-            [Input("library-show-toggle-button", "n_clicks")],
-            [State("library-show-toggle", "is_open")],
-        )
-        def toggle_library_collapse(n, is_open):
-            if n:
-                if is_open:
-                    self.logger.info(
-                        "library section was hidden, triggered by user")
-                else:
-                    self.logger.info(
-                        "library section was shown, triggered by user")
-                return not is_open
-            return is_open
-
-        # create callback to toggle hide/show sections - A-BOX DATA-PROPERTY section
-        @app.callback(
-            Output("abox-dp-show-toggle", "is_open"),
-            [Input("abox-dp-show-toggle-button", "n_clicks"),
-             Input('graph', 'selection'),
-             Input("add_node_edge_to_query_button", "on")],
-            [State("abox-dp-show-toggle", "is_open")],
-        )
-        def toggle_template_collapse(n, selection, on_select, is_open):
-            ctx = dash.callback_context
-            if not ctx.triggered:
-                self.logger.info("no trigger by user")
-                return is_open
-            else:
-                input_id = ctx.triggered[0]['prop_id'].split('.')[0]
-                if input_id == "abox-dp-show-toggle-button":
-                    if n:
-                        if is_open:
-                            self.logger.info(
-                                "A-Box Data Property section was hidden, triggered by user")
-                            return not is_open
-                        else:
-                            self.logger.info(
-                                "A-Box Data Property section was shown, triggered by user")
-                            return not is_open
-                if input_id == "graph":
-                    if on_select:
-                        return is_open
-                    elif len(selection['nodes']) > 0:
-                        for node in self.data['nodes']:
-                            if [node['id']] == selection['nodes']:
-                                if node['T/A'] == 'A':
-                                    self.logger.info(
-                                        "A-Box Data Property section was shown, triggered by user")
-                                    return True
-                                else:
-                                    self.logger.info(
-                                        "A-Box Data Property section was hidden, triggered by user")
-                                    return False
-                    elif (selection == {'nodes': [], 'edges': []}) or \
-                            (len(selection['nodes']) == 0 and len(selection['edges']) > 0):
-                        self.logger.info(
-                            "A-Box Data Property section was hidden, triggered by user")
-                        return False
-            return is_open
-
-        # create callback to toggle hide/show sections - SELECTED EDGE section
-        @app.callback(
-            Output("edge-selection-show-toggle", "is_open"),
-            [Input("edge-selection-show-toggle-button", "n_clicks"),
-             Input('graph', 'selection'),
-             Input("add_node_edge_to_query_button", "on")],
-            [State("edge-selection-show-toggle", "is_open")],
-        )
-        def toggle_template_collapse(n, selection, on_select, is_open):
-            ctx = dash.callback_context
-            if not ctx.triggered:
-                self.logger.info("no trigger by user")
-                return is_open
-            else:
-                input_id = ctx.triggered[0]['prop_id'].split('.')[0]
-                if input_id == "edge-selection-show-toggle-button":
-                    if n:
-                        if is_open:
-                            self.logger.info(
-                                "edge selection section was hidden, triggered by user")
-                            return not is_open
-                        else:
-                            self.logger.info(
-                                "edge selection section was shown, triggered by user")
-                            return not is_open
-                if input_id == "graph":
-                    if on_select:
-                        return is_open
-                    elif len(selection['edges']) > 0 and len(selection['nodes']) == 0:
-                        self.logger.info(
-                            "edge selection section was shown, triggered by user")
-                        return True
-                    elif (selection == {'nodes': [], 'edges': []}) or len(selection['nodes']) > 0:
-                        self.logger.info(
-                            "edge selection section was hidden, triggered by user")
-                        return False
-            return is_open
+                        session, selection, session.selected_template)
+            return session.sparql_query
 
         # create callback to display dp of selected A-Box
         @app.callback(
@@ -1174,108 +1632,179 @@ class SQV:
 #                              f":{scenario} :has_info_source ?source. \n"
 #                              "{ ?source ?connectedTo ?element } \n"
 #                              "} GROUP BY ?element")
-#                     self.sparql_query = PREFIXES + query
+#                     session.sparql_query = PREFIXES + query
 #                     graph_data, result, selection = self._callback_filter_nodes(
 #                         graph_data, 1)
 #                     return 'result'
 #                 return 'no'
 #         """ '''
 
-        # create the main callbacks
-        @app.callback(
-            [Output('graph', 'data'),
-             Output('color-legend-popup', 'children'),
-             Output('textarea-result-output', 'children'),
-             Output('sparql_query_history', 'children'),
-             Output('graph', 'selection')],
-            [Input('search_graph', 'value'),
-             Input('color_nodes', 'value'),
-             Input('color_edges', 'value'),
-             Input('size_nodes', 'value'),
-             Input('size_edges', 'value'),
-             Input('evaluate_query_button', 'n_clicks'),
-             Input('clear-query-history-button', 'n_clicks'),
-             Input('query-history-length-slider', 'value'),
-             Input("color-legend-toggle", "n_clicks"),
-             Input('result-level-slider', 'value'),
-             Input('select_button', 'n_clicks') , 
-             Input('scenario_select_dropdown', 'value'),
-             Input('terminology_select_dropdown', 'value')],
+        # create clientside callback to merge the patches sent by the server into the graph data
+        app.clientside_callback(
+            ClientsideFunction(namespace='sqv', function_name='apply_graph_patch'),
+            Output('graph', 'data'),
+            [Input(store_id, 'data') for store_id in GRAPH_PATCH_STORES],
             [State('graph', 'data')]
         )
-        def setting_pane_callback(search_text, color_nodes_value, color_edges_value,
-                                  size_nodes_value, size_edges_value, n_evaluate, n_clear, query_history_length,
-                                  n_legend, shown_result_level, n_select, scenario, terminology, graph_data):
-            # fetch the id of option which triggered
-            ctx = dash.callback_context
-            flat_res_list_children = self.sparql_query_result
-            sparql_query_history_children = []
-            selection = {'nodes': [], 'edges': []}
-            # if its the first call
-            if not ctx.triggered:
-                self.logger.info("no trigger by user")
-                return [self.data, get_color_popover_legend_children(),
-                        flat_res_list_children, sparql_query_history_children, selection]
-            else:
-                # find the id of the option which was triggered
-                input_id = ctx.triggered[0]['prop_id'].split('.')[0]
-                # perform operation in case of search graph option
-                if input_id == "search_graph":
-                    graph_data = _callback_search_graph(
-                        graph_data, search_text)
-                    self.logger.info(
-                        "shown graph data filtered, triggered by user")
-                # In case filter nodes was triggered
-                elif (input_id == 'evaluate_query_button' and n_evaluate) or (input_id == 'select_button' and n_select):
-                    if input_id == 'select_button':
-                        query = ("SELECT DISTINCT ?element \n"
-                             "WHERE { \n"
-                             f"?element a/rdfs:subClassOf* :{terminology}. \n"
-                             f":{scenario} :has_info_source ?source. \n"
-                             "{ ?source ?connectedTo ?element } \n"
-                             "} GROUP BY ?element")
-                        self.sparql_query = PREFIXES + query
-                    graph_data, flat_res_list_children, selection = self._callback_filter_nodes(graph_data,
-                                                                                                shown_result_level)
-                elif input_id == 'result-level-slider':
-                    graph_data['nodes'], selection['nodes'] = get_nodes_to_be_shown(self.data,
-                                                                                    self.sparql_query_result_list,
-                                                                                    shown_result_level)
-                if input_id == "clear-query-history-button" and n_clear:
-                    self.counter_query_history = 0
-                    self.sparql_query_history = ""
-                    self.logger.info(
-                        "query history was cleared, triggered by user")
-                # If color node text is provided
+
+        # create the callbacks of the settings, every callback only updates the outputs its inputs affect
+        # the initial values of the outputs are part of the layout
+        @app.callback(
+            Output('search-patch', 'data'),
+            [Input('search_graph', 'value')],
+            [State('session-id', 'data')],
+            prevent_initial_call=True
+        )
+        def search_graph_callback(search_text, session_id):
+            with self.session(session_id) as session:
+                old_graph_data = self.get_session_graph_data(session) if self.level_of_detail is not None else None
+                graph_patch, session.visible_node_ids = _callback_search_graph(
+                    search_text, self.search_index, session.shown_node_ids, session.visible_node_ids,
+                    self.fuzzy_search, self.fulltext_index)
+                # in the aggregated graph a cluster is hidden, if all its nodes are hidden
+                if self.level_of_detail is not None:
+                    graph_patch = get_graph_diff_patch(old_graph_data, self.get_session_graph_data(session))
+                self.logger.info("shown graph data filtered, triggered by user")
+                return self.get_session_patch(session, graph_patch)
+
+        @app.callback(
+            [Output('color-patch', 'data'),
+             Output('color-legend-popup', 'children')],
+            [Input('color_nodes', 'value'),
+             Input('color_edges', 'value')],
+            [State('session-id', 'data')],
+            prevent_initial_call=True
+        )
+        def color_callback(color_nodes_value, color_edges_value, session_id):
+            input_id = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+            with self.session(session_id) as session:
                 if input_id == 'color_nodes':
-                    graph_data, self.node_value_color_mapping = self._callback_color_nodes(
-                        color_nodes_value)
+                    graph_patch = self._callback_color_nodes(session, color_nodes_value)
                     self.logger.info("Nodes were recolored, triggered by user")
-                # If color edge text is provided
-                if input_id == 'color_edges':
-                    graph_data, self.edge_value_color_mapping = self._callback_color_edges(
-                        color_edges_value)
+                else:
+                    graph_patch = self._callback_color_edges(session, color_edges_value)
                     self.logger.info("Edges were recolored, triggered by user")
-                # If size node text is provided
+                color_popover_legend_children = self.get_color_legend(session.appearance['color_nodes'],
+                                                                      session.appearance['color_edges'])
+                self.logger.info("color legend was updated, triggered by user")
+                return [self.get_session_patch(session, graph_patch), color_popover_legend_children]
+
+        @app.callback(
+            Output('size-patch', 'data'),
+            [Input('size_nodes', 'value'),
+             Input('size_edges', 'value')],
+            [State('session-id', 'data')],
+            prevent_initial_call=True
+        )
+        def size_callback(size_nodes_value, size_edges_value, session_id):
+            input_id = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+            with self.session(session_id) as session:
                 if input_id == 'size_nodes':
-                    graph_data = self._callback_size_nodes(size_nodes_value)
+                    graph_patch = self._callback_size_nodes(session, size_nodes_value)
                     self.logger.info("Nodes were resized, triggered by user")
-                # If size edge text is provided
-                if input_id == 'size_edges':
-                    graph_data = self._callback_size_edges(size_edges_value)
+                else:
+                    graph_patch = self._callback_size_edges(session, size_edges_value)
                     self.logger.info("Edges were resized, triggered by user")
-            # create the color legend children
-            color_popover_legend_children = get_color_popover_legend_children(
-                self.node_value_color_mapping, self.edge_value_color_mapping)
-            self.logger.info("color legend was updated, triggered by user")
-            # update the sparql query history
-            sparql_query_history_children = self._callback_sparql_query_history(
-                query_history_length)
-            self.logger.info(
-                "query history is shown with a length of %i", query_history_length)
-            # finally return the modified data
-            return [graph_data, color_popover_legend_children, flat_res_list_children,
-                    sparql_query_history_children, selection]
+                return self.get_session_patch(session, graph_patch)
+
+        # create the callback that changes the shown nodes, either by a SPARQL query or by a selection in the graph
+        @app.callback(
+            [Output('nodes-patch', 'data'),
+             Output('textarea-result-output', 'children'),
+             Output('query-history-counter', 'data'),
+             Output('graph', 'selection')],
+            [Input('evaluate_query_button', 'n_clicks'),
+             Input('select_button', 'n_clicks'),
+             Input('result-level-slider', 'value'),
+             Input('graph', 'selection'),
+             Input('collapse-clusters', 'n_clicks')],
+            [State('scenario_select_dropdown', 'value'),
+             State('terminology_select_dropdown', 'value'),
+             State('add_node_edge_to_query_button', 'on'),
+             State('session-id', 'data')],
+            prevent_initial_call=True
+        )
+        def shown_nodes_callback(n_evaluate, n_select, shown_result_level, graph_selection, n_collapse,
+                                 scenario, terminology, on_select, session_id):
+            input_id = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+            if (input_id == 'evaluate_query_button' and not n_evaluate) or (input_id == 'select_button' and not n_select):
+                raise dash.exceptions.PreventUpdate
+            # a selection in the graph only expands collapsed clusters or the neighbourhood of a node in the
+            # exploration mode, other selections are left to the user
+            if input_id == 'graph' and ((self.level_of_detail is None and self.adjacency_index is None) or on_select
+                                        or not graph_selection or not graph_selection['nodes']):
+                raise dash.exceptions.PreventUpdate
+            if input_id == 'collapse-clusters' and \
+                    ((self.level_of_detail is None and self.adjacency_index is None) or not n_collapse):
+                raise dash.exceptions.PreventUpdate
+            result = dash.no_update
+            query_history_counter = dash.no_update
+            selection = dash.no_update
+            with self.session(session_id) as session:
+                if input_id == 'graph' and self.adjacency_index is not None:
+                    graph_patch = self._callback_explore_node(session, graph_selection['nodes'][0])
+                    if is_empty_patch(graph_patch):
+                        raise dash.exceptions.PreventUpdate
+                    self.logger.info("neighbourhood of %s was expanded, triggered by user",
+                                     graph_selection['nodes'][0])
+                elif input_id == 'graph':
+                    graph_patch = self._callback_expand_clusters(session, graph_selection['nodes'])
+                    if graph_patch is None:
+                        raise dash.exceptions.PreventUpdate
+                    selection = {'nodes': [], 'edges': []}
+                    self.logger.info("clusters were expanded, triggered by user")
+                elif input_id == 'collapse-clusters' and self.adjacency_index is not None:
+                    graph_patch = self._callback_reset_exploration(session)
+                    self.logger.info("exploration was reset to the focus node, triggered by user")
+                elif input_id == 'collapse-clusters':
+                    graph_patch = self._callback_collapse_clusters(session)
+                    self.logger.info("clusters were collapsed, triggered by user")
+                elif input_id == 'result-level-slider':
+                    selection = {'nodes': [], 'edges': []}
+                    shown_nodes, selection['nodes'] = get_nodes_to_be_shown(self.data,
+                                                                            session.sparql_query_result_list,
+                                                                            shown_result_level)
+                    graph_patch = self._callback_show_nodes(session, shown_nodes)
+                else:
+                    if input_id == 'select_button':
+                        query = ("SELECT DISTINCT ?element \n"
+                                 "WHERE { \n"
+                                 f"?element a/rdfs:subClassOf* :{terminology}. \n"
+                                 f":{scenario} :has_info_source ?source. \n"
+                                 "{ ?source ?connectedTo ?element } \n"
+                                 "} GROUP BY ?element")
+                        session.sparql_query = PREFIXES + query
+                    shown_nodes, result, selection = self._callback_filter_nodes(session, shown_result_level)
+                    graph_patch = self._callback_show_nodes(session, shown_nodes)
+                    # the query history is updated by its own callback
+                    query_history_counter = session.counter_query_history
+                return [self.get_session_patch(session, graph_patch), result, query_history_counter, selection]
+
+        # create the callback of the sparql query history
+        @app.callback(
+            Output('sparql_query_history', 'children'),
+            [Input('query-history-counter', 'data'),
+             Input('clear-query-history-button', 'n_clicks'),
+             Input('query-history-length-slider', 'value')],
+            [State('session-id', 'data')],
+            prevent_initial_call=True
+        )
+        def sparql_query_history_callback(query_history_counter, n_clear, query_history_length, session_id):
+            input_id = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+            if input_id == 'clear-query-history-button' and not n_clear:
+                raise dash.exceptions.PreventUpdate
+            with self.session(session_id) as session:
+                if input_id == 'clear-query-history-button':
+                    session.counter_query_history = 0
+                    session.sparql_query_history = ""
+                    self.logger.info("query history was cleared, triggered by user")
+                sparql_query_history_children = self._callback_sparql_query_history(session, query_history_length)
+                self.logger.info("query history is shown with a length of %i", query_history_length)
+                return sparql_query_history_children
+
+        # the ontology file is watched, as soon as the app can serve a reloaded graph
+        if self.watcher is not None:
+            self.watcher.start()
 
         return app
 
@@ -1299,3 +1828,16 @@ class SQV:
         app = self.create(directed=directed, vis_opts=vis_opts)
         # run the server
         app.run_server(debug=debug, host=host, port=port)
+
+    def close(self):
+        """ releases the resources of the ontology: stops watching the ontology file and closes the full-text index and
+        the owlready2 world, SQV can not serve requests afterwards
+        """
+        if self.watcher is not None:
+            self.watcher.stop(wait=True)
+        with self.model_lock.write():
+            if self.fulltext_index is not None:
+                self.fulltext_index.close()
+                self.fulltext_index = None
+            self.onto.onto_world.close()
+        self.logger.info("successfully closed ontology")
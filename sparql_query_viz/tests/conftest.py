@@ -0,0 +1,86 @@
+"""
+Fixtures shared by the tests of SPARQL-Query-Viz
+
+    python -m pytest sparql_query_viz/tests
+"""
+# imports
+import os
+import shutil
+import sys
+import pytest
+
+# CONSTANTS
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PIZZA_IRI = 'http://example.org/onto-ex.owl'
+PIZZA_PATH = os.path.join(REPO_DIR, 'sparql_query_viz', 'datasets', 'ontologies', 'pizza-onto.owl')
+
+# the tests import the package from the repository, also when pytest is not started from its root
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture
+def graph_data():
+    """ small network data in format of visdcc: two classes, three A-Boxes and a data property as edge label
+    """
+    nodes = [{'id': 'Pizza', 'label': 'Pizza', 'T/A': 'T'},
+             {'id': 'Topping', 'label': 'Topping', 'T/A': 'T'},
+             {'id': 'Margherita', 'label': 'pizza_margherita', 'T/A': 'A'},
+             {'id': 'Funghi', 'label': 'pizza_funghi', 'T/A': 'A'},
+             {'id': 'Mozzarella', 'label': 'mozzarella', 'T/A': 'A'}]
+    edges = [{'id': 'Margherita is_a Pizza', 'from': 'Margherita', 'to': 'Pizza', 'label': 'is_a'},
+             {'id': 'Funghi is_a Pizza', 'from': 'Funghi', 'to': 'Pizza', 'label': 'is_a'},
+             {'id': 'Mozzarella is_a Topping', 'from': 'Mozzarella', 'to': 'Topping', 'label': 'is_a'},
+             {'id': 'Margherita hasTopping Mozzarella', 'from': 'Margherita', 'to': 'Mozzarella',
+              'label': 'hasTopping'}]
+    return {'nodes': nodes, 'edges': edges}
+
+
+@pytest.fixture
+def pizza_path(tmp_path):
+    """ path to a copy of the pizza ontology, so that the cache files are written to the temporary directory
+    """
+    path = str(tmp_path / 'pizza-onto.owl')
+    shutil.copy(PIZZA_PATH, path)
+    yield path
+    # ontor adds the directory to the search path of owlready2, which would load the file of this test later on
+    from owlready2 import onto_path
+    if str(tmp_path) in onto_path:
+        onto_path.remove(str(tmp_path))
+
+
+@pytest.fixture
+def pizza_onto(pizza_path):
+    """ the pizza ontology loaded into its own owlready2 world
+    """
+    import ontor
+    onto = ontor.OntoEditor(PIZZA_IRI, pizza_path)
+    yield onto
+    onto.onto_world.close()
+
+
+@pytest.fixture
+def make_pizza_sqv(pizza_path):
+    """ returns a function that creates SPARQL-Query-Viz of the pizza ontology with the given options, whose graph is
+    colored and sized in its default appearance
+    """
+    from sparql_query_viz import SQV
+    created = []
+
+    def make_sqv(**options):
+        sqv = SQV(iri=PIZZA_IRI, path=pizza_path, **{'fulltext_search': False, **options})
+        sqv.layout_options = {'directed': True}
+        sqv.layout = sqv.build_layout(directed=True)
+        created.append(sqv)
+        return sqv
+
+    yield make_sqv
+    for sqv in created:
+        sqv.close()
+
+
+@pytest.fixture
+def pizza_sqv(make_pizza_sqv):
+    """ SPARQL-Query-Viz of the pizza ontology with the default options
+    """
+    return make_pizza_sqv()
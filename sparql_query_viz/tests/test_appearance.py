@@ -0,0 +1,35 @@
+"""
+Tests of the precomputed colors and sizes of the graph
+"""
+# imports
+import pandas as pd
+from sparql_query_viz.sparql_query_viz import DEFAULT_COLOR, get_feature_colors
+
+
+def test_feature_colors_map_equal_values_to_equal_colors():
+    frame = pd.DataFrame({'id': ['a', 'b', 'c'], 'T/A': ['T', 'A', 'T']})
+    colors, value_color_mapping = get_feature_colors(frame, 'T/A')
+    assert set(value_color_mapping) == {'T', 'A'}
+    assert colors == {'a': value_color_mapping['T'], 'b': value_color_mapping['A'], 'c': value_color_mapping['T']}
+    assert value_color_mapping['T'] != value_color_mapping['A']
+    assert get_feature_colors(frame, 'None') == ({'a': DEFAULT_COLOR, 'b': DEFAULT_COLOR, 'c': DEFAULT_COLOR}, {})
+
+
+def test_node_sizes_are_scaled_by_the_feature(pizza_sqv):
+    sizes = pizza_sqv.get_node_sizes('importance')
+    importance = {node['id']: node['importance'] for node in pizza_sqv.data['nodes']}
+    most_important = max(importance, key=importance.get)
+    least_important = min(importance, key=importance.get)
+    parsed_sizes = dict(zip(pizza_sqv.node_frame['id'], pizza_sqv.node_frame['size']))
+    assert sizes[most_important] == parsed_sizes[most_important] + 20
+    assert sizes[least_important] == parsed_sizes[least_important]
+    assert set(pizza_sqv.get_node_sizes('None').values()) == {pizza_sqv.get_node_sizes('None')['pizza']}
+
+
+def test_appearances_are_computed_once_per_feature(pizza_sqv):
+    pizza_sqv.appearance_cache = {}
+    pizza_sqv.precompute_appearances(['None'], ['None'], ['None', 'importance'], ['None', 'weight'])
+    assert len(pizza_sqv.appearance_cache) == 6
+    sizes = pizza_sqv.get_node_sizes('importance')
+    assert pizza_sqv.get_node_sizes('importance') is sizes
+    assert len(pizza_sqv.appearance_cache) == 6
@@ -0,0 +1,106 @@
+"""
+Tests of the narrow server callbacks, called through the HTTP interface of the dash app
+"""
+# imports
+import json
+import pytest
+
+# CONSTANTS
+PATCH_STORES = ('search-patch', 'color-patch', 'size-patch', 'nodes-patch')
+
+
+@pytest.fixture
+def pizza_app(pizza_sqv):
+    """ the app of the pizza ontology, a test client and the id of the session of a loaded page
+    """
+    app = pizza_sqv.create(directed=True)
+    client = app.server.test_client()
+    layout = json.loads(client.get('/_dash-layout').data)
+    session_id = next(child['props']['data'] for child in layout['props']['children']
+                      if child['props'].get('id') == 'session-id')
+    return app, client, session_id
+
+
+def call_callback(app, client, output: str, values: dict, changed: list):
+    """ calls the server callback of the output like the browser does and returns its response
+
+    :param output: output of the callback as in app.callback_map
+    :param values: maps 'id.property' of the inputs and states to their values, missing ones are None
+    :param changed: 'id.property' of the triggered inputs
+    """
+    callback = app.callback_map[output]
+
+    def get_values(dependencies):
+        return [{'id': d['id'], 'property': d['property'], 'value': values.get(d['id'] + '.' + d['property'])}
+                for d in dependencies]
+
+    if output.startswith('..'):
+        outputs = [dict(zip(('id', 'property'), key.split('.'))) for key in output.strip('.').split('...')]
+    else:
+        outputs = dict(zip(('id', 'property'), output.split('.')))
+    response = client.post('/_dash-update-component', json={
+        'output': output, 'outputs': outputs, 'inputs': get_values(callback['inputs']),
+        'state': get_values(callback['state']), 'changedPropIds': changed})
+    assert response.status_code == 200, response.data
+    return json.loads(response.data)['response']
+
+
+def test_patch_callbacks_do_not_run_on_page_load(pizza_app):
+    app, _, _ = pizza_app
+    for callback in app._callback_list:
+        if any(store + '.data' in callback['output'] for store in PATCH_STORES) or \
+                'sparql_query_history' in callback['output']:
+            assert callback['prevent_initial_call'], callback['output']
+
+
+def test_search_callback_only_updates_visibility(pizza_app, pizza_sqv):
+    app, client, session_id = pizza_app
+    response = call_callback(app, client, 'search-patch.data',
+                             {'search_graph.value': 'margherita', 'session-id.data': session_id},
+                             ['search_graph.value'])
+    patch = response['search-patch']['data']
+    assert not patch['nodes']['add'] and not patch['nodes']['remove']
+    assert all(set(update) == {'id', 'hidden'} for update in patch['nodes']['update'])
+    # all nodes were visible before, only the nodes that do not match are hidden
+    matches = pizza_sqv.search_index.search('margherita')
+    assert matches == {'margherita', 'margherita_company'}
+    assert {update['id'] for update in patch['nodes']['update'] if update['hidden']} == \
+        {node['id'] for node in pizza_sqv.data['nodes']} - matches
+    assert all(update['hidden'] for update in patch['nodes']['update'])
+
+
+def test_size_callback_only_updates_sizes(pizza_app, pizza_sqv):
+    app, client, session_id = pizza_app
+    response = call_callback(app, client, 'size-patch.data',
+                             {'size_nodes.value': 'None', 'size_edges.value': 'weight',
+                              'session-id.data': session_id}, ['size_nodes.value'])
+    patch = response['size-patch']['data']
+    assert patch['nodes']['update']
+    assert all(set(update) == {'id', 'size'} for update in patch['nodes']['update'])
+    with pizza_sqv.session(session_id) as session:
+        assert session.appearance['size_nodes'] == 'None'
+
+
+def test_color_legend_is_memoized(pizza_app, pizza_sqv):
+    app, client, session_id = pizza_app
+    output = '..color-patch.data...color-legend-popup.children..'
+    values = {'color_nodes.value': 'None', 'color_edges.value': 'None', 'session-id.data': session_id}
+    first = call_callback(app, client, output, values, ['color_nodes.value'])
+    second = call_callback(app, client, output, values, ['color_edges.value'])
+    assert first['color-legend-popup'] == second['color-legend-popup']
+    assert pizza_sqv.get_color_legend('None', 'None') is pizza_sqv.get_color_legend('None', 'None')
+
+
+def test_query_history_callback(pizza_app, pizza_sqv):
+    app, client, session_id = pizza_app
+    with pizza_sqv.session(session_id) as session:
+        session.sparql_query = 'SELECT ?pizza'
+        session.add_to_query_history()
+    values = {'query-history-counter.data': 1, 'query-history-length-slider.value': 5,
+              'session-id.data': session_id}
+    response = call_callback(app, client, 'sparql_query_history.children', values, ['query-history-counter.data'])
+    assert 'SELECT ?pizza' in json.dumps(response)
+    values['clear-query-history-button.n_clicks'] = 1
+    response = call_callback(app, client, 'sparql_query_history.children', values,
+                             ['clear-query-history-button.n_clicks'])
+    assert 'SELECT ?pizza' not in json.dumps(response)
@@ -0,0 +1,72 @@
+"""
+Tests of the clientside callbacks in assets/sqv_clientside.js, the functions are run with node.js, if it is installed
+"""
+# imports
+import copy
+import json
+import os
+import re
+import shutil
+import subprocess
+import pytest
+from sparql_query_viz.graph_patch import get_graph_diff_patch, get_reset_patch
+
+# CONSTANTS
+CLIENTSIDE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets',
+                               'sqv_clientside.js')
+# runs a function of the sqv namespace with the arguments and the triggered inputs read from stdin, the DataSets of the
+# network are not found, so that the patches are applied to the data of the network
+NODE_SCRIPT = """
+global.document = {getElementById: function () { return null; }};
+global.window = {dash_clientside: {no_update: null}};
+require(%s);
+var input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+window.dash_clientside.callback_context = {triggered: input.triggered};
+var result = window.dash_clientside.sqv[input.function].apply(null, input.args);
+process.stdout.write(JSON.stringify(result === undefined ? null : result));
+"""
+
+requires_node = pytest.mark.skipif(shutil.which('node') is None, reason="node.js is not installed")
+
+
+def run_clientside_function(function: str, args: list, triggered: list = None):
+    """ runs a function of the sqv namespace with node.js and returns its result
+    """
+    result = subprocess.run(['node', '-e', NODE_SCRIPT % json.dumps(CLIENTSIDE_PATH)], check=True,
+                            capture_output=True, text=True,
+                            input=json.dumps({'function': function, 'args': args, 'triggered': triggered or []}))
+    return json.loads(result.stdout)
+
+
+def test_clientside_functions_of_the_app_exist(pizza_sqv):
+    app = pizza_sqv.create(directed=True)
+    with open(CLIENTSIDE_PATH) as clientside_file:
+        defined_functions = set(re.findall(r'^ {8}(\w+): function', clientside_file.read(), re.MULTILINE))
+    used_functions = {callback['clientside_function']['function_name'] for callback in app._callback_list
+                      if callback.get('clientside_function')}
+    assert {'apply_graph_patch', 'toggle_open', 'toggle_query_section'} <= used_functions
+    assert used_functions <= defined_functions
+
+
+@requires_node
+def test_toggle_open():
+    assert run_clientside_function('toggle_open', [1, False]) is True
+    assert run_clientside_function('toggle_open', [None, False]) is False
+
+
+@requires_node
+def test_applied_patches_equal_new_graph(graph_data):
+    new_graph_data = copy.deepcopy(graph_data)
+    del new_graph_data['nodes'][1]
+    new_graph_data['nodes'][0]['hidden'] = True
+    new_graph_data['edges'].append({'id': 'Funghi hasTopping Mozzarella', 'from': 'Funghi', 'to': 'Mozzarella',
+                                    'label': 'hasTopping'})
+    patch = get_graph_diff_patch(graph_data, new_graph_data)
+    patched = run_clientside_function('apply_graph_patch', [patch, graph_data], [{'value': patch}])
+    assert sorted(patched['nodes'], key=lambda node: node['id']) == \
+        sorted(new_graph_data['nodes'], key=lambda node: node['id'])
+    assert sorted(patched['edges'], key=lambda edge: edge['id']) == \
+        sorted(new_graph_data['edges'], key=lambda edge: edge['id'])
+    # a reset patch replaces the data before its changes are applied
+    assert run_clientside_function('apply_graph_patch', [None, graph_data],
+                                   [{'value': get_reset_patch(new_graph_data)}]) == new_graph_data
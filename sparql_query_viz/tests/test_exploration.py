@@ -0,0 +1,53 @@
+"""
+Tests of the focus-and-context exploration mode
+"""
+# imports
+from collections import OrderedDict
+from sparql_query_viz.exploration import AdjacencyIndex, add_region, get_shown_node_ids
+
+
+def test_neighbourhood_is_returned_in_breadth_first_order(graph_data):
+    index = AdjacencyIndex(graph_data)
+    assert index.get_neighbourhood('Margherita') == ['Margherita', 'Pizza', 'Mozzarella']
+    assert index.get_neighbourhood('Margherita', hops=2) == ['Margherita', 'Pizza', 'Mozzarella', 'Funghi',
+                                                              'Topping']
+    assert index.get_neighbourhood('Margherita', hops=2, limit=2) == ['Margherita', 'Pizza']
+    assert index.get_neighbourhood('unknown') == []
+
+
+def test_edges_between_nodes(graph_data):
+    index = AdjacencyIndex(graph_data)
+    assert [edge['id'] for edge in index.get_edges({'Margherita', 'Pizza', 'Mozzarella'})] == \
+        ['Margherita is_a Pizza', 'Margherita hasTopping Mozzarella']
+    assert index.get_edges({'Pizza', 'Topping'}) == []
+
+
+def test_most_connected_node_is_the_default_focus(graph_data):
+    assert AdjacencyIndex(graph_data).get_most_connected_node() == 'Pizza'
+    assert AdjacencyIndex({'nodes': [], 'edges': []}).get_most_connected_node() is None
+
+
+def test_least_recently_expanded_regions_are_removed():
+    regions = OrderedDict()
+    assert add_region(regions, 'a', ['a', 'b'], max_visible_nodes=4) == {'a', 'b'}
+    assert add_region(regions, 'c', ['c', 'd'], max_visible_nodes=4) == {'a', 'b', 'c', 'd'}
+    # expanding a region again makes it the most recently expanded one
+    add_region(regions, 'a', ['a', 'b'], max_visible_nodes=4)
+    assert add_region(regions, 'e', ['e'], max_visible_nodes=4) == {'a', 'b', 'e'}
+    assert list(regions) == ['a', 'e']
+    assert get_shown_node_ids(regions) == {'a', 'b', 'e'}
+
+
+def test_explored_graph_equals_the_rendered_neighbourhoods(make_pizza_sqv):
+    sqv = make_pizza_sqv(exploration=True, focus_node='John')
+    session = sqv.create_session_state()
+    assert session.shown_node_ids == set(sqv.adjacency_index.get_neighbourhood('John'))
+    old_ids = {node['id'] for node in sqv.get_session_graph_data(session)['nodes']}
+    neighbour = next(node_id for node_id in session.shown_node_ids if node_id != 'John')
+    patch = sqv._callback_explore_node(session, neighbour)
+    new_ids = {node['id'] for node in sqv.get_session_graph_data(session)['nodes']}
+    assert new_ids == session.shown_node_ids == \
+        set(sqv.adjacency_index.get_neighbourhood('John') + sqv.adjacency_index.get_neighbourhood(neighbour))
+    assert {node['id'] for node in patch['nodes']['add']} == new_ids - old_ids
+    sqv._callback_reset_exploration(session)
+    assert {node['id'] for node in sqv.get_session_graph_data(session)['nodes']} == old_ids
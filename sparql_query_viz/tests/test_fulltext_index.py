@@ -0,0 +1,77 @@
+"""
+Tests of the full-text index over the A-Boxes
+"""
+# imports
+import os
+import pytest
+from owlready2 import destroy_entity
+from sparql_query_viz.datasets.fulltext_index import FullTextIndex, get_fts_query, get_fulltext_index
+
+# CONSTANTS
+PIZZA_IRI = 'http://example.org/onto-ex.owl'
+
+
+def get_iris(results: list):
+    """ returns the IRIs of the search results in their order
+    """
+    return [result['iri'] for result in results]
+
+
+def test_get_fts_query_searches_prefixes_of_words():
+    assert get_fts_query("jane's pizza") == '"jane"* "s"* "pizza"*'
+    assert get_fts_query(' -- ') == ''
+    assert get_fts_query(None) == ''
+
+
+def test_search_returns_iris_of_matching_aboxes(pizza_onto, tmp_path):
+    index = FullTextIndex(str(tmp_path / 'fts.sqlite'))
+    index.build(pizza_onto, 'hash')
+    # the name is weighted higher than the data-property values
+    assert get_iris(index.search('jane')) == [PIZZA_IRI + '#Jane', PIZZA_IRI + '#Her_pizza']
+    assert get_iris(index.search('JOH')) == [PIZZA_IRI + '#John']
+    assert get_iris(index.search('430')) == [PIZZA_IRI + '#Her_pizza']
+    assert index.search('weight_in_grams')[0]['snippet']
+    assert index.search('margherita') == []
+    assert index.search('') == []
+    index.close()
+
+
+def test_update_replaces_changed_aboxes(pizza_onto, tmp_path):
+    index = FullTextIndex(str(tmp_path / 'fts.sqlite'))
+    index.build(pizza_onto, 'hash')
+    with pizza_onto.onto:
+        new_pizza = pizza_onto.onto.pizza('Zebra_pizza')
+        new_pizza.comment = ['striped']
+    jane_iri = PIZZA_IRI + '#Jane'
+    destroy_entity(pizza_onto.onto_world[jane_iri])
+    index.update(pizza_onto, {new_pizza.iri, jane_iri}, 'new hash')
+    assert get_iris(index.search('striped')) == [new_pizza.iri]
+    assert get_iris(index.search('jane')) == [PIZZA_IRI + '#Her_pizza']
+    assert index.is_up_to_date('new hash')
+    assert not index.is_up_to_date('hash')
+    index.close()
+
+
+def test_copy_is_updated_independently_and_replaces_index(pizza_onto, tmp_path):
+    index = FullTextIndex(str(tmp_path / 'fts.sqlite'))
+    index.build(pizza_onto, 'hash')
+    with pizza_onto.onto:
+        new_pizza = pizza_onto.onto.pizza('Zebra_pizza')
+    copy = index.copy(str(tmp_path / 'fts.sqlite.reload'))
+    copy.update(pizza_onto, {new_pizza.iri}, 'new hash')
+    assert index.search('zebra') == []
+    index.replace(copy)
+    assert get_iris(index.search('zebra')) == [new_pizza.iri]
+    assert not os.path.exists(str(tmp_path / 'fts.sqlite.reload'))
+    index.close()
+
+
+def test_get_fulltext_index_is_only_rebuilt_if_the_file_changed(pizza_onto, pizza_path, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    index = get_fulltext_index(pizza_onto, pizza_path, cache_dir)
+    assert get_iris(index.search('john')) == [PIZZA_IRI + '#John']
+    index.close()
+    monkeypatch.setattr(FullTextIndex, 'build', lambda *args: pytest.fail("index was rebuilt"))
+    index = get_fulltext_index(pizza_onto, pizza_path, cache_dir)
+    assert get_iris(index.search('john')) == [PIZZA_IRI + '#John']
+    index.close()
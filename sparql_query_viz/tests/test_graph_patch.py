@@ -0,0 +1,90 @@
+"""
+Tests of the patches for the visdcc graph
+"""
+# imports
+import copy
+from sparql_query_viz.graph_patch import get_attribute_updates, get_empty_patch, get_graph_diff_patch, \
+    get_node_set_patch, get_reset_patch, get_visibility_updates, is_empty_patch
+from sparql_query_viz.sparql_query_viz import _callback_search_graph
+
+
+def apply_element_patch(elements: list, changes: dict):
+    """ merges the changes into the nodes or edges like applyElementPatch of assets/sqv_clientside.js
+    """
+    removed = set(changes['remove'])
+    updates = {}
+    for update in changes['update']:
+        updates.setdefault(update['id'], {}).update(update)
+    return [{**element, **updates.get(element['id'], {})} for element in elements
+            if element['id'] not in removed] + changes['add']
+
+
+def apply_patch(graph_data: dict, patch: dict):
+    """ merges the patch into the network data like the clientside function sqv.apply_graph_patch
+    """
+    graph_data = patch.get('data', graph_data)
+    return {'nodes': apply_element_patch(graph_data['nodes'], patch['nodes']),
+            'edges': apply_element_patch(graph_data['edges'], patch['edges'])}
+
+
+def by_id(graph_data: dict):
+    """ returns the nodes and edges by their ids, the browser does not depend on their order
+    """
+    return ({node['id']: node for node in graph_data['nodes']}, {edge['id']: edge for edge in graph_data['edges']})
+
+
+def test_empty_and_reset_patches(graph_data):
+    assert is_empty_patch(get_empty_patch())
+    assert not is_empty_patch(get_reset_patch(graph_data))
+    assert apply_patch({'nodes': [], 'edges': []}, get_reset_patch(graph_data)) == graph_data
+
+
+def test_applied_diff_patch_equals_new_graph(graph_data):
+    new_graph_data = copy.deepcopy(graph_data)
+    del new_graph_data['nodes'][3]
+    del new_graph_data['edges'][1]
+    new_graph_data['nodes'][0]['color'] = '#ff0000'
+    new_graph_data['nodes'].append({'id': 'Salami', 'label': 'salami', 'T/A': 'A'})
+    new_graph_data['edges'].append({'id': 'Salami is_a Topping', 'from': 'Salami', 'to': 'Topping', 'label': 'is_a'})
+    patch = get_graph_diff_patch(graph_data, new_graph_data)
+    assert by_id(apply_patch(graph_data, patch)) == by_id(new_graph_data)
+    assert patch['nodes']['remove'] == ['Funghi']
+    assert patch['nodes']['update'] == [{'id': 'Pizza', 'color': '#ff0000'}]
+
+
+def test_diff_patch_of_equal_graphs_is_empty(graph_data):
+    graph_data['nodes'][0]['size'] = float('nan')
+    assert is_empty_patch(get_graph_diff_patch(graph_data, copy.deepcopy(graph_data)))
+
+
+def test_attribute_updates_only_contain_changed_and_shown_elements():
+    values = {'a': 1, 'b': 2, 'c': 3}
+    assert get_attribute_updates(values, 'size', {'a': 1, 'b': 1, 'c': 1}) == [{'id': 'b', 'size': 2},
+                                                                               {'id': 'c', 'size': 3}]
+    assert get_attribute_updates(values, 'size', {'a': 1}, shown_ids={'a', 'c'}) == [{'id': 'c', 'size': 3}]
+
+
+def test_applied_visibility_and_node_set_patches(graph_data):
+    nodes = graph_data['nodes']
+    patch = get_empty_patch()
+    patch['nodes']['update'] = get_visibility_updates({'Pizza', 'Topping'}, {'Pizza', 'Funghi'})
+    hidden = {node['id']: node.get('hidden') for node in apply_patch(graph_data, patch)['nodes']}
+    assert hidden == {'Pizza': None, 'Topping': True, 'Margherita': None, 'Funghi': False, 'Mozzarella': None}
+    shown = {'nodes': [node for node in nodes if node['id'] in {'Pizza', 'Topping'}], 'edges': []}
+    patch = get_node_set_patch(nodes, {'Pizza', 'Topping'}, {'Pizza', 'Funghi'})
+    assert {node['id'] for node in apply_patch(shown, patch)['nodes']} == {'Pizza', 'Funghi'}
+
+
+def test_applied_callback_patches_equal_rendered_session_graph(pizza_sqv):
+    session = pizza_sqv.create_session_state()
+    shown_graph_data = pizza_sqv.get_session_graph_data(session)
+    patch = pizza_sqv._callback_size_nodes(session, 'None')
+    assert patch['nodes']['update']
+    shown_graph_data = apply_patch(shown_graph_data, patch)
+    assert by_id(shown_graph_data) == by_id(pizza_sqv.get_session_graph_data(session))
+    patch, session.visible_node_ids = _callback_search_graph('pizza', pizza_sqv.search_index, session.shown_node_ids,
+                                                             session.visible_node_ids)
+    shown_graph_data = apply_patch(shown_graph_data, patch)
+    assert by_id(shown_graph_data) == by_id(pizza_sqv.get_session_graph_data(session))
+    assert {node['id'] for node in shown_graph_data['nodes'] if not node['hidden']} == \
+        {'pizza', 'pizza_base', 'pizza_topping', 'vegetarian_pizza', 'pizza_company', 'His_pizza', 'Her_pizza'}
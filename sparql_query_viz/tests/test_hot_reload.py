@@ -0,0 +1,136 @@
+"""
+Tests of the hot reload of the ontology file
+"""
+# imports
+import threading
+import time
+import owlready2
+import pytest
+from sparql_query_viz import SQV
+from sparql_query_viz.hot_reload import ModelLock, OntologyWatcher, get_changed_iris, get_triple_diff
+
+# CONSTANTS
+PIZZA_IRI = 'http://example.org/onto-ex.owl'
+
+
+def edit_ontology_file(path: str, edit):
+    """ loads the ontology file into a new world, edits it and saves it again
+
+    :param edit: function that gets the ontology and changes it
+    """
+    world = owlready2.World()
+    onto = world.get_ontology('file://' + path).load()
+    with onto:
+        edit(onto)
+    onto.save(path)
+    world.close()
+
+
+def add_pizza(onto):
+    """ adds an A-Box with a comment and changes a data property of another A-Box
+    """
+    new_pizza = onto.pizza('Zebra_pizza')
+    new_pizza.comment = ['striped']
+    onto.Her_pizza.diameter_in_cm = 30
+
+
+def add_class(onto):
+    """ adds a T-Box
+    """
+    type('calzone', (onto.pizza,), {'namespace': onto})
+
+
+def normalize(graph_data: dict):
+    """ returns the nodes and edges by their ids, the order of the properties in the title of a node is not defined
+    """
+    return ({node['id']: {**node, 'title': sorted(node['title'].split(',\n '))} for node in graph_data['nodes']},
+            {edge['id']: edge for edge in graph_data['edges']})
+
+
+def test_triple_diff_contains_changed_triples(pizza_onto, pizza_path):
+    edit_ontology_file(pizza_path, add_pizza)
+    world = owlready2.World()
+    world.get_ontology('file://' + pizza_path).load()
+    added_triples, removed_triples = get_triple_diff(pizza_onto.onto_world, world)
+    assert (PIZZA_IRI + '#Zebra_pizza', owlready2.comment.iri, 'striped',
+            'http://www.w3.org/2001/XMLSchema#string') in added_triples
+    assert [triple[:3] for triple in removed_triples] == [(PIZZA_IRI + '#Her_pizza', PIZZA_IRI + '#diameter_in_cm',
+                                                           '32')]
+    assert get_changed_iris(added_triples + removed_triples) == {
+        PIZZA_IRI + '#Zebra_pizza', PIZZA_IRI + '#Her_pizza', PIZZA_IRI + '#pizza',
+        'http://www.w3.org/2002/07/owl#NamedIndividual'}
+    assert get_triple_diff(world, world) == ([], [])
+    world.close()
+
+
+def test_patched_graph_equals_parsed_graph(make_pizza_sqv, pizza_path, monkeypatch):
+    sqv = make_pizza_sqv(fulltext_search=True)
+    session_id = 'session'
+    sqv.sessions.create(session_id)
+    edit_ontology_file(pizza_path, add_pizza)
+    # only the changed A-Boxes are parsed
+    parse_graph = SQV.parse_graph
+    monkeypatch.setattr(SQV, 'parse_graph', lambda *args: pytest.fail("ontology was parsed again"))
+    assert sqv.reload_ontology()
+    monkeypatch.setattr(SQV, 'parse_graph', parse_graph)
+    assert sqv.model_version == 1
+    parsed = make_pizza_sqv()
+    assert normalize(sqv.data) == normalize(parsed.data)
+    assert sqv.search_index.search('zebra') == {'Zebra_pizza'}
+    assert [hit['name'] for hit in sqv.search_aboxes('striped')] == ['Zebra_pizza']
+    with sqv.session(session_id) as session:
+        assert session.model_version == 1
+        assert 'Zebra_pizza' in session.shown_node_ids
+        assert session.needs_graph_reset
+    # the file is unchanged since the last reload
+    assert not sqv.reload_ontology()
+
+
+def test_changed_tboxes_are_parsed_again(make_pizza_sqv, pizza_path):
+    sqv = make_pizza_sqv()
+    edit_ontology_file(pizza_path, add_class)
+    assert sqv.reload_ontology()
+    assert 'calzone' in {node['id'] for node in sqv.data['nodes']}
+    assert normalize(sqv.data) == normalize(make_pizza_sqv().data)
+
+
+def test_unchanged_triples_keep_the_graph(make_pizza_sqv, pizza_path):
+    sqv = make_pizza_sqv()
+    data = sqv.data
+    edit_ontology_file(pizza_path, lambda onto: None)
+    assert not sqv.reload_ontology()
+    assert sqv.data is data
+    assert sqv.model_version == 0
+
+
+def test_writer_waits_for_readers():
+    lock = ModelLock()
+    events = []
+
+    def write():
+        with lock.write():
+            events.append('write')
+
+    writer = threading.Thread(target=write)
+    with lock.read():
+        with lock.read():
+            events.append('nested read')
+        writer.start()
+        time.sleep(0.05)
+        events.append('read finished')
+    writer.join()
+    assert events == ['nested read', 'read finished', 'write']
+
+
+def test_watcher_reports_a_change_once(pizza_path):
+    changes = []
+    watcher = OntologyWatcher(pizza_path, lambda: changes.append(time.monotonic()), interval=0.05)
+    watcher.start()
+    with open(pizza_path, 'a') as onto_file:
+        onto_file.write('\n')
+    deadline = time.monotonic() + 5
+    while not changes and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    watcher.stop(wait=True)
+    assert len(changes) == 1
@@ -0,0 +1,28 @@
+"""
+Tests of the lazy imports of SPARQL-Query-Viz and of check_import_time.py
+"""
+# imports
+import subprocess
+import sys
+from check_import_time import DEFERRED_IMPORTS, ROOT_DIR, get_import_statement, measure_import_time
+
+
+def test_import_statement_of_attribute():
+    assert get_import_statement('sparql_query_viz:SQV') == 'from sparql_query_viz import SQV'
+    assert get_import_statement('sparql_query_viz.session') == 'import sparql_query_viz.session'
+
+
+def test_optional_features_are_not_imported_with_the_package():
+    deferred_modules = DEFERRED_IMPORTS['sparql_query_viz:SQV']
+    process = subprocess.run([sys.executable, '-c', 'import sys; from sparql_query_viz import SQV; '
+                              'print(" ".join(name for name in %r if name in sys.modules))' % deferred_modules],
+                             cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    assert process.stdout.split() == []
+
+
+def test_measured_rows_end_with_the_module():
+    rows = measure_import_time('sparql_query_viz:SQV', ROOT_DIR, repeat=1)
+    assert rows[-1][2].strip() == 'sparql_query_viz:SQV'
+    assert rows[-1][1] >= max(row[1] for row in rows[:-1])
+    # the imports of the attribute are reported, although importlib hides the row of its own module
+    assert 'sparql_query_viz.layout' in {name.strip() for _, _, name in rows}
@@ -0,0 +1,70 @@
+"""
+Tests of the level-of-detail aggregation of large graphs
+"""
+# imports
+import pytest
+from sparql_query_viz.level_of_detail import CLUSTER_ID_PREFIX, SUMMARY_EDGE_ID_PREFIX, LevelOfDetail, \
+    get_class_clusters, get_community_clusters
+
+# CONSTANTS
+PIZZA_CLUSTER = CLUSTER_ID_PREFIX + 'Pizza'
+
+
+def test_class_clusters_group_aboxes_by_class(graph_data):
+    assert get_class_clusters(graph_data) == {'Pizza': ['Margherita', 'Funghi'], 'Topping': ['Mozzarella']}
+
+
+def test_community_clusters_cover_all_nodes(graph_data):
+    clusters = get_community_clusters(graph_data)
+    assert sorted(node_id for members in clusters.values() for node_id in members) == \
+        sorted(node['id'] for node in graph_data['nodes'])
+
+
+def test_aggregate_replaces_clusters_and_summarizes_their_edges(graph_data):
+    level_of_detail = LevelOfDetail(graph_data)
+    # clusters with a single member are not aggregated
+    assert level_of_detail.clusters == {PIZZA_CLUSTER: ['Margherita', 'Funghi']}
+    aggregated = level_of_detail.aggregate(graph_data)
+    nodes = {node['id']: node for node in aggregated['nodes']}
+    assert set(nodes) == {'Pizza', 'Topping', 'Mozzarella', PIZZA_CLUSTER}
+    assert nodes[PIZZA_CLUSTER]['label'] == 'Pizza (2)'
+    edges = {edge['id']: edge for edge in aggregated['edges']}
+    assert set(edges) == {'Mozzarella is_a Topping', SUMMARY_EDGE_ID_PREFIX + PIZZA_CLUSTER + ' -> Pizza',
+                          SUMMARY_EDGE_ID_PREFIX + PIZZA_CLUSTER + ' -> Mozzarella'}
+    assert edges[SUMMARY_EDGE_ID_PREFIX + PIZZA_CLUSTER + ' -> Pizza']['weight'] == 2
+    assert edges[SUMMARY_EDGE_ID_PREFIX + PIZZA_CLUSTER + ' -> Mozzarella']['label'] == 'hasTopping'
+
+
+def test_expanded_clusters_show_the_original_graph(graph_data):
+    level_of_detail = LevelOfDetail(graph_data)
+    assert level_of_detail.aggregate(graph_data, {PIZZA_CLUSTER}) == graph_data
+
+
+def test_cluster_is_hidden_if_all_members_are_hidden(graph_data):
+    level_of_detail = LevelOfDetail(graph_data)
+    for node in graph_data['nodes']:
+        node['hidden'] = node['id'] in ('Margherita', 'Funghi')
+    nodes = {node['id']: node for node in level_of_detail.aggregate(graph_data)['nodes']}
+    assert nodes[PIZZA_CLUSTER]['hidden']
+    graph_data['nodes'][3]['hidden'] = False
+    nodes = {node['id']: node for node in level_of_detail.aggregate(graph_data)['nodes']}
+    assert not nodes[PIZZA_CLUSTER]['hidden']
+
+
+def test_unknown_method_is_rejected(graph_data):
+    with pytest.raises(ValueError):
+        LevelOfDetail(graph_data, 'unknown')
+
+
+def test_expanding_all_clusters_of_the_app_shows_the_whole_graph(make_pizza_sqv):
+    sqv = make_pizza_sqv(lod_threshold=5, lod_method='community')
+    session = sqv.create_session_state()
+    graph_data = sqv.get_session_graph_data(session)
+    cluster_ids = [node['id'] for node in graph_data['nodes'] if sqv.level_of_detail.is_cluster(node['id'])]
+    assert cluster_ids
+    assert len(graph_data['nodes']) < len(sqv.data['nodes'])
+    assert sqv._callback_expand_clusters(session, cluster_ids)['nodes']['add']
+    assert {node['id'] for node in sqv.get_session_graph_data(session)['nodes']} == \
+        {node['id'] for node in sqv.data['nodes']}
+    sqv._callback_collapse_clusters(session)
+    assert sqv.get_session_graph_data(session) == graph_data
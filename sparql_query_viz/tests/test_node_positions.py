@@ -0,0 +1,44 @@
+"""
+Tests of the node positions computed on the server
+"""
+# imports
+import pytest
+from sparql_query_viz import node_positions
+from sparql_query_viz.node_positions import ROW_SPACING, get_graph_hash, get_hierarchical_positions, \
+    get_node_positions
+
+
+def test_hierarchical_positions_place_classes_above_instances(graph_data):
+    positions = get_hierarchical_positions(graph_data)
+    assert set(positions) == {node['id'] for node in graph_data['nodes']}
+    assert positions['Pizza'][1] == positions['Topping'][1] == 0
+    # Mozzarella is placed in the layer of the A-Boxes, although it is the topping of another A-Box
+    assert positions['Margherita'][1] == positions['Funghi'][1] == positions['Mozzarella'][1] == ROW_SPACING
+    assert len(set(positions.values())) == len(positions)
+
+
+def test_graph_hash_ignores_order_and_attributes(graph_data):
+    graph_hash = get_graph_hash(graph_data)
+    graph_data['nodes'].reverse()
+    graph_data['nodes'][0]['color'] = '#ff0000'
+    assert get_graph_hash(graph_data) == graph_hash
+    graph_data['edges'].pop()
+    assert get_graph_hash(graph_data) != graph_hash
+
+
+def test_positions_are_cached_until_the_graph_changes(graph_data, tmp_path, monkeypatch):
+    onto_path = str(tmp_path / 'onto.owl')
+    positions = get_node_positions(graph_data, 'spring', onto_path)
+    computed = []
+    monkeypatch.setattr(node_positions, 'compute_node_positions',
+                        lambda graph_data, method: computed.append(method) or {})
+    assert get_node_positions(graph_data, 'spring', onto_path) == positions
+    assert computed == []
+    graph_data['nodes'].pop()
+    get_node_positions(graph_data, 'spring', onto_path)
+    assert computed == ['spring']
+
+
+def test_unknown_layout_is_rejected(graph_data):
+    with pytest.raises(ValueError):
+        get_node_positions(graph_data, 'circular')
@@ -0,0 +1,61 @@
+"""
+Tests of the persistent owlready2 quadstore of an ontology
+"""
+# imports
+import sqlite3
+import pytest
+from sparql_query_viz.datasets import quadstore
+from sparql_query_viz.datasets.quadstore import QuadstoreOntoEditor, get_quadstore_info, open_quadstore
+from sparql_query_viz.hot_reload import get_sorted_triples, is_blank
+
+# CONSTANTS
+PIZZA_IRI = 'http://example.org/onto-ex.owl'
+
+
+def get_triples(world):
+    """ returns the sorted triples of a world, the ids of the blank nodes depend on the world and are removed
+    """
+    return sorted(tuple('_:' if is_blank(term) else term for term in triple) for triple in get_sorted_triples(world))
+
+
+def test_quadstore_contains_the_triples_of_the_ontology_file(pizza_onto, pizza_path, tmp_path):
+    world, onto = open_quadstore(pizza_path, str(tmp_path / 'pizza.sqlite3'))
+    assert onto.base_iri == PIZZA_IRI + '#'
+    assert get_triples(world) == get_triples(pizza_onto.onto_world)
+    assert get_quadstore_info(str(tmp_path / 'pizza.sqlite3'))['base_iri'] == PIZZA_IRI + '#'
+    world.close()
+
+
+def test_quadstore_is_only_built_if_the_file_changed(pizza_path, tmp_path, monkeypatch):
+    quadstore_path = str(tmp_path / 'pizza.sqlite3')
+    world, _ = open_quadstore(pizza_path, quadstore_path)
+    world.close()
+    built = []
+    build_quadstore = quadstore.build_quadstore
+    monkeypatch.setattr(quadstore, 'build_quadstore', lambda *args: built.append(args) or build_quadstore(*args))
+    world, _ = open_quadstore(pizza_path, quadstore_path)
+    world.close()
+    assert built == []
+    with open(pizza_path, 'a') as onto_file:
+        onto_file.write('\n')
+    world, _ = open_quadstore(pizza_path, quadstore_path)
+    world.close()
+    assert len(built) == 1
+
+
+def test_quadstore_is_opened_read_only(pizza_path, tmp_path):
+    editor = QuadstoreOntoEditor(PIZZA_IRI, pizza_path, str(tmp_path / 'pizza.sqlite3'))
+    assert {ins.name for ins in editor.onto.individuals()} == {'John', 'Jane', 'His_pizza', 'Her_pizza'}
+    with pytest.raises(sqlite3.OperationalError):
+        with editor.onto:
+            editor.onto.pizza('Read_only_pizza')
+    editor.onto_world.close()
+
+
+def test_graph_of_quadstore_equals_graph_of_ontology_file(make_pizza_sqv, tmp_path):
+    parsed = make_pizza_sqv()
+    stored = make_pizza_sqv(quadstore_path=str(tmp_path / 'pizza.sqlite3'))
+    assert type(stored.onto) is QuadstoreOntoEditor
+    assert stored.node_df.sort_values('id').reset_index(drop=True).drop(columns='title').equals(
+        parsed.node_df.sort_values('id').reset_index(drop=True).drop(columns='title'))
+    assert {edge['id'] for edge in stored.data['edges']} == {edge['id'] for edge in parsed.data['edges']}
@@ -0,0 +1,88 @@
+"""
+Tests of the hosting of several ontologies by one server
+"""
+# imports
+import json
+import shutil
+import pytest
+from werkzeug.test import Client, EnvironBuilder, run_wsgi_app
+from sparql_query_viz import OntologyRegistry
+
+# CONSTANTS
+PIZZA_IRI = 'http://example.org/onto-ex.owl'
+
+
+@pytest.fixture
+def registry(pizza_path, tmp_path):
+    """ registry of two copies of the pizza ontology, whose budget only allows to keep one of them loaded
+    """
+    other_path = str(tmp_path / 'other-pizza-onto.owl')
+    shutil.copy(pizza_path, other_path)
+    registry = OntologyRegistry({'pizza': {'iri': PIZZA_IRI, 'path': pizza_path},
+                                 'other': {'iri': PIZZA_IRI, 'path': other_path}}, memory_budget=1)
+    yield registry
+    for ontology in registry.ontologies.values():
+        if ontology.sqv is not None:
+            ontology.sqv.close()
+
+
+def get(registry, path: str):
+    """ requests a path from the registry and closes the response
+    """
+    response = Client(registry).get(path)
+    response.get_data()
+    response.close()
+    return response
+
+
+def test_requests_are_dispatched_to_the_ontologies(registry):
+    assert get(registry, '/').headers['Location'].endswith('/pizza/')
+    assert get(registry, '/other').headers['Location'].endswith('/other/')
+    assert get(registry, '/unknown/').status_code == 404
+    assert all(ontology.app is None for ontology in registry.ontologies.values())
+    response = get(registry, '/pizza/_dash-layout')
+    assert response.status_code == 200
+    # the layout links to the other ontology
+    assert '"/other/"' in json.dumps(json.loads(response.data))
+    assert registry.ontologies['pizza'].app is not None
+    assert registry.ontologies['other'].app is None
+    assert get(registry, '/pizza/assets/sqv_clientside.js').status_code == 200
+
+
+def test_idle_ontologies_are_evicted_and_closed(registry):
+    get(registry, '/pizza/_dash-layout')
+    sqv = registry.ontologies['pizza'].sqv
+    assert sqv.fulltext_index is not None
+    get(registry, '/other/_dash-layout')
+    assert registry.ontologies['pizza'].app is None
+    assert registry.ontologies['other'].app is not None
+    assert sqv.fulltext_index is None
+    # the evicted ontology is loaded again on its next access
+    assert json.loads(get(registry, '/pizza/_dash-layout').data)
+    assert registry.ontologies['pizza'].app is not None
+    assert registry.ontologies['other'].app is None
+
+
+def test_ontologies_serving_a_request_are_not_evicted(registry):
+    registry.acquire('pizza')
+    get(registry, '/other/_dash-layout')
+    registry.release('pizza')
+    assert registry.ontologies['pizza'].app is not None
+    assert registry.ontologies['other'].app is not None
+    # the ontologies are only evicted when another ontology is loaded
+    get(registry, '/other/_dash-layout')
+    assert registry.ontologies['pizza'].app is not None
+
+
+def test_streamed_response_is_served_until_it_is_closed(registry):
+    app_iter, status, _ = run_wsgi_app(registry, EnvironBuilder(path='/pizza/_dash-layout').get_environ())
+    assert status.startswith('200')
+    assert registry.ontologies['pizza'].active_requests == 1
+    b''.join(app_iter)
+    app_iter.close()
+    assert registry.ontologies['pizza'].active_requests == 0
+
+
+def test_registry_needs_an_ontology():
+    with pytest.raises(ValueError):
+        OntologyRegistry({})
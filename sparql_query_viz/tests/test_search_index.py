@@ -0,0 +1,62 @@
+"""
+Tests of the n-gram search index of the graph search box
+"""
+# imports
+from sparql_query_viz.search_index import SearchIndex, get_ngrams, get_substring_edit_distance
+
+
+def test_get_ngrams_returns_distinct_grams_in_order():
+    assert get_ngrams('abab', 2) == ['ab', 'ba']
+    assert get_ngrams('ab', 3) == []
+
+
+def test_get_substring_edit_distance():
+    assert get_substring_edit_distance('rita', 'pizza_margherita') == 0
+    assert get_substring_edit_distance('margerita', 'pizza_margherita') == 1
+    assert get_substring_edit_distance('xyz', 'abc') == 3
+
+
+def test_search_matches_ids_and_labels(graph_data):
+    index = SearchIndex(graph_data)
+    assert index.search('margherita') == {'Margherita'}
+    # the search ignores the case and matches the label as well as the id
+    assert index.search('PIZZA_') == {'Margherita', 'Funghi'}
+    assert index.search('funghi') == {'Funghi'}
+
+
+def test_search_short_queries_use_posting_lists(graph_data):
+    index = SearchIndex(graph_data)
+    assert index.search('z') == {'Pizza', 'Margherita', 'Funghi', 'Mozzarella'}
+    assert index.search('ghi') == {'Funghi'}
+
+
+def test_search_requires_grams_in_order():
+    index = SearchIndex({'nodes': [{'id': 'abcxbcd'}], 'edges': []})
+    assert index.search('abcd') == set()
+    assert index.search('xbcd') == {'abcxbcd'}
+
+
+def test_search_edge_labels_match_both_nodes(graph_data):
+    index = SearchIndex(graph_data)
+    assert index.search('hastopping') == {'Margherita', 'Mozzarella'}
+
+
+def test_empty_search_matches_all_nodes(graph_data):
+    index = SearchIndex(graph_data)
+    assert index.search('') == {node['id'] for node in graph_data['nodes']}
+    assert index.search(None) == {node['id'] for node in graph_data['nodes']}
+
+
+def test_fuzzy_search_tolerates_typos(graph_data):
+    index = SearchIndex(graph_data)
+    assert index.search('margerita') == set()
+    assert index.search('margerita', fuzzy=True) == {'Margherita'}
+    # one missing and one additional letter
+    assert index.search('margerrita', fuzzy=True) == set()
+    assert index.search('margerrita', fuzzy=True, max_typos=2) == {'Margherita'}
+
+
+def test_fuzzy_search_prefers_exact_matches():
+    index = SearchIndex({'nodes': [{'id': 'porcini'}, {'id': 'porcino'}], 'edges': []})
+    assert index.search('porcino', fuzzy=True) == {'porcino'}
+    assert index.search('porcina', fuzzy=True) == {'porcini', 'porcino'}
@@ -0,0 +1,83 @@
+"""
+Tests of the per-session state and the session store
+"""
+# imports
+import time
+from sparql_query_viz.session import SessionState, SessionStore
+
+
+def test_state_is_kept_between_requests_of_a_session():
+    store = SessionStore(SessionState)
+    store.create('a')
+    with store.session('a') as state:
+        state.sparql_query = 'SELECT ?x'
+        state.add_to_query_history()
+    with store.session('a') as state:
+        assert state.sparql_query == 'SELECT ?x'
+        assert state.sparql_query_history == '1: SELECT ?x\n'
+        assert not state.needs_graph_reset
+    with store.session('b') as state:
+        assert state.sparql_query == ''
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = SessionStore(SessionState, max_sessions=2)
+    for session_id in ('a', 'b', 'c'):
+        store.create(session_id)
+        with store.session(session_id) as state:
+            state.sparql_query = session_id
+    assert len(store) == 2
+    assert 'a' not in store._locks
+    with store.session('c') as state:
+        assert state.sparql_query == 'c'
+    # the evicted session is recreated and the browser has to reset its graph
+    with store.session('a') as state:
+        assert state.sparql_query == ''
+        assert state.needs_graph_reset
+
+
+def test_unused_sessions_expire():
+    store = SessionStore(SessionState, ttl=0.05)
+    store.create('a')
+    time.sleep(0.1)
+    store.create('b')
+    assert len(store) == 1
+    with store.session('a') as state:
+        assert state.needs_graph_reset
+
+
+def test_shared_file_serves_sessions_to_several_stores(tmp_path):
+    path = str(tmp_path / 'sessions.sqlite')
+    first_store = SessionStore(SessionState, path=path)
+    second_store = SessionStore(SessionState, path=path)
+    first_store.create('a')
+    with first_store.session('a') as state:
+        state.sparql_query = 'first'
+    with second_store.session('a') as state:
+        assert state.sparql_query == 'first'
+        state.sparql_query = 'second'
+    with first_store.session('a') as state:
+        assert state.sparql_query == 'second'
+
+
+def test_conflicting_changes_of_another_store_are_discarded(tmp_path):
+    path = str(tmp_path / 'sessions.sqlite')
+    first_store = SessionStore(SessionState, path=path)
+    second_store = SessionStore(SessionState, path=path)
+    first_store.create('a')
+    with first_store.session('a') as first_state:
+        with second_store.session('a') as second_state:
+            second_state.sparql_query = 'second'
+        first_state.sparql_query = 'first'
+    with first_store.session('a') as state:
+        assert state.sparql_query == 'second'
+
+
+def test_delete_last_user_input():
+    state = SessionState()
+    state.sparql_query = 'SELECT ?x WHERE {'
+    state.sparql_query_last_input.append('WHERE {')
+    state.sparql_query_last_input_type.append('user_input')
+    state.delete_last_user_input()
+    assert state.sparql_query == 'SELECT ?x '
+    assert state.sparql_query_last_input == ['']
@@ -0,0 +1,64 @@
+"""
+Tests of the warm-start snapshot of SQV
+"""
+# imports
+import json
+import dash_bootstrap_components as dbc
+import plotly
+import pytest
+from dash import html
+from sparql_query_viz import SQV
+from sparql_query_viz.snapshot import get_snapshot_key, load_snapshot, save_snapshot
+
+# CONSTANTS
+PIZZA_IRI = 'http://example.org/onto-ex.owl'
+
+
+def to_json(value):
+    """ serializes a value with Dash components like Dash does
+    """
+    return json.dumps(value, cls=plotly.utils.PlotlyJSONEncoder, sort_keys=True)
+
+
+def test_snapshot_round_trip_restores_components(pizza_path, tmp_path):
+    layout = dbc.Container([html.Div('pizza', id='title'), dbc.Button('Show', id='button', n_clicks=0)])
+    state = {'layout': layout, 'data': {'nodes': [{'id': 'pizza'}], 'edges': []}}
+    save_snapshot(pizza_path, 'key', state, str(tmp_path))
+    restored = load_snapshot(pizza_path, 'key', str(tmp_path))
+    assert restored['data'] == state['data']
+    assert isinstance(restored['layout'], dbc.Container)
+    assert to_json(restored['layout']) == to_json(layout)
+
+
+def test_snapshot_with_another_key_is_not_restored(pizza_path, tmp_path):
+    assert load_snapshot(pizza_path, 'key', str(tmp_path)) is None
+    save_snapshot(pizza_path, 'key', {'data': 1}, str(tmp_path))
+    assert load_snapshot(pizza_path, 'other key', str(tmp_path)) is None
+
+
+def test_snapshot_key_changes_with_ontology_and_options(pizza_path):
+    key = get_snapshot_key(pizza_path, {'abox': True})
+    assert get_snapshot_key(pizza_path, {'abox': True}) == key
+    assert get_snapshot_key(pizza_path, {'abox': False}) != key
+    with open(pizza_path, 'a') as onto_file:
+        onto_file.write('\n')
+    assert get_snapshot_key(pizza_path, {'abox': True}) != key
+
+
+def test_restored_app_equals_the_built_app(pizza_path, monkeypatch):
+    built = SQV(iri=PIZZA_IRI, path=pizza_path, fulltext_search=False, snapshot=True)
+    built_app = built.create(directed=True)
+    # the restored SQV neither parses the ontology nor builds the layout
+    monkeypatch.setattr(SQV, 'parse_graph', lambda *args: pytest.fail("ontology was parsed"))
+    monkeypatch.setattr(SQV, 'build_layout', lambda *args, **kwargs: pytest.fail("layout was built"))
+    restored = SQV(iri=PIZZA_IRI, path=pizza_path, fulltext_search=False, snapshot=True)
+    restored_app = restored.create(directed=True)
+    assert restored.data == built.data
+    assert restored.node_df.equals(built.node_df)
+    assert restored.edge_df.equals(built.edge_df)
+    assert restored.search_index.search('pizza') == built.search_index.search('pizza')
+    assert restored.get_node_sizes('importance') == built.get_node_sizes('importance')
+    assert to_json(restored.layout) == to_json(built.layout)
+    assert restored_app.layout().children[-1] is restored.layout
+    built.close()
+    restored.close()